@@ -0,0 +1,42 @@
+'''
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+% Copyright (C) 2025, Intelligent Control Systems Group, ETH Zurich
+%
+% This code is made available under an MIT License (see LICENSE file).
+%
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+'''
+
+from collections.abc import Callable
+from importlib import import_module
+
+
+def lazy_attributes(package: str, attributes: dict[str, str]) -> tuple[Callable, Callable]:
+    '''
+    Defines module-level __getattr__ and __dir__ functions (PEP 562) for a package, which import attributes
+    from their submodules only on first access. This avoids loading heavy dependencies (e.g. cvxpy, casadi,
+    or matplotlib) when importing a package, unless the features that need them are actually used.
+
+    Usage (in a package's __init__.py):
+        __getattr__, __dir__ = lazy_attributes(__name__, {'MPC': '.mpc'})
+
+    Args:
+        package (str): Name of the package, i.e., __name__ of the package's __init__.py.
+        attributes (dict[str, str]): Mapping from attribute name to the (relative) submodule defining it.
+
+    Returns:
+        __getattr__ (Callable): Module-level attribute lookup, importing the submodule on first access.
+        __dir__ (Callable): Module-level dir, including the lazily imported attributes.
+    '''
+    def __getattr__(name: str) -> any:
+        if name not in attributes:
+            raise AttributeError(f'module {package!r} has no attribute {name!r}')
+        value = getattr(import_module(attributes[name], package), name)
+        # cache the attribute in the package, such that __getattr__ is only called once
+        setattr(import_module(package), name, value)
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted(set(vars(import_module(package))) | set(attributes))
+
+    return __getattr__, __dir__
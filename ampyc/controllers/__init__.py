@@ -7,22 +7,52 @@
 %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
 '''
 
-'''Controllers'''
-from .controller_base import ControllerBase, available_solvers
-
-from .mpc import MPC
-from .nonlinear_mpc import NonlinearMPC
-
-from .robust_mpc import RMPC
-from .nonlinear_robust_mpc import NonlinearRMPC
-
-from .ri_smpc import RecoveryInitializationSMPC
-from .if_smpc import IndirectFeedbackSMPC
+from typing import TYPE_CHECKING
 
+from ampyc._lazy import lazy_attributes
 
-from .constraint_tightening_rmpc import ConstraintTighteningRMPC
-
-from .constraint_tightening_smpc import ConstraintTighteningSMPC
-
-from .ibsf import IBSF, MinIBSF, DampIBSF
-from .psf import PSF
+'''Controllers'''
+from .controller_base import ControllerBase, available_solvers
+from .solve_stats import SolveStats, SolveStatsRecorder
+from .solve_memo import SolveMemo
+
+# NOTE: controllers depend on cvxpy or casadi, thus they are imported on first use
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    'MPC': '.mpc',
+    'NonlinearMPC': '.nonlinear_mpc',
+
+    'RMPC': '.robust_mpc',
+    'NonlinearRMPC': '.nonlinear_robust_mpc',
+
+    'RecoveryInitializationSMPC': '.ri_smpc',
+    'IndirectFeedbackSMPC': '.if_smpc',
+
+    'ConstraintTighteningRMPC': '.constraint_tightening_rmpc',
+
+    'RAMPC': '.robust_adaptive_mpc',
+
+    'ConstraintTighteningSMPC': '.constraint_tightening_smpc',
+
+    'IBSF': '.ibsf',
+    'MinIBSF': '.ibsf',
+    'DampIBSF': '.ibsf',
+    'PSF': '.psf',
+
+    'HorizonFactory': '.horizon_factory',
+    'EventTriggered': '.event_triggered',
+})
+
+if TYPE_CHECKING:
+    from .mpc import MPC
+    from .nonlinear_mpc import NonlinearMPC
+    from .robust_mpc import RMPC
+    from .nonlinear_robust_mpc import NonlinearRMPC
+    from .ri_smpc import RecoveryInitializationSMPC
+    from .if_smpc import IndirectFeedbackSMPC
+    from .constraint_tightening_rmpc import ConstraintTighteningRMPC
+    from .robust_adaptive_mpc import RAMPC
+    from .constraint_tightening_smpc import ConstraintTighteningSMPC
+    from .ibsf import IBSF, MinIBSF, DampIBSF
+    from .psf import PSF
+    from .horizon_factory import HorizonFactory
+    from .event_triggered import EventTriggered
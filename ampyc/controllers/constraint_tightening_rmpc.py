@@ -11,7 +11,7 @@ import cvxpy as cp
 import numpy as np
 
 from ampyc.controllers import ControllerBase
-from ampyc.utils import Polytope, compute_mrpi, compute_drs, LQR
+from ampyc.utils import Polytope, compute_mrpi, compute_drs_tightening, within_drs_tightening, LQR, profiled
 
 
 class ConstraintTighteningRMPC(ControllerBase):
@@ -25,7 +25,7 @@ class ConstraintTighteningRMPC(ControllerBase):
     https://github.com/IntelligentControlSystems/ampyc/notes/03_robustNMPC1.pdf
     '''
 
-    def _init_problem(self, sys, params, *args, **kwargs):
+    def _init_problem(self, sys, params, offline=None, *args, **kwargs):
         # look up parameters
         Q, R, N = (params.Q, params.R, params.N)
         n, m = (sys.n, sys.m)
@@ -34,19 +34,20 @@ class ConstraintTighteningRMPC(ControllerBase):
         # self.sys contains A & B computed with the initial parameter estimate
         A, B = (sys.A, sys.B)
 
-        # look up system constraints & disturbance set
+        # look up system constraints
         X, U = (sys.X, sys.U)
-        W = sys.W
 
-        # compute the terminal cost P and controller K using LQR
-        self.K, self.P = LQR(A, B, Q, R)
+        # compute (or reuse) the offline quantities, i.e., the terminal cost P and controller K,
+        # the MRPI terminal set X_f, and the tightenings X - F_i, U - K F_i, and X_f - F_N
+        self.offline = self.compute_offline(N, offline)
+        self.K, self.P, self.X_f = (self.offline['K'], self.offline['P'], self.offline['X_f'])
+        self.x_tight = self.offline['x_tight'][:, :N+1]
+        self.u_tight = self.offline['u_tight'][:, :N+1]
+        self.x_f_tight = self.offline['x_f_tight'][:, N]
 
-        # compute the disturbance reachable sets
-        self.F = compute_drs(A + B @ self.K, W, N)
-
-        # compute the MRPI terminal set
-        Omega = Polytope(A=np.vstack([X.A, U.A @ self.K]), b=np.hstack([X.b, U.b]).reshape(-1, 1))
-        self.X_f = compute_mrpi(Omega, A + B @ self.K, W)
+        if np.any(X.b.reshape(-1, 1) - self.x_tight[:, :N] < 0) or np.any(U.b.reshape(-1, 1) - self.u_tight[:, :N] < 0) \
+            or np.any(self.X_f.b - self.x_f_tight < 0):
+            raise Exception('Constraint tightening is invalid! Negative b value.')
 
         # define the optimization variables
         self.z = cp.Variable((n, N+1))
@@ -63,24 +64,71 @@ class ConstraintTighteningRMPC(ControllerBase):
         constraints = [self.z[:, 0] == self.x_0]
         for i in range(N):
             constraints += [self.z[:, i+1] == A @ self.z[:, i] + B @ self.v[:, i]]
-            if i == 0:
-                # in first time step we have no tightening
-                constraints += [X.A @ self.z[:, i] <= X.b]
-                constraints += [U.A @ self.v[:, i] <= U.b]
-            else:
-                Z_i = X - self.F[i]
-                constraints += [Z_i.A @ self.z[:, i] <= Z_i.b]
-
-                V_i = U - self.K@self.F[i]
-                constraints += [V_i.A @ self.v[:, i] <= V_i.b]
+            # NOTE: in first time step we have no tightening, i.e., self.x_tight[:, 0] = 0
+            constraints += [X.A @ self.z[:, i] <= X.b - self.x_tight[:, i]]
+            constraints += [U.A @ self.v[:, i] <= U.b - self.u_tight[:, i]]
 
         # define terminal constraint
-        Z_f = self.X_f - self.F[-1]
-        constraints += [Z_f.A @ self.z[:, -1] <= Z_f.b]
+        constraints += [self.X_f.A @ self.z[:, -1] <= self.X_f.b - self.x_f_tight]
 
         # define the CVX optimization problem object
         self.prob = cp.Problem(cp.Minimize(objective), constraints)
 
+    @profiled
+    def compute_offline(self, N: int, offline: dict | None = None) -> dict:
+        '''
+        Computes the offline quantities of the controller, which do not depend on the online initial condition.
+
+        The tightening tables are computed for at least N time steps. If offline quantities from a controller
+        with the same system and cost are provided, the LQR controller and MRPI terminal set are reused and
+        only the missing time steps of the tightening tables are computed.
+
+        Args:
+            N (int): The prediction horizon.
+            offline (dict | None): Previously computed offline quantities, e.g., for a different horizon.
+        Returns:
+            offline (dict): The offline quantities, i.e.,
+                - K (np.ndarray): LQR tube controller gain.
+                - P (np.ndarray): LQR terminal cost.
+                - X_f (Polytope): MRPI terminal set.
+                - x_tight (np.ndarray): Support functions of the DRS F_i at the state constraints.
+                - u_tight (np.ndarray): Support functions of the DRS K F_i at the input constraints.
+                - x_f_tight (np.ndarray): Support functions of the DRS F_i at the terminal set constraints.
+        '''
+        # look up system matrices, constraints & disturbance set
+        A, B = (self.sys.A, self.sys.B)
+        X, U = (self.sys.X, self.sys.U)
+        W = self.sys.W
+
+        if offline is None:
+            # compute the terminal cost P and controller K using LQR
+            K, P = LQR(A, B, self.params.Q, self.params.R)
+
+            # compute the MRPI terminal set
+            Omega = Polytope(A=np.vstack([X.A, U.A @ K]), b=np.hstack([X.b, U.b]).reshape(-1, 1))
+            X_f = compute_mrpi(Omega, A + B @ K, W)
+
+            offline = {'K': K, 'P': P, 'X_f': X_f, 'x_tight': None, 'u_tight': None, 'x_f_tight': None}
+
+        # extend the tightenings from the support functions of the disturbance reachable sets F_i, if necessary
+        K, X_f = (offline['K'], offline['X_f'])
+        N_max = N if offline['x_tight'] is None else max(N, offline['x_tight'].shape[1] - 1)
+        return {
+            **offline,
+            'x_tight': compute_drs_tightening(A + B @ K, W, X.A, N_max, offline['x_tight']),
+            'u_tight': compute_drs_tightening(A + B @ K, W, U.A @ K, N_max, offline['u_tight']),
+            'x_f_tight': compute_drs_tightening(A + B @ K, W, X_f.A, N_max, offline['x_f_tight']),
+        }
+
+    def _tube_contains(self, e: np.ndarray, k: int) -> bool:
+        # the shifted plan remains valid if the error of the tube policy v + K (x - z) after k time steps is
+        # covered by the tightening of the remaining time steps i = k, ..., N-1 and of the terminal set
+        N, K, X_f = (self.params.N, self.K, self.X_f)
+        A_BK = self.sys.A + self.sys.B @ K
+        return within_drs_tightening(A_BK, self.sys.X.A, self.offline['x_tight'], e, k, range(k, N)) \
+            and within_drs_tightening(A_BK, self.sys.U.A @ K, self.offline['u_tight'], e, k, range(k, N)) \
+            and within_drs_tightening(A_BK, X_f.A, self.offline['x_f_tight'], e, k, range(N, N+1))
+
     def _define_output_mapping(self):
         return {
             'control': self.v,
@@ -11,7 +11,7 @@ import cvxpy as cp
 import numpy as np
 
 from ampyc.controllers import ControllerBase
-from ampyc.utils import Polytope, compute_drs, compute_mrpi, LQR
+from ampyc.utils import Polytope, compute_drs_tightening, within_drs_tightening, compute_mrpi, LQR, profiled
 
 class ConstraintTighteningSMPC(ControllerBase):
     '''
@@ -24,7 +24,7 @@ class ConstraintTighteningSMPC(ControllerBase):
     https://github.com/IntelligentControlSystems/ampyc/notes/06_stochasticMPC1.pdf
     '''
 
-    def _init_problem(self, sys, params, p=0.9, *args, **kwargs):
+    def _init_problem(self, sys, params, p=0.9, offline=None, *args, **kwargs):
         # look up parameters
         Q, R, N = (params.Q, params.R, params.N)
         n, m = (sys.n, sys.m)
@@ -33,22 +33,23 @@ class ConstraintTighteningSMPC(ControllerBase):
         # self.sys contains A & B computed with the initial parameter estimate
         A, B = (self.sys.A, self.sys.B)
 
-        # look up system constraints & disturbance set
+        # look up system constraints
         X, U = (sys.X, sys.U)
-        W = sys.W
 
-        # compute the terminal cost P and controller K using LQR
-        self.K, self.P = LQR(A, B, Q, R)
+        # compute (or reuse) the offline quantities, i.e., the terminal cost P and controller K,
+        # the MRPI terminal set X_f, and the support functions of the disturbance reachable sets F_i
+        self.offline = self.compute_offline(N, offline)
+        self.K, self.P, self.X_f = (self.offline['K'], self.offline['P'], self.offline['X_f'])
 
-        # compute the disturbance reachable sets
-        self.F = compute_drs(A + B @ self.K, W, N)
+        # compute the tightenings including the stochastic backoff Fw_x = sqrt(p) W, Fw_u = K Fw_x, i.e.,
+        # X - (A+BK) F_{i-1} - Fw_x, U - K (A+BK) F_{i-1} - Fw_u, and X_f - F_N
+        self.x_tight = self.offline['x_tight'][:, :N+1] + np.sqrt(p) * self.offline['x_backoff'].reshape(-1, 1)
+        self.u_tight = self.offline['u_tight'][:, :N+1] + np.sqrt(p) * self.offline['u_backoff'].reshape(-1, 1)
+        self.x_f_tight = self.offline['x_f_tight'][:, N]
 
-        # compute stochastic backoff
-        self.Fw_x, self.Fw_u = self.compute_stochastic_backoff(p, W)
-
-        # compute the MRPI terminal set
-        Omega = Polytope(A=np.vstack([X.A, U.A @ self.K]), b=np.hstack([X.b, U.b]).reshape(-1, 1))
-        self.X_f = compute_mrpi(Omega, A + B @ self.K, W)
+        if np.any(X.b.reshape(-1, 1) - self.x_tight[:, :N-1] < 0) or np.any(U.b.reshape(-1, 1) - self.u_tight[:, :N-1] < 0) \
+            or np.any(self.X_f.b - self.x_f_tight < 0):
+            raise Exception('Constraint tightening is invalid! Negative b value.')
 
         # define the optimization variables
         self.x_bar = cp.Variable((n, N+1))
@@ -67,25 +68,66 @@ class ConstraintTighteningSMPC(ControllerBase):
             constraints += [self.x_bar[:, i+1] == A @ self.x_bar[:, i] + B @ self.u_bar[:, i]]
             if i == 0: # in first time step we have no constraints
                 continue # do nothing
-            elif i == 1: # in second time step we only stochastic tightening
-                Z_i = X - self.Fw_x
-                constraints += [Z_i.A @ self.x_bar[:, i] <= Z_i.b]
-
-                V_i = U - self.Fw_u
-                constraints += [V_i.A @ self.u_bar[:, i] <= V_i.b]
-            else:
-                Z_i = X - (A+B@self.K) @ self.F[i-1] - self.Fw_x 
-                constraints += [Z_i.A @ self.x_bar[:, i] <= Z_i.b]
-
-                V_i = U - self.K@(A + B@self.K) @ self.F[i-1] - self.Fw_u
-                constraints += [V_i.A @ self.u_bar[:, i] <= V_i.b]
+            # NOTE: in second time step we only have stochastic tightening, since F_0 is empty
+            constraints += [X.A @ self.x_bar[:, i] <= X.b - self.x_tight[:, i-1]]
+            constraints += [U.A @ self.u_bar[:, i] <= U.b - self.u_tight[:, i-1]]
 
-        Z_f = self.X_f - self.F[-1]
-        constraints += [Z_f.A @ self.x_bar[:, -1] <= Z_f.b]
+        constraints += [self.X_f.A @ self.x_bar[:, -1] <= self.X_f.b - self.x_f_tight]
 
         # define the CVX optimization problem object
         self.prob = cp.Problem(cp.Minimize(objective), constraints)
 
+    @profiled
+    def compute_offline(self, N: int, offline: dict | None = None) -> dict:
+        '''
+        Computes the offline quantities of the controller, which do not depend on the online initial condition
+        or the probability level p.
+
+        The tightening tables are computed for at least N time steps. If offline quantities from a controller
+        with the same system and cost are provided, the LQR controller and MRPI terminal set are reused and
+        only the missing time steps of the tightening tables are computed.
+
+        Args:
+            N (int): The prediction horizon.
+            offline (dict | None): Previously computed offline quantities, e.g., for a different horizon.
+        Returns:
+            offline (dict): The offline quantities, i.e.,
+                - K (np.ndarray): LQR tube controller gain.
+                - P (np.ndarray): LQR terminal cost.
+                - X_f (Polytope): MRPI terminal set.
+                - x_tight (np.ndarray): Support functions of the DRS (A+BK) F_i at the state constraints.
+                - u_tight (np.ndarray): Support functions of the DRS K (A+BK) F_i at the input constraints.
+                - x_f_tight (np.ndarray): Support functions of the DRS F_i at the terminal set constraints.
+                - x_backoff (np.ndarray): Support function of W at the state constraints.
+                - u_backoff (np.ndarray): Support function of K W at the input constraints.
+        '''
+        # look up system matrices, constraints & disturbance set
+        A, B = (self.sys.A, self.sys.B)
+        X, U = (self.sys.X, self.sys.U)
+        W = self.sys.W
+
+        if offline is None:
+            # compute the terminal cost P and controller K using LQR
+            K, P = LQR(A, B, self.params.Q, self.params.R)
+
+            # compute the MRPI terminal set
+            Omega = Polytope(A=np.vstack([X.A, U.A @ K]), b=np.hstack([X.b, U.b]).reshape(-1, 1))
+            X_f = compute_mrpi(Omega, A + B @ K, W)
+
+            offline = {'K': K, 'P': P, 'X_f': X_f, 'x_tight': None, 'u_tight': None, 'x_f_tight': None,
+                       'x_backoff': W.support_batch(X.A), 'u_backoff': W.support_batch(U.A @ K)}
+
+        # extend the tightenings from the support functions of the disturbance reachable sets F_i, if necessary
+        K, X_f = (offline['K'], offline['X_f'])
+        A_BK = A + B @ K
+        N_max = N if offline['x_tight'] is None else max(N, offline['x_tight'].shape[1] - 1)
+        return {
+            **offline,
+            'x_tight': compute_drs_tightening(A_BK, W, X.A @ A_BK, N_max, offline['x_tight']),
+            'u_tight': compute_drs_tightening(A_BK, W, U.A @ K @ A_BK, N_max, offline['u_tight']),
+            'x_f_tight': compute_drs_tightening(A_BK, W, X_f.A, N_max, offline['x_f_tight']),
+        }
+
     def compute_stochastic_backoff(self, p: float, W: Polytope) -> tuple[Polytope, Polytope]:
         '''
         Computes the stochastic backoff terms for the state and input constraints.
@@ -106,6 +148,18 @@ class ConstraintTighteningSMPC(ControllerBase):
 
         return Fw_x, Fw_u
 
+    def _tube_contains(self, e: np.ndarray, k: int) -> bool:
+        # the shifted plan remains valid if the error of the tube policy u_bar + K (x - x_bar) after k time steps
+        # is covered by the robust part of the tightening, i.e., the column i-1 of the tightening tables at time
+        # step i = k+1, ..., N-1, and of the terminal set; the current input is checked against the full tightening
+        N, K, X_f = (self.params.N, self.K, self.X_f)
+        A_BK = self.sys.A + self.sys.B @ K
+        if k >= N or np.any(self.sys.U.A @ K @ np.asarray(e).reshape(-1) > self.u_tight[:, k-1] + 1e-9):
+            return False
+        return within_drs_tightening(A_BK, self.sys.X.A @ A_BK, self.offline['x_tight'], e, k, range(k, N-1)) \
+            and within_drs_tightening(A_BK, self.sys.U.A @ K @ A_BK, self.offline['u_tight'], e, k, range(k, N-1)) \
+            and within_drs_tightening(A_BK, X_f.A, self.offline['x_f_tight'], e, k, range(N, N+1))
+
     def _define_output_mapping(self):
         return {
             'control': self.u_bar,
@@ -11,12 +11,13 @@ from abc import ABC, abstractmethod
 from typing import Union, Optional
 from itertools import compress
 from pprint import pformat
+from sys import modules
+import time
 import numpy as np
-import cvxpy as cp
-import casadi
-from casadi import has_nlpsol
 
 from ampyc.typing import System, Params, Controller
+from .solve_stats import SolveStats
+from .solve_memo import SolveMemo
 
 class ControllerBase(ABC):
     '''
@@ -33,6 +34,11 @@ class ControllerBase(ABC):
         sys: internal copy of a system object
         params: internal copy of a parameters object
         prob: optimization problem object, either a CVXPY Problem or a CasADi Opti object
+        stats: SolveStats of the last call to solve, i.e., per-phase timings, iterations, status, objective, and residual
+        stats_callback: optional function called with the SolveStats after every solve, e.g., a SolveStatsRecorder to
+                        aggregate latency percentiles over a simulation; can be passed as keyword argument
+        memo: optional SolveMemo of the solutions of solve, enabled with the keyword argument memoize, i.e., the
+              capacity or a dictionary with the arguments of SolveMemo
     '''
 
     def __init__(self, sys: System, params: Params, *args: Optional, **kwargs: Optional) -> Controller:
@@ -50,6 +56,15 @@ class ControllerBase(ABC):
         self.params = params
         self.solver = kwargs.pop('solver', None)
         self.timing = kwargs.pop('timing', False)
+        self.stats_callback = kwargs.pop('stats_callback', None)
+        self.stats = None
+        memoize = kwargs.pop('memoize', None)
+        if memoize is None or memoize is False:
+            self.memo = None
+        elif isinstance(memoize, dict):
+            self.memo = SolveMemo(**memoize)
+        else:
+            self.memo = SolveMemo(capacity=int(memoize))
         self._init_problem(sys, params, *args, **kwargs)
         self.output_mapping = self._define_output_mapping()
     
@@ -99,6 +114,21 @@ class ControllerBase(ABC):
         
         raise NotImplementedError
 
+    def _tube_contains(self, e: np.ndarray, k: int) -> bool | None:
+        '''
+        Tube-based controllers override this method to check whether the deviation e = x - z_k of the state from
+        the planned (nominal) state is contained in the tube, such that the shifted plan remains valid when the
+        tube feedback is applied, see EventTriggered. The default returns None, i.e., the controller has no tube.
+
+        Args:
+            e: deviation of the state from the planned state
+            k: number of time steps since the plan was computed
+
+        Returns:
+            True if e is contained in the tube, False if not, or None if the controller has no tube
+        '''
+        return None
+
     def solve(self,
               x: np.ndarray,
               additional_parameters: dict = {},
@@ -119,7 +149,8 @@ class ControllerBase(ABC):
         Returns:
             control: planned control input trajectory
             state: planned state trajectory
-            out_map: output mapping of the optimization problem, if defined (beyond just control and state)
+            out_map: output mapping of the optimization problem, if defined (beyond just control and state); if timing is
+                     enabled, it additionally contains the solver time ('timing') and the SolveStats ('stats')
             error_msg: error message, if the solver did not achieve an optimal solution or encountered an error
 
         Raises:
@@ -133,6 +164,10 @@ class ControllerBase(ABC):
         '''
         # if solver is not provided, use default global solver
         solver = solver if solver is not None else self.solver
+
+        t_start = time.perf_counter()
+        stats = SolveStats(controller=type(self).__name__, solver=solver)
+        memo_key, primal = (None, None)
         
         if self.prob != None:
             if not hasattr(self, 'x_0'):
@@ -144,11 +179,35 @@ class ControllerBase(ABC):
             # reshape x to match the expected shape of the initial condition
             x = x.reshape(self.x_0.shape)
 
-            if isinstance(self.prob,cp.Problem):
+            # look up a memoized solution, otherwise the nearest memoized solution is used as warm start
+            if self.memo is not None:
+                memo_key = self.memo.key(x, additional_parameters, solver, options)
+            if memo_key is not None:
+                memoized = self.memo.lookup(memo_key)
+                if memoized is not None:
+                    out_map, error_msg, stats = memoized
+                    return self._finish_solve(stats, t_start, out_map, out_map['control'], out_map['state'], error_msg)
+                warm_start = self.memo.nearest(memo_key, x)
+            else:
+                warm_start = None
+
+            # NOTE: cvxpy and casadi are imported by the derived controllers, i.e., if the problem is of either
+            # type, the corresponding module is already loaded
+            cp, casadi = (modules.get('cvxpy'), modules.get('casadi'))
+
+            if cp is not None and isinstance(self.prob,cp.Problem):
                 try:
+                    t = time.perf_counter()
                     self.x_0.value = x
                     self._set_additional_parameters(additional_parameters)
-                    self.prob.solve(verbose=verbose, solver=solver)
+                    if warm_start is not None:
+                        for variable, value in zip(self.prob.variables(), warm_start):
+                            variable.value = value
+                    stats.setup_time = time.perf_counter() - t
+
+                    t = time.perf_counter()
+                    self.prob.solve(verbose=verbose, solver=solver, warm_start=True)
+                    self._cvxpy_stats(stats, time.perf_counter() - t)
 
                     if self.prob.status != cp.OPTIMAL:
                         error_msg = 'Solver did not achieve an optimal solution. Status: {0}'.format(self.prob.status)
@@ -157,23 +216,23 @@ class ControllerBase(ABC):
 
                     else:
                         error_msg = None
+                        primal = [variable.value for variable in self.prob.variables()]
                         for mapping in self.output_mapping:
                             out_map[mapping] = self.output_mapping[mapping].value
-                            if self.timing:
-                                out_map["timing"] = self.prob.solver_stats.solve_time
                     control = out_map['control']
                     state = out_map['state']
                 except Exception as e:
                     error_msg = 'Solver encountered an error. {0}'.format(e)
+                    stats.status = 'error'
+                    memo_key = None
                     for mapping in self.output_mapping:
                             out_map[mapping] = None
-                            if self.timing:
-                                out_map["timing"] = None
                     control = out_map['control']
                     state = out_map['state']
 
-            elif isinstance(self.prob, casadi.Opti):
+            elif casadi is not None and isinstance(self.prob, casadi.Opti):
                 solver = solver if solver is not None else "ipopt"
+                stats.solver = solver
                 if solver in ["ipopt"]:
                     if verbose:
                         opts = {'ipopt.print_level': 5, 'print_time': 1}
@@ -185,25 +244,36 @@ class ControllerBase(ABC):
                         print("[WARNING] Solver {0} did not get options, using defaults. This can result in unnecessary verbose behavior.\nSee https://web.casadi.org/api/internal/d4/d89/group__nlpsol.html for options.".format(solver))
                     else:
                         opts = options
+                t = time.perf_counter()
                 self.prob.solver(solver, opts)
+                build_time = time.perf_counter() - t
 
                 # casadi will raise an exception if solve() detects an infeasible problem
                 try:
+                    t = time.perf_counter()
                     self.prob.set_value(self.x_0, x)
                     self._set_additional_parameters(additional_parameters)
-                    sol = self.prob.solve()
+                    if warm_start is not None:
+                        self.prob.set_initial(self.prob.x, warm_start)
+                    stats.setup_time = time.perf_counter() - t
+
+                    t = time.perf_counter()
+                    try:
+                        sol = self.prob.solve()
+                    finally:
+                        # NOTE: the solver statistics are also available if the solver raised an exception
+                        self._casadi_stats(stats, time.perf_counter() - t, build_time)
+
                     if sol.stats()['success']:
                         error_msg = None
+                        stats.objective = float(sol.value(self.prob.f))
+                        primal = sol.value(self.prob.x)
                         for mapping in self.output_mapping:
                             out_map[mapping] = sol.value(self.output_mapping[mapping])
-                            if self.timing:
-                                out_map["timing"] = sum([v for k, v in sol.stats().items() if 't_wall' in k])
                     else:
                         error_msg = 'Solver was not successful with return status: {0}'.format(sol.stats()['return_status'])
                         for mapping in self.output_mapping:
                             out_map[mapping] = None
-                            if self.timing:
-                                out_map["timing"] = None
                             
                     control = out_map['control']
                     state = out_map['state']
@@ -214,10 +284,48 @@ class ControllerBase(ABC):
                     control = out_map['control']
                     state = out_map['state']
 
+                    # NOTE: casadi raises an exception if the problem is infeasible, which is memoized like any
+                    # other unsuccessful solve
+                    if stats.status is None:
+                        memo_key = None
+
             else:
                 raise Exception('Optimization problem type not supported!')
         else:
             raise Exception('Optimization problem is not initialized!')
+
+        if memo_key is not None:
+            self.memo.store(memo_key, x, out_map, error_msg, stats, primal)
+
+        return self._finish_solve(stats, t_start, out_map, control, state, error_msg)
+
+    def _finish_solve(self, stats: SolveStats, t_start: float, out_map: dict, control: np.ndarray | None,
+                      state: np.ndarray | None, error_msg: str | None
+                      ) -> Union[tuple[np.ndarray, np.ndarray, dict, str | None], tuple[np.ndarray, np.ndarray, str | None]]:
+        '''
+        Collects the statistics of a solve and assembles the return values of solve. Controllers which override
+        solve, e.g., with a dedicated solver, should return through this method.
+
+        Args:
+            stats: statistics object of the current solve
+            t_start: time.perf_counter() at the start of the solve
+            out_map: output mapping with the values of the outputs
+            control: planned control input trajectory
+            state: planned state trajectory
+            error_msg: error message, if any
+
+        Returns:
+            see solve
+        '''
+        stats.total_time = time.perf_counter() - t_start
+        stats.error_msg = error_msg
+        self.stats = stats
+        if self.timing:
+            out_map['timing'] = stats.solve_time
+            out_map['stats'] = stats
+        if self.stats_callback is not None:
+            self.stats_callback(stats)
+
         if len(out_map) == 2:
             return control, state, error_msg
         elif len(out_map) > 2:
@@ -225,11 +333,69 @@ class ControllerBase(ABC):
         else:
             raise Exception('Output mapping is not defined properly!')
 
+    def _cvxpy_stats(self, stats: SolveStats, wall_time: float) -> None:
+        '''
+        Fills in the statistics of a solved CVXPY problem.
+
+        Args:
+            stats: statistics object of the current solve
+            wall_time: wall time of the call to prob.solve
+        '''
+        import cvxpy as cp
+
+        solver_stats = self.prob.solver_stats
+        stats.solver = solver_stats.solver_name
+        stats.status = self.prob.status
+        stats.success = self.prob.status == cp.OPTIMAL
+        stats.compile_time = self.prob.compilation_time
+        if solver_stats.solve_time is not None:
+            stats.solve_time = solver_stats.solve_time
+        else:
+            stats.solve_time = wall_time - (stats.compile_time or 0.0)
+        stats.iterations = solver_stats.num_iters
+
+        if stats.success:
+            stats.objective = float(self.prob.value)
+            stats.residual = max((float(np.max(c.violation())) for c in self.prob.constraints), default=0.0)
+
+    def _casadi_stats(self, stats: SolveStats, wall_time: float, build_time: float) -> None:
+        '''
+        Fills in the statistics of a (possibly failed) CasADi solve.
+
+        Args:
+            stats: statistics object of the current solve
+            wall_time: wall time of the call to prob.solve
+            build_time: wall time of setting up the solver with prob.solver
+        '''
+        try:
+            solver_stats = self.prob.stats()
+        except Exception:
+            solver_stats = {}
+
+        stats.status = solver_stats.get('return_status')
+        stats.success = bool(solver_stats.get('success', False))
+        stats.iterations = solver_stats.get('iter_count')
+        if 't_wall_total' in solver_stats:
+            # the remaining time is spent on building the NLP and the solver
+            stats.solve_time = solver_stats['t_wall_total']
+            stats.compile_time = build_time + max(wall_time - stats.solve_time, 0.0)
+        else:
+            stats.solve_time = wall_time
+            stats.compile_time = build_time
+
+        # primal infeasibility of the last iterate (only reported by some solvers, e.g., IPOPT)
+        inf_pr = solver_stats.get('iterations', {}).get('inf_pr', [])
+        if len(inf_pr) > 0:
+            stats.residual = float(inf_pr[-1])
+
 
 def available_solvers() -> None:
     """
     Print all available solvers for CVXPY and CasADi problems.
     """
+    import cvxpy as cp
+    from casadi import has_nlpsol
+
     CASADI_SOLVERS = ["ampl", "blocksqp", "bonmin", "fatrop", "ipopt", "knitro", "madnlp",
                       "snopt", "worhp", "qrsqp", "scpgen", "sqpmethod", "feasiblesqpmethod"]
 
@@ -0,0 +1,155 @@
+'''
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+% Copyright (C) 2025, Intelligent Control Systems Group, ETH Zurich
+%
+% This code is made available under an MIT License (see LICENSE file).
+%
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+'''
+
+import time
+import numpy as np
+
+from ampyc.typing import Controller
+from .solve_stats import SolveStats
+
+
+class EventTriggered:
+    '''
+    Event-triggered execution of a controller: the optimization problem is only solved if the state deviates
+    from the prediction of the previous plan, otherwise the shifted previous plan is returned.
+
+    The previous plan is reused if
+    - the prediction error e = x - z_k, where z_k is the planned state at the current time, is below threshold
+      (Euclidean norm), if a threshold is given, and
+    - e is inside the tube of the controller, if the controller defines one (see ControllerBase._tube_contains),
+      e.g., the RPI ellipsoid of RMPC, and use_tube is True. For the constraint tightening controllers, the
+      error must be covered by the tightening of the remaining time steps of the plan (see within_drs_tightening),
+      i.e., the plan is reused at most N time steps.
+    If neither a threshold nor a tube is available, the problem is solved at every time step.
+
+    The shifted plan is padded with the tube controller K of the controller, if it defines one and the system is
+    linear, such that the plan always covers the full horizon. Otherwise, the problem is solved once the plan is
+    exhausted. The applied input is computed from the returned plan as for the wrapped controller, e.g.,
+    u = v_0 + K (x - z_0) for tube controllers, such that the tube feedback acts on the prediction error.
+
+    All other attributes are forwarded to the wrapped controller.
+
+    Usage:
+        ctrl = EventTriggered(RMPC(sys, params.ctrl), threshold=1e-2)
+        for i in range(num_steps):
+            v, z, error_msg = ctrl.solve(x)
+            u = v[:, 0] + ctrl.K @ (x - z[:, 0])
+            x = sys.step(x, u)[0]
+        ctrl.skip_fraction  # fraction of time steps without a solve
+    '''
+
+    def __init__(self, ctrl: Controller, threshold: float | None = None, use_tube: bool = True,
+                 max_skips: int | None = None) -> None:
+        '''
+        Args:
+            ctrl: controller derived from ControllerBase
+            threshold: maximum Euclidean norm of the prediction error for which the plan is reused, or None
+            use_tube: if True, the plan is only reused while the prediction error is inside the tube
+            max_skips: maximum number of consecutive time steps without a solve, or None for no limit
+        '''
+        self.ctrl = ctrl
+        self.threshold = threshold
+        self.use_tube = use_tube
+        self.max_skips = max_skips
+        self.num_calls = 0
+        self.num_skips = 0
+        self.reset()
+
+    def __getattr__(self, name: str):
+        # NOTE: only called if the attribute is not found on the wrapper itself
+        if name == 'ctrl':
+            raise AttributeError(name)
+        return getattr(self.ctrl, name)
+
+    @property
+    def skip_fraction(self) -> float:
+        '''Fraction of the calls to solve in which the previous plan was reused'''
+        return self.num_skips / self.num_calls if self.num_calls > 0 else 0.0
+
+    def reset(self) -> None:
+        '''Discards the previous plan, e.g., before simulating a new trajectory'''
+        self._result = None
+        self._k = 0
+
+    def solve(self, x: np.ndarray, *args, **kwargs) -> tuple:
+        '''
+        Returns the shifted previous plan if it can be reused, otherwise solves the optimization problem of the
+        wrapped controller. The arguments and return values are the same as for ControllerBase.solve.
+        '''
+        self.num_calls += 1
+        t_start = time.perf_counter()
+
+        if self._result is not None:
+            control, state = self._shifted_plan(self._k + 1)
+            if control is not None and self._reuse(np.asarray(x, dtype=float).reshape(-1), state[:, 0]):
+                self._k += 1
+                self.num_skips += 1
+                return self._skipped(control, state, t_start)
+
+        result = self.ctrl.solve(x, *args, **kwargs)
+        self._result = result if result[-1] is None else None
+        self._k = 0
+        return result
+
+    def _reuse(self, x: np.ndarray, z: np.ndarray) -> bool:
+        '''Evaluates the trigger conditions for the prediction error e = x - z'''
+        if self.max_skips is not None and self._k >= self.max_skips:
+            return False
+
+        conditions = []
+        if self.threshold is not None:
+            conditions.append(np.linalg.norm(x - z) <= self.threshold)
+        if self.use_tube:
+            inside = self.ctrl._tube_contains(x - z, self._k + 1)
+            if inside is not None:
+                conditions.append(bool(inside))
+        return len(conditions) > 0 and all(conditions)
+
+    def _shifted_plan(self, k: int) -> tuple[np.ndarray | None, np.ndarray | None]:
+        '''
+        Shifts the last solution by k time steps and pads it with the tube controller, if available. Returns
+        (None, None) if the plan is exhausted.
+        '''
+        control, state = (np.asarray(self._result[0]), np.asarray(self._result[1]))
+        control = control.reshape(-1, 1) if control.ndim == 1 else control
+        state = state.reshape(-1, 1) if state.ndim == 1 else state
+        N = control.shape[1]
+
+        K, A, B = (getattr(self.ctrl, 'K', None), getattr(self.ctrl.sys, 'A', None), getattr(self.ctrl.sys, 'B', None))
+        if K is None or A is None or B is None:
+            if k >= N:
+                return None, None
+            return control[:, k:], state[:, k:]
+
+        # extend the plan with the tube controller, i.e., v_j = K z_j and z_{j+1} = (A + B K) z_j
+        z = state[:, -1]
+        controls, states = ([control[:, k:]], [state[:, k:]])
+        for _ in range(k):
+            controls.append((K @ z).reshape(-1, 1))
+            z = (A + B @ K) @ z
+            states.append(z.reshape(-1, 1))
+        return np.hstack(controls), np.hstack(states)
+
+    def _skipped(self, control: np.ndarray, state: np.ndarray, t_start: float) -> tuple:
+        '''Assembles the return values of solve for a reused plan, analogous to ControllerBase._finish_solve'''
+        stats = SolveStats(controller=type(self.ctrl).__name__, status='skipped', success=True)
+        stats.total_time = time.perf_counter() - t_start
+        # NOTE: the statistics are stored in the wrapped controller, such that stats refers to the last call
+        self.ctrl.stats = stats
+        if self.ctrl.stats_callback is not None:
+            self.ctrl.stats_callback(stats)
+
+        if len(self._result) == 3:
+            return control, state, None
+
+        out_map = {**self._result[2], 'control': control, 'state': state}
+        if 'timing' in out_map:
+            out_map['timing'] = stats.solve_time
+            out_map['stats'] = stats
+        return control, state, out_map, None
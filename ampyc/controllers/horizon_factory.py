@@ -0,0 +1,74 @@
+'''
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+% Copyright (C) 2025, Intelligent Control Systems Group, ETH Zurich
+%
+% This code is made available under an MIT License (see LICENSE file).
+%
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+'''
+
+from dataclasses import replace
+from typing import Optional
+
+from ampyc.typing import System, Params, Controller
+
+
+class HorizonFactory:
+    '''
+    Builds controllers of the same type for different prediction horizons N, while computing the
+    offline quantities (e.g. tube controller, terminal set, and constraint tightening) only once.
+
+    The controller must accept precomputed offline quantities via the keyword argument "offline" and
+    store its (possibly extended) offline quantities in the attribute "offline", this is the case for
+    RMPC, ConstraintTighteningRMPC, and ConstraintTighteningSMPC. For the constraint tightening
+    controllers, the tightening tables of the largest horizon built so far are reused for all shorter
+    horizons and only extended if a longer horizon is requested.
+
+    Usage:
+        factory = HorizonFactory(ConstraintTighteningRMPC, sys, params.ctrl)
+        ctrls = factory.sweep([5, 10, 15])
+        ctrl = factory(20)
+    '''
+
+    def __init__(self, controller: type, sys: System, params: Params, *args: Optional, **kwargs: Optional) -> None:
+        '''
+        Args:
+            controller: controller class derived from ControllerBase
+            sys: system object derived from SystemBase
+            params: controller parameters, i.e., the ctrl dataclass of a ParamsBase object
+            *args: additional arguments for the controller, e.g., rho or p
+            **kwargs: additional keyword arguments for the controller
+        '''
+        self.controller = controller
+        self.sys = sys
+        self.params = params
+        self.args = args
+        self.kwargs = kwargs
+        self.offline = None
+
+    def __call__(self, N: int) -> Controller:
+        '''
+        Build a controller with prediction horizon N, reusing the cached offline quantities.
+
+        Args:
+            N: prediction horizon
+        Returns:
+            ctrl: controller with prediction horizon N
+        '''
+        params = replace(self.params, N=N)
+        ctrl = self.controller(self.sys, params, *self.args, offline=self.offline, **self.kwargs)
+        self.offline = ctrl.offline
+        return ctrl
+
+    def sweep(self, N_list: list[int]) -> dict[int, Controller]:
+        '''
+        Build controllers for all prediction horizons in N_list. The longest horizon is built first, such
+        that the offline quantities are computed only once.
+
+        Args:
+            N_list: list of prediction horizons
+        Returns:
+            ctrls: dictionary mapping each prediction horizon to its controller
+        '''
+        ctrls = {N: self(N) for N in sorted(set(N_list), reverse=True)}
+        return {N: ctrls[N] for N in N_list}
@@ -8,8 +8,12 @@
 '''
 
 from .controller_base import ControllerBase
+from .solve_stats import SolveStats
 import cvxpy as cp
 import numpy as np
+import time
+
+from ampyc.utils import compute_invariant_ellipsoid
 
 class IBSF(ControllerBase):
     '''
@@ -25,35 +29,21 @@ class IBSF(ControllerBase):
         super().__init__(sys, params)
         
     def _init_problem(self, sys, params):
-        # define optimization variables
-        self.E = cp.Variable((sys.n, sys.n), symmetric=True)
-        self.Y = cp.Variable((sys.m, sys.n))
+        # compute the invariant ellipsoid and the corresponding feedback
+        self.P, self.K = self.compute_invariant_set(sys)
 
-        # define the objective
-        objective = -cp.log_det(self.E)
+    def compute_invariant_set(self, sys) -> tuple[np.ndarray, np.ndarray]:
+        '''
+        Computes the largest (in volume) invariant ellipsoid x^T P x <= 1 within the state and input constraints
+        and the corresponding feedback K, see ampyc.utils.compute_invariant_ellipsoid.
 
-        # define the constraints
-        constraints = [ self.E >> 0,
-                        cp.bmat([[self.E, (sys.A@self.E+sys.B@self.Y).T], 
-                                 [sys.A@self.E+sys.B@self.Y, self.E]]) >> 0 ]
-        
-        for i, A_i in enumerate(sys.X.A):
-            constraints += [A_i.reshape(1,-1)@self.E@A_i.reshape(1,-1).T <= sys.X.b[i]**2]
-            
-        for i, A_i in enumerate(sys.U.A):
-            constraints += [cp.bmat([[sys.U.b[i].reshape(1,1)**2, A_i.reshape(1,-1)@self.Y],
-                                     [self.Y.T@A_i.reshape(1,-1).T, self.E]]) >> 0]
-            
-
-        # define the CVX optimization problem object
-        self.prob = cp.Problem(cp.Minimize(objective), constraints)
-         
-        # solve the SDP
-        self.prob.solve(verbose=False, solver=None)
-                            
-        # Recover the ellipsoid shape and feedback matrices
-        self.P = np.linalg.inv(self.E.value)
-        self.K = self.Y.value @ self.P
+        Args:
+            sys: system object derived from SystemBase
+        Returns:
+            P (np.ndarray): Shape matrix of the invariant ellipsoid.
+            K (np.ndarray): Feedback gain rendering the ellipsoid invariant.
+        '''
+        return compute_invariant_ellipsoid(sys.A, sys.B, sys.X, sys.U)
 
     def _define_output_mapping(self):
         # IBSF is not an MPC controller, so we don't have planned trajectories
@@ -76,9 +66,313 @@ class IBSF(ControllerBase):
             return u
         else:
             return self.K@x
+
+    def solve_batch(self, sys, X: np.ndarray, U: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        '''
+        Filters a batch of B state-input pairs at once.
+
+        Args:
+            sys: system object derived from SystemBase
+            X (np.ndarray): States of shape (n, B).
+            U (np.ndarray): Learning inputs of shape (m, B).
+        Returns:
+            U_filtered (np.ndarray): Filtered inputs of shape (m, B).
+            modified (np.ndarray): Boolean mask of shape (B,), True where the input was replaced by K x.
+        '''
+        X = X.reshape(sys.n, -1)
+        U = U.reshape(sys.m, -1)
+        X_next = sys.A @ X + sys.B @ U
+        safe = (np.einsum('ij,ij->j', X_next, self.P @ X_next) <= 1) & \
+            np.all(sys.U.A @ U <= sys.U.b.reshape(-1, 1), axis=0)
+        return np.where(safe, U, self.K @ X), ~safe
         
 
-class MinIBSF(ControllerBase):
+class _ProjectionIBSF(ControllerBase):
+    '''
+    Common base class of the one-step safety filters MinIBSF and DampIBSF, which project the learning input u_L
+    onto the safe inputs, i.e., solve
+
+        min ||u_L - u||^2  s.t.  U.A u <= U.b,  (A x + B u)^T P (A x + B u) <= c.
+
+    If the input constraints are a box and no solver is specified, the problem is solved with a dedicated solver
+    (solver='kkt'), which exploits the KKT conditions: for a fixed Lagrange multiplier lambda of the ellipsoidal
+    constraint, the minimizer u(lambda) is the solution of a box-constrained QP, which is solved with an active-set
+    method, and lambda is found by bisection (Illinois method) on the secular equation q(u(lambda)) = c. The
+    returned input is always on the feasible side of the bracket. Otherwise, the CVXPY problem is solved.
+    '''
+
+    def _init_bounds(self, sys, closed_form: bool) -> None:
+        '''Extracts the input bounds lb <= u <= ub if sys.U is a box, otherwise the dedicated solver is disabled'''
+        self._bounds = None
+        if not closed_form:
+            return
+
+        A_u, b_u = np.asarray(sys.U.A, dtype=float), np.asarray(sys.U.b, dtype=float).reshape(-1)
+        if np.any(np.count_nonzero(A_u, axis=1) != 1):
+            return
+        lb, ub = np.full(sys.m, -np.inf), np.full(sys.m, np.inf)
+        for a, b in zip(A_u, b_u):
+            j = np.flatnonzero(a)[0]
+            if a[j] > 0:
+                ub[j] = min(ub[j], b / a[j])
+            else:
+                lb[j] = max(lb[j], b / a[j])
+        self._bounds = (lb, ub)
+
+    def _level(self, additional_parameters: dict) -> float:
+        '''Level c of the ellipsoidal constraint, to be implemented by the derived filter'''
+        raise NotImplementedError
+
+    def solve(self, x, additional_parameters={}, verbose=False, solver=None, options=None):
+        solver = solver if solver is not None else self.solver
+        if self._bounds is None or solver not in [None, 'kkt']:
+            return super().solve(x, additional_parameters, verbose, solver, options)
+
+        t_start = time.perf_counter()
+        stats = SolveStats(controller=type(self).__name__, solver='kkt')
+
+        t = time.perf_counter()
+        x = np.asarray(x, dtype=float).reshape(-1)
+        u_L = np.asarray(additional_parameters['u_L'], dtype=float).reshape(-1)
+        c = self._level(additional_parameters)
+        stats.setup_time = time.perf_counter() - t
+
+        t = time.perf_counter()
+        u, stats.iterations = _project_input(self.sys.A @ x, self.sys.B, self.P, u_L, c, *self._bounds)
+        stats.solve_time = time.perf_counter() - t
+
+        if u is None:
+            stats.status = 'infeasible'
+            error_msg = 'Solver did not achieve an optimal solution. Status: {0}'.format(stats.status)
+            control, state = None, None
+        else:
+            stats.status = 'optimal'
+            stats.success = True
+            error_msg = None
+            control = u
+            state = np.column_stack([x, self.sys.A @ x + self.sys.B @ u])
+            stats.objective = float(np.sum((u_L - u)**2))
+            stats.residual = max(0.0, float(state[:, 1] @ self.P @ state[:, 1] - c),
+                                 float(np.max(self.sys.U.A @ u - np.asarray(self.sys.U.b).reshape(-1))))
+
+        return self._finish_solve(stats, t_start, {'control': control, 'state': state}, control, state, error_msg)
+
+
+    def solve_batch(self, X: np.ndarray, U_L: np.ndarray, V_x_0: np.ndarray | None = None,
+                    tol: float = 1e-6) -> tuple[np.ndarray, np.ndarray]:
+        '''
+        Filters a batch of B state-input pairs at once. With the dedicated solver, single inputs (m = 1) are
+        filtered with a vectorized solver, multiple inputs one by one. Otherwise, the CVXPY problem is solved for
+        every pair.
+
+        Args:
+            X (np.ndarray): States of shape (n, B).
+            U_L (np.ndarray): Learning inputs of shape (m, B).
+            V_x_0 (np.ndarray | None): Values x^T P x of shape (B,) for DampIBSF, computed from X if None.
+            tol (float): Tolerance for detecting modified inputs.
+        Returns:
+            U_filtered (np.ndarray): Filtered inputs of shape (m, B), NaN where the filter problem is infeasible.
+            modified (np.ndarray): Boolean mask of shape (B,), True where the input was modified (or infeasible).
+        '''
+        sys = self.sys
+        X = np.asarray(X, dtype=float).reshape(sys.n, -1)
+        U_L = np.asarray(U_L, dtype=float).reshape(sys.m, -1)
+        if V_x_0 is None:
+            V_x_0 = np.einsum('ij,ij->j', X, self.P @ X)
+        V_x_0 = np.asarray(V_x_0, dtype=float).reshape(-1)
+        num = X.shape[1]
+
+        if self._bounds is not None and self.solver in [None, 'kkt'] and sys.m == 1:
+            c = np.broadcast_to(self._level({'V_x_0': V_x_0}), (num,))
+            U = _project_input_batch(sys.A @ X, sys.B, self.P, U_L, c, *self._bounds)
+        else:
+            U = np.full((sys.m, num), np.nan)
+            for i in range(num):
+                out = self.solve(X[:, i], additional_parameters={'u_L': U_L[:, i], 'V_x_0': V_x_0[i]})
+                if out[-1] is None:
+                    U[:, i] = np.asarray(out[0]).reshape(-1)
+
+        modified = np.any(np.isnan(U), axis=0) | np.any(np.abs(U - U_L) > tol, axis=0)
+        return U, modified
+
+
+def _box_qp(H: np.ndarray, f: np.ndarray, lb: np.ndarray, ub: np.ndarray, max_iter: int = 100) -> np.ndarray:
+    '''
+    Solves min 0.5 u^T H u - f^T u s.t. lb <= u <= ub for positive definite H with a primal active-set method,
+    started at the projection of the unconstrained minimizer onto the box.
+    '''
+    m = f.shape[0]
+    if m == 1:
+        return np.clip(f / H[0, 0], lb, ub)
+
+    u = np.clip(np.linalg.solve(H, f), lb, ub)
+    active = (u <= lb) | (u >= ub)
+    for _ in range(max_iter):
+        free = ~active
+        # minimizer over the free variables, with the active variables fixed at their bounds
+        u_star = u.copy()
+        if np.any(free):
+            u_star[free] = np.linalg.solve(H[np.ix_(free, free)], f[free] - H[np.ix_(free, active)] @ u[active])
+        p = u_star - u
+
+        if np.max(np.abs(p)) <= 1e-14 * (1 + np.max(np.abs(u))):
+            # check the signs of the multipliers of the active bounds
+            g = H @ u - f
+            mu = np.where(u >= ub, -g, g)
+            mu[free] = np.inf
+            i = np.argmin(mu)
+            if mu[i] >= -1e-12:
+                return u
+            active[i] = False
+        else:
+            # step towards u_star until the first bound is hit
+            with np.errstate(divide='ignore', invalid='ignore'):
+                steps = np.where(p > 0, (ub - u) / p, np.where(p < 0, (lb - u) / p, np.inf))
+            steps[active] = np.inf
+            i = np.argmin(steps)
+            alpha = min(1.0, steps[i])
+            u = np.clip(u + alpha * p, lb, ub)
+            if alpha < 1.0:
+                active[i] = True
+    return u
+
+
+def _project_input(Ax: np.ndarray, B: np.ndarray, P: np.ndarray, u_L: np.ndarray, c: float,
+                   lb: np.ndarray, ub: np.ndarray, tol: float = 1e-10, max_iter: int = 200) -> tuple[np.ndarray | None, int]:
+    '''
+    Solves min ||u_L - u||^2 s.t. lb <= u <= ub, (Ax + B u)^T P (Ax + B u) <= c, see _ProjectionIBSF.
+
+    Returns:
+        u (np.ndarray | None): Optimal input, or None if the problem is infeasible.
+        iters (int): Number of evaluated Lagrange multipliers.
+    '''
+    BP = B.T @ P
+    BPB = BP @ B
+    BPAx = BP @ Ax
+    I = np.eye(B.shape[1])
+
+    def evaluate(lam: float) -> tuple[np.ndarray, float]:
+        # minimizer of ||u_L - u||^2 + lam (Ax + B u)^T P (Ax + B u) over the box
+        u = _box_qp(I + lam * BPB, u_L - lam * BPAx, lb, ub)
+        x_next = Ax + B @ u
+        return u, float(x_next @ P @ x_next) - c
+
+    iters = 1
+    u, g = evaluate(0.0)
+    if g <= 0:
+        return u, iters
+
+    # bracket the multiplier, g is continuous and nonincreasing in lambda
+    lo, g_lo = 0.0, g
+    hi = 1.0 / max(np.max(np.linalg.eigvalsh(BPB)), 1e-12)
+    while True:
+        u_hi, g_hi = evaluate(hi)
+        iters += 1
+        if g_hi <= 0:
+            break
+        if hi > 1e12:
+            return None, iters
+        lo, g_lo = hi, g_hi
+        hi *= 10
+
+    # Illinois method on g(lambda) = 0, keeping g(lo) > 0 >= g(hi), where the values used for the interpolation
+    # are halved if the same end of the bracket is retained twice; the true value at hi is kept in gt_hi
+    side = 0
+    gt_hi = g_hi
+    for _ in range(max_iter):
+        if gt_hi >= -tol * max(abs(c), 1.0) or hi - lo <= 1e-14 * hi:
+            break
+        lam = hi - g_hi * (hi - lo) / (g_hi - g_lo)
+        if not lo < lam < hi:
+            lam = 0.5 * (lo + hi)
+        u, g = evaluate(lam)
+        iters += 1
+        if g <= 0:
+            hi, u_hi, g_hi, gt_hi = lam, u, g, g
+            if side == 1:
+                g_lo /= 2
+            side = 1
+        else:
+            lo, g_lo = lam, g
+            if side == -1:
+                g_hi /= 2
+            side = -1
+    return u_hi, iters
+
+
+def _project_input_batch(AX: np.ndarray, B: np.ndarray, P: np.ndarray, U_L: np.ndarray, c: np.ndarray,
+                         lb: np.ndarray, ub: np.ndarray, tol: float = 1e-10, max_iter: int = 200) -> np.ndarray:
+    '''
+    Vectorized version of _project_input for a single input (m = 1) and a batch of B problems, where the
+    minimizer for a fixed multiplier lambda is u(lambda) = clip((u_L - lambda b^T P A x) / (1 + lambda b^T P b)).
+
+    Returns:
+        U (np.ndarray): Optimal inputs of shape (1, B), NaN for infeasible problems.
+    '''
+    b = B[:, 0]
+    bPb = float(b @ P @ b)
+    bPAx = b @ P @ AX
+    u_L = U_L.reshape(-1)
+
+    def evaluate(lam: np.ndarray, idx: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        u = np.clip((u_L[idx] - lam * bPAx[idx]) / (1 + lam * bPb), lb[0], ub[0])
+        x_next = AX[:, idx] + np.outer(b, u)
+        return u, np.einsum('ij,ij->j', x_next, P @ x_next) - c[idx]
+
+    num = u_L.shape[0]
+    all_idx = np.arange(num)
+    U, g = evaluate(np.zeros(num), all_idx)
+
+    # minimizer of the ellipsoidal constraint over the box, i.e., lambda -> infinity
+    u_inf = np.clip(-bPAx / max(bPb, 1e-300), lb[0], ub[0])
+    x_inf = AX + np.outer(b, u_inf)
+    g_inf = np.einsum('ij,ij->j', x_inf, P @ x_inf) - c
+    U[(g > 0) & (g_inf > 0)] = np.nan
+
+    # bracket the multipliers of the remaining problems
+    idx = np.flatnonzero((g > 0) & (g_inf <= 0))
+    lo, g_lo = np.zeros(idx.size), g[idx]
+    hi = np.full(idx.size, 1.0 / max(bPb, 1e-12))
+    u_hi, g_hi = evaluate(hi, idx)
+    for _ in range(40):
+        open_ = g_hi > 0
+        if not np.any(open_):
+            break
+        lo[open_], g_lo[open_] = hi[open_], g_hi[open_]
+        hi[open_] *= 10
+        u_hi[open_], g_hi[open_] = evaluate(hi[open_], idx[open_])
+    # constraints which are only satisfied in the limit
+    unbracketed = g_hi > 0
+    u_hi[unbracketed] = u_inf[idx[unbracketed]]
+    g_hi[unbracketed] = 0.0
+
+    # Illinois method on g(lambda) = 0, see _project_input
+    side = np.zeros(idx.size)
+    gt_hi = g_hi.copy()
+    for _ in range(max_iter):
+        active = (gt_hi < -tol * np.maximum(np.abs(c[idx]), 1.0)) & (hi - lo > 1e-14 * hi)
+        if not np.any(active):
+            break
+        a = np.flatnonzero(active)
+        lam = hi[a] - g_hi[a] * (hi[a] - lo[a]) / (g_hi[a] - g_lo[a])
+        bad = ~((lo[a] < lam) & (lam < hi[a]))
+        lam[bad] = 0.5 * (lo[a][bad] + hi[a][bad])
+        u, g = evaluate(lam, idx[a])
+
+        feasible = g <= 0
+        f, nf = a[feasible], a[~feasible]
+        hi[f], u_hi[f], g_hi[f], gt_hi[f] = lam[feasible], u[feasible], g[feasible], g[feasible]
+        g_lo[f[side[f] == 1]] /= 2
+        side[f] = 1
+        lo[nf], g_lo[nf] = lam[~feasible], g[~feasible]
+        g_hi[nf[side[nf] == -1]] /= 2
+        side[nf] = -1
+
+    U[idx] = u_hi
+    return U.reshape(1, -1)
+
+
+class MinIBSF(_ProjectionIBSF):
     '''
     Implements a minimally invasive invariance-based safety filter, see e.g.,:
 
@@ -86,13 +380,18 @@ class MinIBSF(ControllerBase):
     
     More information is provided in the accompanying notes:
     https://github.com/IntelligentControlSystems/ampyc/notes/09_safetyFilter2.pdf
+
+    For box input constraints, the filter is solved with a dedicated solver by default, see _ProjectionIBSF.
+    Pass closed_form=False to always solve the CVXPY problem.
     '''
 
-    def __init__(self, sys, P, params):
+    def __init__(self, sys, P, params, *args, **kwargs):
         self.P = P
-        super().__init__(sys, params)
+        super().__init__(sys, params, *args, **kwargs)
         
-    def _init_problem(self, sys, params):        
+    def _init_problem(self, sys, params, closed_form=True):        
+        self._init_bounds(sys, closed_form)
+
         self.x = cp.Variable((sys.n, 2))
         self.u = cp.Variable((sys.m))
         self.x_0 = cp.Parameter((sys.n))
@@ -113,6 +412,9 @@ class MinIBSF(ControllerBase):
     def _set_additional_parameters(self, additional_parameters):
         self.u_L.value = additional_parameters['u_L']
 
+    def _level(self, additional_parameters):
+        return 1.0
+
     def _define_output_mapping(self):
         return {
             'control': self.u,
@@ -120,7 +422,7 @@ class MinIBSF(ControllerBase):
         }
 
 
-class DampIBSF(ControllerBase):
+class DampIBSF(_ProjectionIBSF):
     '''
     Implements an invariance-based safety filter with control barrier function dampening constraint, see e.g.,:
 
@@ -128,14 +430,19 @@ class DampIBSF(ControllerBase):
     
     More information is provided in the accompanying notes:
     https://github.com/IntelligentControlSystems/ampyc/notes/09_safetyFilter2.pdf
+
+    For box input constraints, the filter is solved with a dedicated solver by default, see _ProjectionIBSF.
+    Pass closed_form=False to always solve the CVXPY problem.
     '''
 
-    def __init__(self, sys, P, params, gamma=1):
+    def __init__(self, sys, P, params, gamma=1, *args, **kwargs):
         self.P = P
         self.gamma = gamma
-        super().__init__(sys, params)
+        super().__init__(sys, params, *args, **kwargs)
         
-    def _init_problem(self, sys, params):  
+    def _init_problem(self, sys, params, closed_form=True):  
+        self._init_bounds(sys, closed_form)
+
 
         self.x = cp.Variable((sys.n, 2))
         self.u = cp.Variable((sys.m))
@@ -159,6 +466,11 @@ class DampIBSF(ControllerBase):
         self.u_L.value = additional_parameters['u_L']
         self.V_x_0.value = additional_parameters['V_x_0']
 
+    def _level(self, additional_parameters):
+        V_x_0 = np.asarray(additional_parameters['V_x_0'], dtype=float).reshape(-1)
+        c = V_x_0 + self.gamma * (1 - V_x_0)
+        return float(c[0]) if c.size == 1 else c
+
     def _define_output_mapping(self):
         return {
             'control': self.u,
@@ -7,12 +7,15 @@
 %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
 '''
 
+from functools import partial
 import casadi
 import cvxpy as cp
 import numpy as np
 from scipy.linalg import sqrtm
 
 from ampyc.controllers import ControllerBase
+from ampyc.utils import cached, profiled
+from ampyc.utils.math import _compiled_problem, _sweep
 
 
 class NonlinearRMPC(ControllerBase):
@@ -82,9 +85,13 @@ class NonlinearRMPC(ControllerBase):
                 )
         self.prob.subject_to(self.z[:, -1] == 0.0)
 
+    @profiled
+    @cached(key=lambda self, rho, solver=None: (self.sys, rho, solver))
     def compute_tightening(self, rho: float, solver: str | None = None) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, float, float]:
         ''' 
         Computes an RPI set and the corresponding tightening, which minimizes the constraint tightening.
+        The SDP is compiled once per system with rho as a parameter, see sweep_tightening for evaluating many
+        values of rho.
 
         Args:
             rho (float): The robustness margin, in the range [0, 1).
@@ -100,70 +107,136 @@ class NonlinearRMPC(ControllerBase):
         # set solver or default to CLARABEL
         solver = solver if solver is not None else "CLARABEL"
 
-        # system dimensions
-        n = self.sys.n
-        m = self.sys.m
+        result = _tightening_chunk(*self._tightening_data(), [rho], solver)[0]
+        if result is None:
+            raise Exception('Tightening SDP could not be solved for rho={0}'.format(rho))
+        return result[0]
 
-        # differential dynamics matrices
-        A1 = self.sys.diff_A[0]
-        A2 = self.sys.diff_A[1]
-        B = self.sys.diff_B[0]
+    def sweep_tightening(self, rhos: list[float], workers: int | None = None, solver: str | None = None) -> dict:
+        '''
+        Evaluates compute_tightening for a sweep over the robustness margin rho and picks the rho with the
+        smallest tightening cost, i.e., the objective of the tightening SDP. Sequentially, the compiled SDP is
+        reused and warm-started, for workers > 1 the (sorted) values are split over worker processes.
 
-        # state and input sets
-        X = self.sys.X
-        U = self.sys.U
-        nx = X.A.shape[0]
-        nu = U.A.shape[0]
+        Args:
+            rhos (list[float]): Values of the robustness margin, in the range [0, 1).
+            workers (int | None): Number of worker processes, if None or 1 the SDPs are solved in this process.
+            solver (str | None): The solver to use for the optimization problems. If None, CLARABEL is used.
+        Returns:
+            sweep (dict): 'rho', the tightening 'cost' of shape (len(rhos),), 'c_x' and 'c_u' of shape
+                (len(rhos), nx) and (len(rhos), nu), 'delta' and 'w_bar' of shape (len(rhos),), NaN where the SDP
+                is infeasible, as well as 'rho_best'.
+        '''
+        solver = solver if solver is not None else "CLARABEL"
+        rhos = [float(rho) for rho in rhos]
+        results = _sweep(partial(_tightening_chunk, solver=solver), self._tightening_data(), rhos, workers)
 
-        # state dependent disturbance
-        G = self.sys.G
+        nx, nu = self.sys.X.A.shape[0], self.sys.U.A.shape[0]
+        nan = (np.full((nx, 1), np.nan), np.full((nu, 1), np.nan), None, None, np.nan, np.nan)
+        values = [nan if r is None else r[0] for r in results]
+        cost = np.array([np.nan if r is None else r[1] for r in results])
+        if np.all(np.isnan(cost)):
+            raise Exception('Tightening SDP is infeasible for all values of rho')
 
-        # setup and solve the offline optimization problem
-        E = cp.Variable((n, n), symmetric=True)
-        Y = cp.Variable((m, n))
+        return {
+            'rho': np.asarray(rhos),
+            'cost': cost,
+            'c_x': np.hstack([v[0] for v in values]).T,
+            'c_u': np.hstack([v[1] for v in values]).T,
+            'delta': np.array([v[4] for v in values], dtype=float),
+            'w_bar': np.array([v[5] for v in values], dtype=float),
+            'rho_best': rhos[int(np.nanargmin(cost))],
+        }
+
+    def _tightening_data(self) -> tuple:
+        return (self.sys.diff_A[0], self.sys.diff_A[1], self.sys.diff_B[0], self.sys.X.A, self.sys.U.A,
+                self.sys.G @ self.sys.X.V.T)
 
-        gamma_x = cp.Variable((nx, 1))
-        gamma_u = cp.Variable((nu, 1))
-        gamma_w = cp.Variable()
+    def _define_output_mapping(self):
+        return {
+            'control': self.v,
+            'state': self.z,
+        }
 
-        # define constraints
-        constraints = []
-        constraints += [E >> np.eye(n)]
+def _tightening_problem(A1: np.ndarray, A2: np.ndarray, B: np.ndarray, X_A: np.ndarray, U_A: np.ndarray,
+                        W_V: np.ndarray) -> tuple:
+    '''Builds the SDP of NonlinearRMPC.compute_tightening, where rho**2 and 1 / (2 (1 - rho)) are parameters'''
+    # system dimensions
+    n, m = B.shape
+    nx = X_A.shape[0]
+    nu = U_A.shape[0]
 
-        constraints += [cp.bmat([[rho**2 * E, (A1 @ E + B @ Y).T],
-                                 [(A1 @ E + B @ Y), E]]) >> 0]
-        
-        constraints += [cp.bmat([[rho**2 * E, (A2 @ E + B @ Y).T],
-                                 [(A2 @ E + B @ Y), E]]) >> 0]
+    # setup the offline optimization problem
+    E = cp.Variable((n, n), symmetric=True)
+    Y = cp.Variable((m, n))
 
-        for i, X_i in enumerate(X.A):
-            constraints += [cp.bmat([[cp.reshape(gamma_x[i],(1,1),'C'), X_i.reshape(1,-1) @ E],
-                                     [E.T @ X_i.reshape(1,-1).T, E]]) >> 0]
+    gamma_x = cp.Variable((nx, 1))
+    gamma_u = cp.Variable((nu, 1))
+    gamma_w = cp.Variable()
 
-        for i, U_i in enumerate(U.A):
-            constraints += [cp.bmat([[cp.reshape(gamma_u[i],(1,1),'C'), U_i.reshape(1,-1) @ Y],
-                                     [Y.T @ U_i.reshape(1,-1).T, E]]) >> 0]
+    rho_sq = cp.Parameter(nonneg=True)
+    scale = cp.Parameter(nonneg=True)
 
-        W_V = G @ X.V.T
-        for i, W_i in enumerate(W_V.T):
-            constraints += [cp.bmat([[cp.reshape(gamma_w,(1,1),'C'), W_i.reshape(1,-1)],
-                                     [W_i.reshape(1,-1).T, E]]) >> 0]
+    # define constraints
+    constraints = []
+    constraints += [E >> np.eye(n)]
 
-        # define objective
-        '''
-            Please note that we included here a weighting on the state
-            tightening, i.e., 50*sum(gamma_x). We did this since for this
-            specific example, the cost favours the input tightening and
-            including this weighting puts more emphasis on the state
-            tightening, therefore ensuring more balance between the two
-            terms.
-        '''
-        objective = cp.Minimize(
-            (50*cp.sum(gamma_x) + cp.sum(gamma_u) + (nx + nu) * gamma_w) / (2 * (1 - rho))
-        )
+    constraints += [cp.bmat([[rho_sq * E, (A1 @ E + B @ Y).T],
+                             [(A1 @ E + B @ Y), E]]) >> 0]
+
+    constraints += [cp.bmat([[rho_sq * E, (A2 @ E + B @ Y).T],
+                             [(A2 @ E + B @ Y), E]]) >> 0]
+
+    for i, X_i in enumerate(X_A):
+        constraints += [cp.bmat([[cp.reshape(gamma_x[i],(1,1),'C'), X_i.reshape(1,-1) @ E],
+                                 [E.T @ X_i.reshape(1,-1).T, E]]) >> 0]
+
+    for i, U_i in enumerate(U_A):
+        constraints += [cp.bmat([[cp.reshape(gamma_u[i],(1,1),'C'), U_i.reshape(1,-1) @ Y],
+                                 [Y.T @ U_i.reshape(1,-1).T, E]]) >> 0]
+
+    for i, W_i in enumerate(W_V.T):
+        constraints += [cp.bmat([[cp.reshape(gamma_w,(1,1),'C'), W_i.reshape(1,-1)],
+                                 [W_i.reshape(1,-1).T, E]]) >> 0]
+
+    # define objective
+    '''
+        Please note that we included here a weighting on the state
+        tightening, i.e., 50*sum(gamma_x). We did this since for this
+        specific example, the cost favours the input tightening and
+        including this weighting puts more emphasis on the state
+        tightening, therefore ensuring more balance between the two
+        terms.
+    '''
+    objective = cp.Minimize(
+        scale * (50*cp.sum(gamma_x) + cp.sum(gamma_u) + (nx + nu) * gamma_w)
+    )
+
+    return cp.Problem(objective, constraints), E, Y, gamma_x, gamma_u, gamma_w, rho_sq, scale
+
+def _tightening_chunk(A1: np.ndarray, A2: np.ndarray, B: np.ndarray, X_A: np.ndarray, U_A: np.ndarray,
+                      W_V: np.ndarray, rhos: list[float], solver: str | None = None) -> list:
+    '''
+    Solves the tightening SDP for each rho, reusing the compiled problem and warm-starting each solve. Returns
+    ((c_x, c_u, P, K, delta, w_bar), cost) for each rho, or None if the SDP could not be solved.
+    '''
+    prob, E, Y, gamma_x, gamma_u, gamma_w, rho_sq, scale = _compiled_problem(_tightening_problem, A1, A2, B, X_A, U_A, W_V)
+
+    results = []
+    for rho in rhos:
+        rho_sq.value = rho**2
+        scale.value = 1 / (2 * (1 - rho))
 
         # solve the problem
-        cp.Problem(objective, constraints).solve(solver=solver)
+        try:
+            prob.solve(solver=solver, warm_start=True)
+        except cp.error.SolverError:
+            # NOTE: the status and values of the (shared) problem still hold the previous solution
+            results.append(None)
+            continue
+        if E.value is None or prob.status not in [cp.OPTIMAL, cp.OPTIMAL_INACCURATE]:
+            results.append(None)
+            continue
 
         # recover Lyapunov function and controller
         P = np.linalg.inv(np.array(E.value))
@@ -179,10 +252,5 @@ class NonlinearRMPC(ControllerBase):
         # compute tightening of input constraints
         c_u = np.sqrt(gamma_u.value)
 
-        return c_x, c_u, P, K, delta, w_bar
-    
-    def _define_output_mapping(self):
-        return {
-            'control': self.v,
-            'state': self.z,
-        }
\ No newline at end of file
+        results.append(((c_x, c_u, P, K, delta, w_bar), float(prob.value)))
+    return results
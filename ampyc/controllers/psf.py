@@ -7,8 +7,12 @@
 %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
 '''
 
+from concurrent.futures import ProcessPoolExecutor
 from .controller_base import ControllerBase
+from .solve_stats import SolveStats
 import cvxpy as cp
+import numpy as np
+import time
 
 class PSF(ControllerBase):
     '''
@@ -18,15 +22,40 @@ class PSF(ControllerBase):
 
     More information is provided in Chapter 1 of the accompanying notes:
     https://github.com/IntelligentControlSystems/ampyc/notes/09_safetyFilter2.pdf
+
+    Before solving the QP, the filter tries to certify u_L directly (certify=True, default): the candidate input
+    sequence consisting of u_L followed by the shifted tail of the last backup plan, i.e., the backup plan of the
+    previous time step without its first two inputs (the first was applied at the previous time step, the second
+    is replaced by u_L), padded with a zero input, is propagated and checked against the state, input, and
+    terminal constraints. If the candidate is feasible, u_L is optimal (with cost zero) and is returned without
+    calling the solver, and the candidate becomes the new backup plan. Since the filter has no terminal
+    controller, the zero input replaces the terminal controller of the standard shifted candidate, and its
+    feasibility, in particular the terminal constraint, is checked explicitly.
     '''
 
     def __init__(self, sys, params, *args, **kwargs):
+        # constructor arguments, used to build identical filters in the worker processes of solve_batch
+        self._init_args = (args, dict(kwargs))
         super().__init__(sys, params, *args, **kwargs)
 
-    def _init_problem(self, sys, params, P):
+    def _init_problem(self, sys, params, P, certify=True):
         # store terminal cost
         self.P = P
 
+        # backup plan of the last solve, used to certify the next learning input
+        self.certify = certify
+        self.backup = None
+
+        # prediction matrices, i.e., x_i = Phi_i x_0 + Gamma_i [u_0, ..., u_{N-1}]
+        n, m, N = sys.n, sys.m, params.N
+        self._Phi = np.empty((N+1, n, n))
+        self._Gamma = np.zeros((N+1, n, N*m))
+        self._Phi[0] = np.eye(n)
+        for i in range(N):
+            self._Phi[i+1] = sys.A @ self._Phi[i]
+            self._Gamma[i+1] = sys.A @ self._Gamma[i]
+            self._Gamma[i+1][:, i*m:(i+1)*m] = sys.B
+
         # define optimization variables
         self.x = cp.Variable((sys.n, params.N+1))
         self.u = cp.Variable((sys.m, params.N))
@@ -49,6 +78,45 @@ class PSF(ControllerBase):
     
     def _set_additional_parameters(self, additional_parameters):
         self.u_L.value = additional_parameters['u_L']
+
+    def solve(self, x, additional_parameters={}, verbose=False, solver=None, options=None):
+        if self.certify and self.backup is not None:
+            t_start = time.perf_counter()
+            out = self._certify(x, additional_parameters['u_L'])
+            if out is not None:
+                stats = SolveStats(controller=type(self).__name__, solver='certified', status='optimal',
+                                   success=True, setup_time=0.0, solve_time=time.perf_counter() - t_start,
+                                   iterations=0, objective=0.0)
+                control, state = out
+                self.backup = control
+                return self._finish_solve(stats, t_start, {'control': control, 'state': state},
+                                          control, state, None)
+
+        out = super().solve(x, additional_parameters, verbose, solver, options)
+        self.backup = out[0]
+        return out
+
+    def _certify(self, x, u_L) -> tuple[np.ndarray, np.ndarray] | None:
+        '''
+        Checks whether u_L followed by the shifted tail of the backup plan and a zero input satisfies all
+        constraints.
+
+        Returns:
+            (control, state): the feasible candidate input and state trajectories, or None if the check fails
+        '''
+        sys, N = self.sys, self.params.N
+        tail = self.backup[:, 2:]
+        control = np.column_stack([np.asarray(u_L, dtype=float).reshape(sys.m, 1), tail,
+                                   np.zeros((sys.m, N - 1 - tail.shape[1]))])
+        x = np.asarray(x, dtype=float).reshape(-1)
+        state = (self._Phi @ x + self._Gamma @ control.reshape(-1, order='F')).T
+
+        x_N = state[:, -1]
+        if np.all(sys.X.A @ state[:, :-1] <= sys.X.b.reshape(-1, 1)) and \
+           np.all(sys.U.A @ control <= sys.U.b.reshape(-1, 1)) and \
+           x_N @ self.P @ x_N <= 1.0:
+            return control, state
+        return None
     
     def _define_output_mapping(self):
         return {
@@ -56,3 +124,62 @@ class PSF(ControllerBase):
             'state': self.x
         }
 
+
+    def solve_batch(self, X: np.ndarray, U_L: np.ndarray, workers: int | None = None,
+                    tol: float = 1e-4) -> tuple[np.ndarray, np.ndarray]:
+        '''
+        Filters a batch of B state-input pairs. The filter problems are solved one by one, or, if workers > 1,
+        distributed over a pool of worker processes, each holding its own copy of the filter. The samples are
+        independent, hence they are not certified against the backup plan (see solve), and the backup plan of
+        the filter is left unchanged.
+
+        Args:
+            X (np.ndarray): States of shape (n, B).
+            U_L (np.ndarray): Learning inputs of shape (m, B).
+            workers (int | None): Number of worker processes, if None or 1 the problems are solved in this process.
+            tol (float): Tolerance for detecting modified inputs, has to be larger than the solver accuracy.
+        Returns:
+            U_filtered (np.ndarray): Filtered inputs of shape (m, B), NaN where the filter problem is infeasible.
+            modified (np.ndarray): Boolean mask of shape (B,), True where the input was modified (or infeasible).
+        '''
+        X = np.asarray(X, dtype=float).reshape(self.sys.n, -1)
+        U_L = np.asarray(U_L, dtype=float).reshape(self.sys.m, -1)
+
+        if workers is None or workers <= 1:
+            U = _solve_chunk(self, X, U_L)
+        else:
+            chunks = np.array_split(np.arange(X.shape[1]), 4 * workers)
+            with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                     initargs=(type(self), self.sys, self.params, *self._init_args)) as pool:
+                results = pool.map(_solve_worker_chunk, [X[:, c] for c in chunks], [U_L[:, c] for c in chunks])
+                U = np.hstack(list(results))
+
+        modified = np.any(np.isnan(U), axis=0) | np.any(np.abs(U - U_L) > tol, axis=0)
+        return U, modified
+
+
+def _solve_chunk(ctrl: PSF, X: np.ndarray, U_L: np.ndarray) -> np.ndarray:
+    '''Solves the filter problems for the columns of X and U_L, returns NaN for infeasible problems'''
+    # NOTE: the samples are unrelated, i.e., the closed-loop backup plan must neither be used nor overwritten
+    backup, certify = (ctrl.backup, ctrl.certify)
+    ctrl.certify = False
+    try:
+        U = np.full(U_L.shape, np.nan)
+        for i in range(X.shape[1]):
+            out = ctrl.solve(X[:, i], additional_parameters={'u_L': U_L[:, i]})
+            if out[-1] is None:
+                U[:, i] = out[0][:, 0]
+    finally:
+        ctrl.backup, ctrl.certify = (backup, certify)
+    return U
+
+
+# filter instance of a worker process
+_worker_ctrl = None
+
+def _init_worker(controller: type, sys, params, args: tuple, kwargs: dict) -> None:
+    global _worker_ctrl
+    _worker_ctrl = controller(sys, params, *args, **kwargs)
+
+def _solve_worker_chunk(X: np.ndarray, U_L: np.ndarray) -> np.ndarray:
+    return _solve_chunk(_worker_ctrl, X, U_L)
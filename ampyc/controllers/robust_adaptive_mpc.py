@@ -0,0 +1,231 @@
+'''
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+% Copyright (C) 2025, Intelligent Control Systems Group, ETH Zurich
+%
+% This code is made available under an MIT License (see LICENSE file).
+%
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+'''
+
+from itertools import product
+import cvxpy as cp
+import numpy as np
+from scipy.linalg import sqrtm
+from scipy.optimize import linprog
+
+from ampyc.controllers import ControllerBase
+from ampyc.utils import Polytope, cached, profiled
+from ampyc.utils.math import _compute_tube_controller
+
+class RAMPC(ControllerBase):
+    '''
+    Implements the robust adaptive MPC controller with set-membership parameter estimation proposed in:
+
+    J. Köhler, E. Andina, R. Soloperto, M. A. Müller, and F. Allgöwer, "Linear robust adaptive model predictive
+    control: Computational complexity and conservatism", IEEE Conference on Decision and Control (CDC), 2019.
+
+    The controller is designed for a LinearAffineSystem, i.e., A(theta) = A_0 + sum_i theta_i A_i and
+    B(theta) = B_0 + sum_i theta_i B_i with the parameter theta in the set sys.omega.
+
+    Note: Here we implement the controller with an ellipsoidal homothetic tube {x | ||x - z||_P <= s}, instead
+    of a polytopic one!
+
+    The nominal prediction uses the point estimate theta_bar and the tube scaling s grows with the worst-case
+    model mismatch over the vertices of the outer bounding box of the parameter set. After each measurement,
+    update intersects the parameter set with the non-falsified parameters, keeping the facet directions of
+    sys.omega fixed, such that only the offsets change, and updates theta_bar with an LMS filter. The set
+    update and the optimization problem have a fixed size, i.e., only CVXPY parameters are updated online.
+
+    The applied input is u = v_0 + K (x - z_0), where v_0 and z_0 are the first planned input and state.
+    '''
+
+    def _init_problem(self, sys, params, rho=0.9, lam=0.9, mu=0.5, offline=None, *args, **kwargs):
+        # look up parameters
+        Q, R, N = (params.Q, params.R, params.N)
+        n, m, p = (sys.n, sys.m, sys.num_uncertain_params)
+        X, U = (sys.X, sys.U)
+        self.mu = mu
+
+        # compute (or reuse) the tube controller and the tube dynamics
+        self.offline = self.compute_offline(rho, lam, offline)
+        self.K, self.P = (self.offline['K'], self.offline['P'])
+        rho_bar, w_bar, s_bar = (self.offline[key] for key in ['rho_bar', 'w_bar', 's_bar'])
+        c_x, c_u = (self.offline['c_x'], self.offline['c_u'])
+        sqrt_P = sqrtm(self.P).real
+
+        # parameter set {theta | H theta <= h} with fixed facet directions H, and the directions of its outer box
+        self.H_theta = np.asarray(sys.omega.A, dtype=float)
+        self.h_theta = np.asarray(sys.omega.b, dtype=float).reshape(-1)
+        self._directions = np.vstack([self.H_theta, np.eye(p), -np.eye(p)])
+        self._box_signs = np.array(list(product([-1.0, 1.0], repeat=p)))
+        self.theta_lb = -np.asarray(sys.omega.support_batch(-np.eye(p)), dtype=float).reshape(-1)
+        self.theta_ub = np.asarray(sys.omega.support_batch(np.eye(p)), dtype=float).reshape(-1)
+        self.theta_bar = np.clip(np.asarray(sys.theta, dtype=float).reshape(-1), self.theta_lb, self.theta_ub)
+
+        # define optimization variables
+        self.z = cp.Variable((n, N+1))
+        self.v = cp.Variable((m, N))
+        self.s = cp.Variable(N+1, nonneg=True)
+
+        # define parameters, i.e., the initial state, the dynamics at the point estimate, and the vertices of the
+        # outer box of the parameter set relative to the point estimate
+        self.x_0 = cp.Parameter(n)
+        self.A_bar = cp.Parameter((n, n))
+        self.B_bar = cp.Parameter((n, m))
+        self.Delta = cp.Parameter((p, 2**p))
+        self._set_estimate_parameters()
+
+        # define the objective
+        objective = 0.0
+        for i in range(N):
+            objective += cp.quad_form(self.z[:, i], Q) + cp.quad_form(self.v[:, i], R)
+        # NOTE: terminal cost is trivially zero due to terminal constraint
+
+        # define the constraints
+        constraints = [cp.norm(sqrt_P @ (self.x_0 - self.z[:, 0])) <= self.s[0]]
+        for i in range(N):
+            constraints += [self.z[:, i+1] == self.A_bar @ self.z[:, i] + self.B_bar @ self.v[:, i]]
+
+            # tube dynamics, bounding the model mismatch D(z, v) (theta - theta_bar) at the vertices of the box
+            D = cp.hstack([cp.reshape(A_j @ self.z[:, i] + B_j @ self.v[:, i], (n, 1), 'C')
+                           for A_j, B_j in zip(sys.A_delta[1:], sys.B_delta[1:])])
+            constraints += [self.s[i+1] >= rho_bar * self.s[i] + w_bar + cp.norm(sqrt_P @ D @ self.Delta, axis=0)]
+
+            constraints += [X.A @ self.z[:, i] + c_x * self.s[i] <= X.b.reshape(-1)]
+            constraints += [U.A @ self.v[:, i] + c_u * self.s[i] <= U.b.reshape(-1)]
+        constraints += [self.z[:, -1] == 0.0, self.s[-1] <= s_bar]
+
+        # define the CVX optimization problem object
+        self.prob = cp.Problem(cp.Minimize(objective), constraints)
+
+    @profiled
+    def compute_offline(self, rho: float, lam: float, offline: dict | None = None) -> dict:
+        '''
+        Computes the offline quantities of the controller, which do not depend on the online measurements.
+        Provided offline quantities are reused if they were computed for the same rho and lam.
+
+        Args:
+            rho (float): Contraction rate used to design the tube controller, in the range [0, 1).
+            lam (float): Contraction rate of the RPI condition of the tube controller design, in the range [0, 1).
+            offline (dict | None): Previously computed offline quantities, e.g., for a different horizon.
+        Returns:
+            offline (dict): The offline quantities, i.e.,
+                - K (np.ndarray): Tube controller gain.
+                - P (np.ndarray): Shape matrix of the tube.
+                - rho_bar (float): Contraction rate of the tube over the initial parameter set.
+                - w_bar (float): Bound on the disturbance in the P-norm.
+                - s_bar (float): Tube scaling of the terminal set.
+                - c_x (np.ndarray): Tightening of the state constraints per unit tube scaling.
+                - c_u (np.ndarray): Tightening of the input constraints per unit tube scaling.
+        '''
+        if offline is not None and offline['rho'] == rho and offline['lam'] == lam:
+            return offline
+
+        K, P = self.compute_tube_controller(rho, lam)
+        sqrt_P = sqrtm(P).real
+        sqrt_P_inv = np.linalg.inv(sqrt_P)
+
+        # contraction rate, since the parameter set only shrinks, the vertices of the initial set are sufficient
+        vertices = self.sys.omega.Vrep()
+        A_K = self.sys.A_of(vertices) + self.sys.B_of(vertices) @ K
+        rho_bar = np.max(np.linalg.norm(sqrt_P @ A_K @ sqrt_P_inv, ord=2, axis=(1, 2)))
+        if rho_bar >= 1:
+            raise Exception('Tube controller is not contractive for all parameters, rho_bar = {0}'.format(rho_bar))
+
+        # disturbance bound and tightening per unit tube scaling
+        w_bar = np.max(np.sqrt(np.einsum('ij,jk,ik->i', self.sys.W.vertices, P, self.sys.W.vertices)))
+        c_x = np.linalg.norm(self.sys.X.A @ sqrt_P_inv, axis=1)
+        c_u = np.linalg.norm(self.sys.U.A @ K @ sqrt_P_inv, axis=1)
+
+        # terminal set {z = 0, s <= s_bar}, which is invariant if s_bar >= w_bar / (1 - rho_bar)
+        s_bar = min(np.min(self.sys.X.b.reshape(-1) / c_x), np.min(self.sys.U.b.reshape(-1) / c_u))
+        if s_bar < w_bar / (1 - rho_bar):
+            raise Exception('Terminal set is empty, the disturbance is too large for the constraints')
+
+        return {'rho': rho, 'lam': lam, 'K': K, 'P': P, 'rho_bar': float(rho_bar), 'w_bar': float(w_bar),
+                's_bar': float(s_bar), 'c_x': c_x, 'c_u': c_u}
+
+    @profiled
+    @cached(key=lambda self, rho, lam: (self.sys, self.params.Q, self.params.R, rho, lam))
+    def compute_tube_controller(self, rho: float, lam: float) -> tuple[np.ndarray, np.ndarray]:
+        '''
+        Computes the tube controller K and the tube shape P, see _compute_tube_controller.
+
+        Args:
+            rho (float): Contraction rate used to design the tube controller, in the range [0, 1).
+            lam (float): Contraction rate of the RPI condition of the tube controller design, in the range [0, 1).
+        Returns:
+            K (np.ndarray): Tube controller gain.
+            P (np.ndarray): Shape matrix of the tube.
+        '''
+        return _compute_tube_controller(self.sys, self.params.Q, self.params.R, rho, lam)
+
+    @profiled
+    def update(self, x: np.ndarray, u: np.ndarray, x_next: np.ndarray) -> bool:
+        '''
+        Updates the parameter set and the point estimate with a new measurement (x, u, x_next).
+
+        The parameters theta which are not falsified by the measurement satisfy x_next - A_0 x - B_0 u - D(x, u) theta
+        in W, where D(x, u) = [A_1 x + B_1 u, ..., A_p x + B_p u]. The intersection with the current parameter set is
+        over-approximated with the fixed facet directions H, i.e., by one LP per facet, and its outer box with one LP
+        per box facet. The point estimate is updated with a normalized LMS filter and projected onto the box.
+
+        Args:
+            x (np.ndarray): State at the previous time step.
+            u (np.ndarray): Applied input at the previous time step.
+            x_next (np.ndarray): Measured state.
+        Returns:
+            consistent (bool): False if the measurement is inconsistent with the parameter set, in which case the
+                parameter set is not updated.
+        '''
+        x, u = (np.asarray(x, dtype=float).reshape(-1), np.asarray(u, dtype=float).reshape(-1))
+        A_delta, B_delta = (self.sys.A_delta, self.sys.B_delta)
+        D = (A_delta[1:] @ x + B_delta[1:] @ u).T
+        y = np.asarray(x_next, dtype=float).reshape(-1) - A_delta[0] @ x - B_delta[0] @ u
+
+        # non-falsified parameter set {theta | -A_w D theta <= b_w - A_w y} intersected with the current set
+        W = self.sys.W
+        A_ub = np.vstack([self.H_theta, -W.A @ D])
+        b_ub = np.concatenate([self.h_theta, W.b.reshape(-1) - W.A @ y])
+
+        support = np.empty(self._directions.shape[0])
+        for i, d in enumerate(self._directions):
+            res = linprog(-d, A_ub=A_ub, b_ub=b_ub, bounds=(None, None), method='highs')
+            if res.status != 0:
+                return False
+            support[i] = -res.fun
+
+        q, p = self.H_theta.shape[0], D.shape[1]
+        self.h_theta = np.minimum(self.h_theta, support[:q])
+        self.theta_ub = np.minimum(self.theta_ub, support[q:q+p])
+        self.theta_lb = np.maximum(self.theta_lb, -support[q+p:])
+
+        # LMS update of the point estimate
+        theta = self.theta_bar + self.mu * D.T @ (y - D @ self.theta_bar) / (1 + np.linalg.norm(D, ord=2)**2)
+        self.theta_bar = np.clip(theta, self.theta_lb, self.theta_ub)
+
+        self._set_estimate_parameters()
+        return True
+
+    @property
+    def omega(self) -> Polytope:
+        '''Current parameter set {theta | H theta <= h}, without enumerating its vertices'''
+        return Polytope(self.H_theta, self.h_theta, lazy=True)
+
+    def _set_estimate_parameters(self) -> None:
+        '''Sets the dynamics at the point estimate and the vertices of the outer box relative to the point estimate'''
+        self.A_bar.value = self.sys.A_of(self.theta_bar)
+        self.B_bar.value = self.sys.B_of(self.theta_bar)
+        center, radius = ((self.theta_ub + self.theta_lb) / 2, (self.theta_ub - self.theta_lb) / 2)
+        self.Delta.value = (center - self.theta_bar + self._box_signs * radius).T
+
+        # memoized solutions are only valid for the previous parameter estimate
+        if self.memo is not None:
+            self.memo.invalidate()
+
+    def _define_output_mapping(self):
+        return {
+            'control': self.v,
+            'state': self.z,
+            'scaling': self.s,
+        }
@@ -7,11 +7,14 @@
 %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
 '''
 
+from functools import partial
 import cvxpy as cp
 import numpy as np
 from scipy.linalg import sqrtm
 
 from ampyc.controllers import ControllerBase
+from ampyc.utils import cached, profiled
+from ampyc.utils.math import _compiled_problem, _sweep
 
 class RMPC(ControllerBase):
     '''
@@ -26,9 +29,10 @@ class RMPC(ControllerBase):
     https://github.com/IntelligentControlSystems/ampyc/notes/03_robustNMPC1.pdf
     '''
 
-    def _init_problem(self, sys, params, rho=0.9, *args, **kwargs):
-        # compute tightening
-        x_tight, u_tight, P, self.K, delta = self.compute_tightening(rho)
+    def _init_problem(self, sys, params, rho=0.9, offline=None, *args, **kwargs):
+        # compute (or reuse) tightening
+        self.offline = self.compute_offline(rho, offline)
+        x_tight, u_tight, P, self.K, delta = (self.offline[key] for key in ['x_tight', 'u_tight', 'P', 'K', 'delta'])
         x_tight = x_tight.flatten()
         u_tight = u_tight.flatten()
 
@@ -54,9 +58,33 @@ class RMPC(ControllerBase):
         # define the CVX optimization problem object
         self.prob = cp.Problem(cp.Minimize(objective), constraints)
 
+    @profiled
+    def compute_offline(self, rho: float, offline: dict | None = None) -> dict:
+        '''
+        Computes the offline quantities of the controller, i.e., the tightening returned by compute_tightening.
+        These do not depend on the prediction horizon, hence provided offline quantities are reused if they
+        were computed for the same robustness margin rho.
+
+        Args:
+            rho (float): The robustness margin, in the range [0, 1).
+            offline (dict | None): Previously computed offline quantities, e.g., for a different horizon.
+        Returns:
+            offline (dict): The offline quantities, i.e., rho and x_tight, u_tight, P, K, delta as returned
+                by compute_tightening.
+        '''
+        if offline is not None and offline['rho'] == rho:
+            return offline
+
+        x_tight, u_tight, P, K, delta = self.compute_tightening(rho)
+        return {'rho': rho, 'x_tight': x_tight, 'u_tight': u_tight, 'P': P, 'K': K, 'delta': delta}
+
+    @profiled
+    @cached(key=lambda self, rho, solver=None: (self.sys, rho, solver if solver is not None else self.solver))
     def compute_tightening(self, rho: float, solver: str | None = None) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, float]:
         ''' 
         Computes an RPI set and the corresponding tightening, which minimizes the constraint tightening.
+        The SDP is compiled once per system with rho as a parameter, see sweep_tightening for evaluating many
+        values of rho.
 
         Args:
             rho (float): The robustness margin, in the range [0, 1).
@@ -71,84 +99,164 @@ class RMPC(ControllerBase):
         # set solver or default to global solver
         solver = solver if solver is not None else self.solver
 
-        # system dimensions
-        n = self.sys.n
-        m = self.sys.m
-
-        # system matrices
-        A = self.sys.A
-        B = self.sys.B
-
-        # state, input, and disturbance sets
-        X = self.sys.X
-        U = self.sys.U
-        W = self.sys.W
-        nx = X.A.shape[0]
-        nu = U.A.shape[0]
-
-        # setup and solve the offline optimization problem
-        E = cp.Variable((n, n), symmetric=True)
-        Y = cp.Variable((m, n))
-
-        c_x_2 = cp.Variable((nx, 1))
-        c_u_2 = cp.Variable((nu, 1))
-        bar_w_2 = cp.Variable()
-
-        # define constraints
-        constraints = []
-        constraints += [E >> np.diag(np.ones(n))]
-        
-        E_bmat = cp.bmat(
+        result = _tightening_chunk(*self._tightening_data(), [rho], solver)[0]
+        if result is None:
+            raise Exception('Tightening SDP could not be solved for rho={0}'.format(rho))
+        return result[0]
+
+    def sweep_tightening(self, rhos: list[float], workers: int | None = None, solver: str | None = None) -> dict:
+        '''
+        Evaluates compute_tightening for a sweep over the robustness margin rho and picks the rho with the
+        smallest tightening cost, i.e., the objective of the tightening SDP. Sequentially, the compiled SDP is
+        reused and warm-started, for workers > 1 the (sorted) values are split over worker processes.
+
+        Usage:
+            sweep = ctrl.sweep_tightening(np.linspace(0.5, 0.95, 10))
+            ctrl = RMPC(sys, params.ctrl, rho=sweep['rho_best'], offline=sweep['offline'])
+
+        Args:
+            rhos (list[float]): Values of the robustness margin, in the range [0, 1).
+            workers (int | None): Number of worker processes, if None or 1 the SDPs are solved in this process.
+            solver (str | None): The solver to use for the optimization problems. If None, the default solver is used.
+        Returns:
+            sweep (dict): 'rho', the tightening 'cost' of shape (len(rhos),), 'x_tight' and 'u_tight' of shape
+                (len(rhos), nx) and (len(rhos), nu), and 'delta' of shape (len(rhos),), NaN where the SDP is
+                infeasible, as well as 'rho_best' and the corresponding offline quantities 'offline' (see
+                compute_offline).
+        '''
+        solver = solver if solver is not None else self.solver
+        rhos = [float(rho) for rho in rhos]
+        results = _sweep(partial(_tightening_chunk, solver=solver), self._tightening_data(), rhos, workers)
+
+        nx, nu = self.sys.X.A.shape[0], self.sys.U.A.shape[0]
+        nan = (np.full((nx, 1), np.nan), np.full((nu, 1), np.nan), None, None, np.nan)
+        values = [nan if r is None else r[0] for r in results]
+        cost = np.array([np.nan if r is None else r[1] for r in results])
+        if np.all(np.isnan(cost)):
+            raise Exception('Tightening SDP is infeasible for all values of rho')
+        best = int(np.nanargmin(cost))
+
+        x_tight, u_tight, P, K, delta = values[best]
+        return {
+            'rho': np.asarray(rhos),
+            'cost': cost,
+            'x_tight': np.hstack([v[0] for v in values]).T,
+            'u_tight': np.hstack([v[1] for v in values]).T,
+            'delta': np.array([v[4] for v in values]),
+            'rho_best': rhos[best],
+            'offline': {'rho': rhos[best], 'x_tight': x_tight, 'u_tight': u_tight, 'P': P, 'K': K, 'delta': delta},
+        }
+
+    def _tightening_data(self) -> tuple:
+        return (self.sys.A, self.sys.B, self.sys.X.A, self.sys.U.A, self.sys.W.vertices)
+
+    def _tube_contains(self, e: np.ndarray, k: int) -> bool:
+        # the ellipsoidal tube {e | e^T P e <= delta^2} is RPI under the tube controller K
+        e = np.asarray(e).reshape(-1)
+        return bool(e @ self.offline['P'] @ e <= self.offline['delta']**2)
+
+    def _define_output_mapping(self):
+        return {
+            'control': self.v,
+            'state': self.z,
+        }
+
+def _tightening_problem(A: np.ndarray, B: np.ndarray, X_A: np.ndarray, U_A: np.ndarray, W_V: np.ndarray) -> tuple:
+    '''Builds the SDP of RMPC.compute_tightening, where rho**2 and 1 / (2 (1 - rho)) are parameters'''
+    # system dimensions
+    n, m = B.shape
+    nx = X_A.shape[0]
+    nu = U_A.shape[0]
+
+    # setup the offline optimization problem
+    E = cp.Variable((n, n), symmetric=True)
+    Y = cp.Variable((m, n))
+
+    c_x_2 = cp.Variable((nx, 1))
+    c_u_2 = cp.Variable((nu, 1))
+    bar_w_2 = cp.Variable()
+
+    rho_sq = cp.Parameter(nonneg=True)
+    scale = cp.Parameter(nonneg=True)
+
+    # define constraints
+    constraints = []
+    constraints += [E >> np.diag(np.ones(n))]
+
+    E_bmat = cp.bmat(
+        [
+            [rho_sq * E,   (A @ E + B @ Y).T],
+            [(A @ E + B @ Y), E]
+        ]
+    )
+    constraints += [E_bmat >> 0]
+
+    for i in range(nx):
+        x_bmat = cp.bmat(
             [
-                [rho**2 * E,   (A @ E + B @ Y).T],
-                [(A @ E + B @ Y), E]
+                [cp.reshape(c_x_2[i],(1,1),'C'),      X_A[i, :].reshape(1,-1) @ E],
+                [E.T @ X_A[i, :].reshape(1,-1).T, E]
             ]
         )
-        constraints += [E_bmat >> 0]
-
-        for i in range(nx):
-            x_bmat = cp.bmat(
-                [
-                    [cp.reshape(c_x_2[i],(1,1),'C'),      X.A[i, :].reshape(1,-1) @ E],
-                    [E.T @ X.A[i, :].reshape(1,-1).T, E]
-                ]
-            )
-            constraints += [x_bmat >> 0]
-
-        for i in range(nu):
-            u_bmat = cp.bmat(
-                [
-                    [cp.reshape(c_u_2[i],(1,1),'C'),      U.A[i, :].reshape(1,-1) @ Y],
-                    [Y.T @ U.A[i, :].reshape(1,-1).T, E]
-
-                ]
-            )
-            constraints += [u_bmat >> 0]
-
-        for i in range(W.vertices.shape[0]):
-            w_bmat = cp.bmat(
-                [
-                    [cp.reshape(bar_w_2,(1,1),'C'),        W.vertices[i, :].reshape(1,-1)],
-                    [W.vertices[i, :].reshape(1,-1).T, E]
-                ]
-            )
-            constraints += [w_bmat >> 0]
-
-        # define objective
-        '''
-            Please note that we included here a weighting on the state
-            tightening, i.e., 50*sum(c_x_2). We did this since for this
-            specific example, the cost favours the input tightening and
-            including this weighting puts more emphasis on the state
-            tightening, therefore ensuring more balance between the two
-            terms.
-        '''
-        objective = cp.Minimize(
-            (50*cp.sum(c_x_2) + cp.sum(c_u_2) + (nx + nu) * bar_w_2) / (2 * (1 - rho))
+        constraints += [x_bmat >> 0]
+
+    for i in range(nu):
+        u_bmat = cp.bmat(
+            [
+                [cp.reshape(c_u_2[i],(1,1),'C'),      U_A[i, :].reshape(1,-1) @ Y],
+                [Y.T @ U_A[i, :].reshape(1,-1).T, E]
+
+            ]
         )
+        constraints += [u_bmat >> 0]
+
+    for i in range(W_V.shape[0]):
+        w_bmat = cp.bmat(
+            [
+                [cp.reshape(bar_w_2,(1,1),'C'),        W_V[i, :].reshape(1,-1)],
+                [W_V[i, :].reshape(1,-1).T, E]
+            ]
+        )
+        constraints += [w_bmat >> 0]
+
+    # define objective
+    '''
+        Please note that we included here a weighting on the state
+        tightening, i.e., 50*sum(c_x_2). We did this since for this
+        specific example, the cost favours the input tightening and
+        including this weighting puts more emphasis on the state
+        tightening, therefore ensuring more balance between the two
+        terms.
+    '''
+    objective = cp.Minimize(
+        scale * (50*cp.sum(c_x_2) + cp.sum(c_u_2) + (nx + nu) * bar_w_2)
+    )
+
+    return cp.Problem(objective, constraints), E, Y, c_x_2, c_u_2, bar_w_2, rho_sq, scale
+
+def _tightening_chunk(A: np.ndarray, B: np.ndarray, X_A: np.ndarray, U_A: np.ndarray, W_V: np.ndarray,
+                      rhos: list[float], solver: str | None = None) -> list:
+    '''
+    Solves the tightening SDP for each rho, reusing the compiled problem and warm-starting each solve. Returns
+    ((x_tight, u_tight, P, K, delta), cost) for each rho, or None if the SDP could not be solved.
+    '''
+    prob, E, Y, c_x_2, c_u_2, bar_w_2, rho_sq, scale = _compiled_problem(_tightening_problem, A, B, X_A, U_A, W_V)
+
+    results = []
+    for rho in rhos:
+        rho_sq.value = rho**2
+        scale.value = 1 / (2 * (1 - rho))
 
         # solve the problem
-        cp.Problem(objective, constraints).solve(solver=solver)
+        try:
+            prob.solve(solver=solver, warm_start=True)
+        except cp.error.SolverError:
+            # NOTE: the status and values of the (shared) problem still hold the previous solution
+            results.append(None)
+            continue
+        if E.value is None or prob.status not in [cp.OPTIMAL, cp.OPTIMAL_INACCURATE]:
+            results.append(None)
+            continue
 
         # recover lyapunov function and controller
         P = np.linalg.inv(np.array(E.value))
@@ -163,10 +271,5 @@ class RMPC(ControllerBase):
         # compute tightening of input constraints
         u_tight = delta * np.sqrt(c_u_2.value)
 
-        return x_tight, u_tight, P, K, delta
-    
-    def _define_output_mapping(self):
-        return {
-            'control': self.v,
-            'state': self.z,
-        }
\ No newline at end of file
+        results.append(((x_tight, u_tight, P, K, delta), float(prob.value)))
+    return results
@@ -0,0 +1,166 @@
+'''
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+% Copyright (C) 2025, Intelligent Control Systems Group, ETH Zurich
+%
+% This code is made available under an MIT License (see LICENSE file).
+%
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+'''
+
+from collections import OrderedDict
+from dataclasses import replace
+import numpy as np
+
+from .solve_stats import SolveStats
+
+
+class SolveMemo:
+    '''
+    In-memory LRU memoization of the solutions of ControllerBase.solve, e.g., for compute_RoA, horizon sweeps, or
+    repeated notebook runs, which solve the same controller for the same initial conditions.
+
+    A solution is keyed on the initial condition, quantized to the given resolution, and a hash of the additional
+    parameters, the solver, and the solver options. Unsuccessful solves are memoized as well, since they are
+    equally deterministic. If a solution is not memoized, the solution of the nearest memoized initial condition with
+    the same additional parameters and solver settings is used as initial guess, i.e., as warm start of CVXPY or as
+    initial value of the CasADi decision variables.
+
+    The memoization is enabled per controller with the keyword argument memoize, either as the capacity or as a
+    dictionary with the arguments of this class. The memoized solutions are only valid as long as the controller
+    is not modified, call invalidate after changing, e.g., the system or the parameters of the controller.
+
+    Usage:
+        ctrl = MPC(sys, params.ctrl, memoize=1024)
+        RoA = compute_RoA(ctrl, sys)
+        RoA = compute_RoA(ctrl, sys)  # all solves are memoized
+        ctrl.memo.info()  # e.g. {'capacity': 1024, 'size': 625, 'hits': 625, 'misses': 625, ...}
+    '''
+
+    def __init__(self, capacity: int = 256, resolution: float = 1e-8, warm_start: bool = True,
+                 warm_start_radius: float = np.inf) -> None:
+        '''
+        Args:
+            capacity: maximum number of memoized solutions, the least recently used solution is evicted first
+            resolution: quantization of the initial condition, i.e., initial conditions which round to the same
+                        multiple of resolution share a solution
+            warm_start: if True, memoized solutions are used as initial guess for nearby initial conditions
+            warm_start_radius: maximum Euclidean distance of a memoized initial condition used as warm start
+        '''
+        if capacity < 1:
+            raise Exception('The capacity of the memoization must be at least 1!')
+        self.capacity = capacity
+        self.resolution = resolution
+        self.warm_start = warm_start
+        self.warm_start_radius = warm_start_radius
+        self._entries = OrderedDict()
+        self._stats = {'hits': 0, 'misses': 0, 'bypassed': 0, 'warm_starts': 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def info(self) -> dict:
+        '''
+        Returns the configuration and the statistics of the memoization, i.e., the number of hits, misses, bypassed
+        calls (calls with additional parameters or options that cannot be hashed), and warm starts.
+        '''
+        calls = self._stats['hits'] + self._stats['misses']
+        return {'capacity': self.capacity, 'size': len(self), **self._stats,
+                'hit_rate': self._stats['hits'] / calls if calls > 0 else 0.0}
+
+    def invalidate(self) -> None:
+        '''Removes all memoized solutions, e.g., after the parameters of the controller changed.'''
+        self._entries.clear()
+
+    def clear(self) -> None:
+        '''Removes all memoized solutions and resets the statistics.'''
+        self.invalidate()
+        self._stats = {'hits': 0, 'misses': 0, 'bypassed': 0, 'warm_starts': 0}
+
+    def key(self, x: np.ndarray, additional_parameters: dict, solver: str | None, options: dict | None) -> tuple | None:
+        '''
+        Computes the key of a solve, or None if the additional parameters or options cannot be hashed.
+
+        Returns:
+            key: tuple of the hash of the solver settings and the quantized initial condition
+        '''
+        # NOTE: imported on first use, since ampyc.utils loads the polytope package and scipy
+        from ampyc.utils.cache import _hash
+        try:
+            context = _hash((additional_parameters, solver, options))
+        except TypeError:
+            self._stats['bypassed'] += 1
+            return None
+        return context, tuple(np.round(np.asarray(x, dtype=float).reshape(-1) / self.resolution).astype(np.int64))
+
+    def lookup(self, key: tuple) -> tuple[dict, str | None, SolveStats] | None:
+        '''
+        Looks up a memoized solution.
+
+        Args:
+            key: key of the solve, see key
+
+        Returns:
+            out_map: copy of the output mapping of the memoized solution
+            error_msg: error message of the memoized solution
+            stats: statistics of the memoized solution with status 'memoized' and zero solver times,
+            or None if the solution is not memoized
+        '''
+        entry = self._entries.get(key)
+        if entry is None:
+            self._stats['misses'] += 1
+            return None
+
+        self._stats['hits'] += 1
+        self._entries.move_to_end(key)
+        out_map = {k: np.copy(v) if isinstance(v, np.ndarray) else v for k, v in entry['out_map'].items()}
+        stats = replace(entry['stats'], status='memoized', setup_time=0.0, compile_time=0.0, solve_time=0.0,
+                        iterations=0)
+        return out_map, entry['error_msg'], stats
+
+    def nearest(self, key: tuple, x: np.ndarray) -> list | np.ndarray | None:
+        '''
+        Returns the primal solution of the nearest successfully solved initial condition with the same solver
+        settings as initial guess, or None if there is none within warm_start_radius.
+
+        Args:
+            key: key of the solve, see key
+            x: initial condition of the solve
+        '''
+        if not self.warm_start:
+            return None
+        x = np.asarray(x, dtype=float).reshape(-1)
+        candidates = [entry for (context, _), entry in self._entries.items()
+                      if context == key[0] and entry['primal'] is not None]
+        if len(candidates) == 0:
+            return None
+
+        dist = [np.linalg.norm(entry['x'] - x) for entry in candidates]
+        i = int(np.argmin(dist))
+        if dist[i] > self.warm_start_radius:
+            return None
+        self._stats['warm_starts'] += 1
+        return candidates[i]['primal']
+
+    def store(self, key: tuple, x: np.ndarray, out_map: dict, error_msg: str | None, stats: SolveStats,
+              primal: list | np.ndarray | None) -> None:
+        '''
+        Memoizes a solution and evicts the least recently used solution if the capacity is exceeded.
+
+        Args:
+            key: key of the solve, see key
+            x: initial condition of the solve
+            out_map: output mapping with the values of the outputs
+            error_msg: error message of the solve
+            stats: statistics of the solve
+            primal: values of all decision variables used as warm start, or None if the solve was not successful
+        '''
+        self._entries[key] = {
+            'x': np.array(x, dtype=float).reshape(-1),
+            'out_map': {k: np.copy(v) if isinstance(v, np.ndarray) else v for k, v in out_map.items()},
+            'error_msg': error_msg,
+            'stats': stats,
+            'primal': primal,
+        }
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
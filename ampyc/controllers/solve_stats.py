@@ -0,0 +1,123 @@
+'''
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+% Copyright (C) 2025, Intelligent Control Systems Group, ETH Zurich
+%
+% This code is made available under an MIT License (see LICENSE file).
+%
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+'''
+
+from dataclasses import dataclass, fields
+import numpy as np
+
+@dataclass
+class SolveStats:
+    '''
+    Statistics of a single call to ControllerBase.solve, split into the phases of the solve.
+
+    Parameters:
+        controller (str): Class name of the controller.
+        solver (str | None): Name of the solver used, if known.
+        status (str | None): Solver status, e.g., 'optimal' for CVXPY or 'Solve_Succeeded' for IPOPT.
+        success (bool): True if the solver returned an optimal solution.
+        setup_time (float): Wall time for setting the initial condition and the additional parameters in seconds.
+        compile_time (float | None): Wall time for canonicalizing (CVXPY) or building (CasADi) the problem in seconds.
+        solve_time (float | None): Time spent in the solver in seconds, as reported by the solver if available.
+        total_time (float): Wall time of the full call to solve in seconds.
+        iterations (int | None): Number of solver iterations.
+        objective (float | None): Optimal objective value.
+        residual (float | None): Maximum constraint violation of the returned solution.
+        error_msg (str | None): Error message returned by solve, if any.
+    '''
+    controller: str
+    solver: str | None = None
+    status: str | None = None
+    success: bool = False
+    setup_time: float = 0.0
+    compile_time: float | None = None
+    solve_time: float | None = None
+    total_time: float = 0.0
+    iterations: int | None = None
+    objective: float | None = None
+    residual: float | None = None
+    error_msg: str | None = None
+
+
+class SolveStatsRecorder:
+    '''
+    Collects the SolveStats of many solves, e.g., over a closed-loop simulation, and aggregates latency percentiles
+    per controller. An instance can be passed directly as stats_callback to any controller.
+
+    Usage:
+        recorder = SolveStatsRecorder()
+        ctrl = MPC(sys, params.ctrl, stats_callback=recorder)
+        ... # simulate the closed loop
+        recorder.summary()  # e.g. {'MPC': {'count': 300, 'total_time': {'p50': ..., 'p99': ...}, ...}}
+    '''
+
+    TIMES = ['setup_time', 'compile_time', 'solve_time', 'total_time']
+
+    def __init__(self) -> None:
+        self.stats: list[SolveStats] = []
+
+    def __call__(self, stats: SolveStats) -> None:
+        self.stats.append(stats)
+
+    def __len__(self) -> int:
+        return len(self.stats)
+
+    def clear(self) -> None:
+        '''Removes all recorded statistics.'''
+        self.stats = []
+
+    def as_dict(self, controller: str | None = None) -> dict[str, np.ndarray]:
+        '''
+        Returns the recorded statistics as arrays, i.e., one array per field of SolveStats.
+
+        Args:
+            controller (str | None): If provided, only statistics of this controller are returned.
+        '''
+        stats = [s for s in self.stats if controller is None or s.controller == controller]
+        return {f.name: np.array([getattr(s, f.name) for s in stats]) for f in fields(SolveStats)}
+
+    def percentiles(self, q: list[float] = [50, 99], controller: str | None = None) -> dict[str, dict[str, float]]:
+        '''
+        Computes percentiles of the phase times in seconds.
+
+        Args:
+            q (list[float]): Percentiles to compute, between 0 and 100.
+            controller (str | None): If provided, only statistics of this controller are used.
+
+        Returns:
+            percentiles (dict[str, dict[str, float]]): Percentiles of each phase time, e.g.,
+                {'total_time': {'p50': ..., 'p99': ...}}. Phases which were not measured are NaN.
+        '''
+        stats = [s for s in self.stats if controller is None or s.controller == controller]
+        out = {}
+        for name in self.TIMES:
+            times = np.array([getattr(s, name) for s in stats if getattr(s, name) is not None], dtype=float)
+            out[name] = {f'p{p:g}': float(np.percentile(times, p)) if times.size > 0 else np.nan for p in q}
+        return out
+
+    def summary(self, q: list[float] = [50, 99]) -> dict[str, dict]:
+        '''
+        Aggregates the recorded statistics per controller.
+
+        Args:
+            q (list[float]): Percentiles to compute, between 0 and 100.
+
+        Returns:
+            summary (dict[str, dict]): For each controller, the number of solves, the fraction of successful
+                solves, the mean number of iterations, and the percentiles of each phase time.
+        '''
+        summary = {}
+        for controller in dict.fromkeys(s.controller for s in self.stats):
+            stats = [s for s in self.stats if s.controller == controller]
+            iterations = [s.iterations for s in stats if s.iterations is not None]
+            summary[controller] = {
+                'count': len(stats),
+                'success_rate': float(np.mean([s.success for s in stats])),
+                'mean_iterations': float(np.mean(iterations)) if iterations else np.nan,
+                **self.percentiles(q, controller),
+            }
+        return summary
@@ -8,15 +8,36 @@
 '''
 
 from abc import ABC, abstractmethod
+import copy
+import warnings
 import numpy as np
 
 from ampyc.utils import Polytope, qhull
 
+VARIANCE_REDUCTION = [None, 'antithetic', 'qmc', 'importance']
+
+
 class NoiseBase(ABC):
-    """Base class for random noise/disturbance generators"""
+    """
+    Base class for random noise/disturbance generators.
+
+    Generators which support variance reduction for Monte Carlo estimates (see
+    ampyc.utils.monte_carlo.estimate_probability) take the argument variance_reduction, which is one of
+    - None: plain Monte Carlo sampling
+    - 'antithetic': antithetic pairs, i.e., samples 2i and 2i+1 are generated from the uniform variates u and 1-u
+    - 'qmc': randomized quasi Monte Carlo, i.e., the uniform variates are taken from a scrambled Sobol sequence
+    - 'importance': samples are drawn from a proposal distribution, and the likelihood ratio weights of the last
+      generated samples are stored in the attribute weights
+    """
 
     state_dependent: bool = False
     rng: np.random.Generator | None = None
+    seed_seq: np.random.SeedSequence | None = None
+    variance_reduction: str | None = None
+    weights: np.ndarray | None = None
+
+    # sampling state, which is not hashed by the cache (private attributes are never hashed)
+    _hash_exclude = ('weights',)
 
     def generate(self, N: int | None = None) -> np.ndarray:
         return self._generate(N)
@@ -34,7 +55,78 @@ class NoiseBase(ABC):
     def seed(self, seed: int | None = None):
         '''Resets the random number generator with a new seed'''
         assert seed is None or seed >= 0
-        self.rng = np.random.default_rng(seed)
+        self.seed_seq = np.random.SeedSequence(seed)
+        self.rng = np.random.default_rng(self.seed_seq)
+        self._reset_state()
+
+    def _reset_state(self) -> None:
+        '''
+        Resets the state of the sampler which depends on the previously drawn samples, e.g., the QMC engine, such
+        that the samples only depend on the random number generator. Inherited classes with additional sampler
+        state extend this method.
+        '''
+        self._qmc = None
+        self._antithetic_pending = None
+        self.weights = None
+
+    def stream(self, idx: int) -> 'NoiseBase':
+        '''
+        Returns a copy of this noise generator with an independent random number generator, which is
+        deterministically selected by idx, e.g., the index of a trajectory. The streams are derived from the
+        SeedSequence of this generator and are independent of the order and the process in which they are
+        created, such that parallel simulations give bit-identical results to serial ones.
+
+        Args:
+            idx: index of the stream
+        Returns:
+            noise: copy of this noise generator using stream idx
+        '''
+        assert idx >= 0
+        if self.seed_seq is None:
+            self.seed()
+        noise = copy.deepcopy(self)
+        noise.seed_seq = np.random.SeedSequence(self.seed_seq.entropy, spawn_key=self.seed_seq.spawn_key + (idx,))
+        noise.rng = np.random.default_rng(noise.seed_seq)
+        # the sampler state, e.g., the QMC engine, belongs to the random number stream of this generator
+        noise._reset_state()
+        return noise
+
+    def spawn(self, k: int) -> list['NoiseBase']:
+        '''
+        Returns k noise generators with independent random number streams, i.e., the streams 0, ..., k-1, see
+        stream. In contrast to SeedSequence.spawn, repeated calls return the same streams.
+
+        Args:
+            k: number of streams
+        Returns:
+            noises: list of k noise generators
+        '''
+        return [self.stream(i) for i in range(k)]
+
+    def _uniforms(self, N: int, d: int) -> np.ndarray:
+        '''
+        Draws N uniform random vectors in [0, 1)^d according to the variance reduction mode, which are mapped to
+        noise samples by the inherited class.
+        '''
+        if self.variance_reduction == 'qmc':
+            from scipy.stats import qmc
+            if self._qmc is None or self._qmc.d != d:
+                self._qmc = qmc.Sobol(d, scramble=True, seed=self.rng)
+            with warnings.catch_warnings():
+                # Sobol sequences are balanced only for N = 2^m, but any N is a valid randomized QMC sample
+                warnings.simplefilter('ignore', UserWarning)
+                return self._qmc.random(N)
+
+        elif self.variance_reduction == 'antithetic':
+            # pairs (u, 1-u) are interleaved, an unpaired second half of a pair is kept for the next call
+            U = [] if self._antithetic_pending is None else [self._antithetic_pending]
+            num_pairs = int(np.ceil((N - len(U)) / 2))
+            u = self.rng.uniform(size=(num_pairs, d))
+            U = np.vstack(U + [np.stack([u, 1 - u], axis=1).reshape(-1, d)])
+            self._antithetic_pending = U[N:] if U.shape[0] > N else None
+            return U[:N]
+
+        return self.rng.uniform(size=(N, d))
 
 
 class ZeroNoise(NoiseBase):
@@ -49,18 +141,47 @@ class ZeroNoise(NoiseBase):
 
 
 class GaussianNoise(NoiseBase):
-    """Computes Gaussian disturbance based on noise mean and covariance"""
+    """
+    Computes Gaussian disturbance based on noise mean and covariance.
+
+    Supports all variance reduction modes of NoiseBase. For importance sampling, the samples are drawn from the
+    Gaussian proposal with proposal_mean and proposal_cov (default: mean and covariance), e.g., shifted towards
+    a constraint whose violation probability is estimated.
+    """
 
-    def __init__(self, mean: np.ndarray, covariance: np.ndarray, seed: int | None = None) -> None:
+    def __init__(self, mean: np.ndarray, covariance: np.ndarray, seed: int | None = None,
+                 variance_reduction: str | None = None, proposal_mean: np.ndarray | None = None,
+                 proposal_cov: np.ndarray | None = None) -> None:
         assert len(covariance.shape) == 2 and covariance.shape[0] == covariance.shape[1]
         assert len(mean) == covariance.shape[0]
         assert seed is None or seed >= 0
+        assert variance_reduction in VARIANCE_REDUCTION, f'Unknown variance reduction {variance_reduction}'
         self.mean = mean.reshape(-1)
         self.cov = covariance
-        self.rng = np.random.default_rng(seed)
+        self.seed(seed)
+        self.variance_reduction = variance_reduction
+
+        if variance_reduction in ['antithetic', 'qmc']:
+            # square root of the covariance, which also exists for singular covariances
+            eigvals, eigvecs = np.linalg.eigh(covariance)
+            self._sqrt_cov = eigvecs * np.sqrt(np.clip(eigvals, 0, None))
+        elif variance_reduction == 'importance':
+            self.proposal_mean = self.mean if proposal_mean is None else proposal_mean.reshape(-1)
+            self.proposal_cov = self.cov if proposal_cov is None else proposal_cov
+            assert self.proposal_mean.shape == self.mean.shape and self.proposal_cov.shape == self.cov.shape
 
     def _generate(self, N: int | None = None) -> np.ndarray:
-        if N is None:
+        if self.variance_reduction in ['antithetic', 'qmc']:
+            from scipy.special import ndtri
+            U = np.clip(self._uniforms(1 if N is None else N, self.mean.shape[0]), 1e-16, 1 - 1e-16)
+            sample = self.mean.reshape(-1, 1) + self._sqrt_cov @ ndtri(U).T
+        elif self.variance_reduction == 'importance':
+            sample = self.rng.multivariate_normal(
+                self.proposal_mean, self.proposal_cov, size=(1 if N is None else N,), check_valid="raise"
+            ).T
+            self.weights = np.exp(_gaussian_logpdf(sample, self.mean, self.cov)
+                                  - _gaussian_logpdf(sample, self.proposal_mean, self.proposal_cov))
+        elif N is None:
             sample = self.rng.multivariate_normal(
                 self.mean, self.cov, check_valid="raise"
             ).reshape(-1,1)
@@ -71,26 +192,127 @@ class GaussianNoise(NoiseBase):
         return sample
 
 
-class TruncGaussianNoise(GaussianNoise):
-    """Computes Gaussian disturbance based on noise mean and covariance in the set A_w * w <= b_w"""
+def _gaussian_logpdf(x: np.ndarray, mean: np.ndarray, cov: np.ndarray) -> np.ndarray:
+    '''Log-density of the Gaussian N(mean, cov) at the columns of x'''
+    L = np.linalg.cholesky(cov)
+    z = np.linalg.solve(L, x - mean.reshape(-1, 1))
+    return -0.5 * np.sum(z**2, axis=0) - np.sum(np.log(np.diag(L))) - 0.5 * x.shape[0] * np.log(2 * np.pi)
 
-    def __init__(self, mean: np.ndarray, covariance: np.ndarray, W: Polytope, max_iters: int = 1e4, seed: int | None = None) -> None:
+
+class TruncGaussianNoise(GaussianNoise):
+    """
+    Computes Gaussian disturbance based on noise mean and covariance in the set A_w * w <= b_w.
+
+    Samples are generated in batches by rejection sampling: oversized blocks are drawn from the Gaussian and
+    filtered with a vectorized membership test, until N samples are accepted. The block size adapts to the
+    observed acceptance rate. Rejection sampling is exact, but fails if the distribution and the truncation
+    polytope overlap very little. For such cases, a Gibbs sampler can be selected (opt-in), which samples each
+    coordinate from its univariate truncated normal conditional and runs one independent chain per sample.
+    Note that the Gibbs samples are only approximately distributed according to the truncated Gaussian, since
+    each chain runs a fixed number of burn_in sweeps starting at the Chebyshev center of the polytope.
+
+    Args:
+        mean: mean of the untruncated Gaussian
+        covariance: covariance of the untruncated Gaussian
+        W: truncation polytope
+        max_iters: maximum number of rejected draws per sample before rejection sampling fails
+        seed: seed of the random number generator
+        method: 'rejection' (default), 'gibbs', or 'auto', which switches from rejection to Gibbs sampling
+            with a warning if the acceptance rate drops below min_acceptance
+        min_acceptance: acceptance rate below which 'auto' switches to Gibbs sampling
+        burn_in: number of Gibbs sweeps (over all coordinates) per sample
+    """
+
+    def __init__(self, mean: np.ndarray, covariance: np.ndarray, W: Polytope, max_iters: int = 1e4, seed: int | None = None,
+                 method: str = 'rejection', min_acceptance: float = 1e-2, burn_in: int = 20) -> None:
         assert seed is None or seed >= 0
+        assert method in ['rejection', 'gibbs', 'auto'], f'Unknown sampling method {method}'
         super().__init__(mean, covariance, seed=seed)
         self.trunc_bounds = W
         self.max_iters = max_iters
+        self.method = method
+        self.min_acceptance = min_acceptance
+        self.burn_in = burn_in
+
+    def _reset_state(self) -> None:
+        super()._reset_state()
+        # observed number of draws and accepted samples, used to adapt the block size
+        self._num_drawn = 0
+        self._num_accepted = 0
+
+    @property
+    def acceptance_rate(self) -> float:
+        '''Observed acceptance rate of the rejection sampler, 1.0 if no samples were drawn yet'''
+        return self._num_accepted / self._num_drawn if self._num_drawn > 0 else 1.0
 
     def _generate(self, N: int | None = None) -> np.ndarray:
-        if N is not None:
-            print("[Warning] N is ignored for truncated Gaussian noise, returning a single sample instead.")
-        iters = 0
-        w = super()._generate()
-        while w not in self.trunc_bounds:
-            w = super()._generate()
-            iters += 1
-            if iters > self.max_iters:
+        num = 1 if N is None else N
+        if self.method == 'gibbs':
+            sample = self._gibbs(num)
+        else:
+            sample = self._rejection(num)
+        return sample
+
+    def _rejection(self, N: int) -> np.ndarray:
+        '''Batched rejection sampling with a block size adapted to the observed acceptance rate'''
+        A, b = self.trunc_bounds.A, self.trunc_bounds.b.reshape(-1, 1)
+        samples = []
+        num_accepted = 0
+        num_drawn = 0
+        while num_accepted < N:
+            if self.method == 'auto' and self._num_drawn >= 100 and self.acceptance_rate < self.min_acceptance:
+                warnings.warn('Acceptance rate {0:.2g} of rejection sampling is below {1}, switching to approximate '
+                              'Gibbs sampling'.format(self.acceptance_rate, self.min_acceptance), RuntimeWarning)
+                samples.append(self._gibbs(N - num_accepted))
+                break
+            if num_drawn > self.max_iters * N:
                 raise Exception("exceeded max_iters of {0}, likely because of little overlap between the distribution and truncation polytope".format(self.max_iters))
-        return w
+
+            # oversize the block by 10% plus a constant margin to avoid many small top-up blocks
+            remaining = N - num_accepted
+            block = int(min(np.ceil(1.1 * remaining / max(self.acceptance_rate, 1e-6)) + 10, 1e6))
+            w = super()._generate(block)
+            w = w[:, np.all(A @ w <= b, axis=0)]
+
+            samples.append(w[:, :remaining])
+            num_accepted += w.shape[1]
+            num_drawn += block
+            self._num_accepted += w.shape[1]
+            self._num_drawn += block
+
+        return np.hstack(samples)[:, :N]
+
+    def _gibbs(self, N: int) -> np.ndarray:
+        '''Gibbs sampling of N independent chains, each started at the Chebyshev center of the truncation polytope'''
+        from scipy.stats import truncnorm
+
+        try:
+            L = np.linalg.cholesky(self.cov)
+        except np.linalg.LinAlgError:
+            raise Exception("Gibbs sampling requires a positive definite covariance")
+
+        # whitened coordinates z = L^-1 (w - mean), in which the truncated Gaussian is a standard normal
+        # restricted to the polytope A_z z <= b_z
+        A_z = self.trunc_bounds.A @ L
+        b_z = self.trunc_bounds.b.reshape(-1, 1) - (self.trunc_bounds.A @ self.mean).reshape(-1, 1)
+        z0 = np.linalg.solve(L, np.asarray(self.trunc_bounds.chebXc).reshape(-1) - self.mean)
+        z = np.tile(z0.reshape(-1, 1), (1, N))
+
+        slack = b_z - A_z @ z
+        for _ in range(self.burn_in):
+            for i in range(z.shape[0]):
+                # bounds of coordinate i given all other coordinates
+                a_i = A_z[:, i].reshape(-1, 1)
+                r = slack + a_i * z[i]
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    bound = r / a_i
+                upper = np.min(np.where(a_i > 0, bound, np.inf), axis=0)
+                lower = np.max(np.where(a_i < 0, bound, -np.inf), axis=0)
+                z_i = truncnorm.rvs(lower, upper, random_state=self.rng)
+                slack = r - a_i * z_i
+                z[i] = z_i
+
+        return self.mean.reshape(-1, 1) + L @ z
 
 
 class PolytopeVerticesNoise(NoiseBase):
@@ -99,7 +321,7 @@ class PolytopeVerticesNoise(NoiseBase):
     def __init__(self, W: Polytope, seed: int | None = None) -> None:
         assert seed is None or seed >= 0
         self.V = W.V
-        self.rng = np.random.default_rng(seed)
+        self.seed(seed)
 
     def _generate(self, N: int | None = None) -> np.ndarray:
         if N is None:
@@ -112,28 +334,108 @@ class PolytopeVerticesNoise(NoiseBase):
 
 
 class PolytopeNoise(NoiseBase):
-    """Samples a random disturbance vector within a polytope, where vertices are weighted uniformly"""
-
-    def __init__(self, W: Polytope, seed: int | None = None) -> None:
+    """
+    Samples a random disturbance vector within a polytope.
+
+    With method='uniform' (default), the samples are uniformly distributed on the polytope. For polytopes of
+    dimension up to max_triangulation_dim, the polytope is triangulated into simplices, a simplex is selected
+    with probability proportional to its volume, and a uniform point in the simplex is drawn. In higher
+    dimensions, where the triangulation becomes expensive, a hit-and-run sampler with burn_in steps per sample
+    is used. With method='vertices', the vertices are weighted uniformly, which is not uniform on the polytope
+    and concentrates the samples near the centroid.
+
+    The variance reduction modes 'antithetic' and 'qmc' of NoiseBase are supported by all samplers except
+    hit-and-run.
+    """
+
+    def __init__(self, W: Polytope, seed: int | None = None, method: str = 'uniform',
+                 max_triangulation_dim: int = 4, burn_in: int = 50, variance_reduction: str | None = None) -> None:
         assert seed is None or seed >= 0
+        assert method in ['uniform', 'vertices'], f'Unknown sampling method {method}'
+        assert variance_reduction in [None, 'antithetic', 'qmc'], \
+            f'Variance reduction {variance_reduction} is not supported for polytope noise'
         self.V = W.V
-        self.rng = np.random.default_rng(seed)
+        self.seed(seed)
+        self.method = method
+        self.burn_in = burn_in
+        self.variance_reduction = variance_reduction
+
+        if method == 'uniform':
+            dim = self.V.shape[1]
+            if dim == 1:
+                self._sampler = 'interval'
+            elif dim <= max_triangulation_dim:
+                self._sampler = 'triangulation'
+                self._init_triangulation()
+            else:
+                if variance_reduction is not None:
+                    raise Exception(f'Variance reduction {variance_reduction} is not supported by the hit-and-run sampler, increase max_triangulation_dim')
+                self._sampler = 'hit_and_run'
+                self.A, self.b = W.A, W.b.reshape(-1, 1)
+                self.center = np.asarray(W.chebXc).reshape(-1, 1)
+
+    def _init_triangulation(self) -> None:
+        '''Triangulates the polytope into simplices and computes their volumes'''
+        from scipy.spatial import Delaunay
+        simplices = self.V[Delaunay(self.V).simplices]  # (num_simplices, dim+1, dim)
+        volumes = np.abs(np.linalg.det(simplices[:, 1:, :] - simplices[:, :1, :]))
+        keep = volumes > 0
+        self.simplices = simplices[keep]
+        self.simplex_weights = volumes[keep] / np.sum(volumes[keep])
 
     def _generate(self, N: int | None = None) -> np.ndarray:
-        """Based on implementation for randomPoint() in MPT"""
-        if N is None:
-            L = self.rng.uniform(size=(1, self.V.shape[0]))
-            L /= np.sum(L)
-            sample = (L @ self.V).reshape(-1, 1)
+        num = 1 if N is None else N
+        if self.method == 'vertices':
+            sample = self._vertex_weights(num)
+        elif self._sampler == 'interval':
+            sample = self.V.min() + (self.V.max() - self.V.min()) * self._uniforms(num, 1).T
+        elif self._sampler == 'triangulation':
+            sample = self._triangulation(num)
         else:
-            L = self.rng.uniform(size=(N, self.V.shape[0]))
-            L /= np.sum(L, axis=1).reshape(-1, 1)
-            sample = (L @ self.V).T
+            sample = self._hit_and_run(num)
         return sample
 
+    def _vertex_weights(self, N: int) -> np.ndarray:
+        """Based on implementation for randomPoint() in MPT"""
+        L = self._uniforms(N, self.V.shape[0])
+        L /= np.sum(L, axis=1).reshape(-1, 1)
+        return (L @ self.V).T
+
+    def _triangulation(self, N: int) -> np.ndarray:
+        '''Uniform sampling from volume-weighted simplices'''
+        U = np.clip(self._uniforms(N, self.simplices.shape[1] + 1), 1e-16, 1 - 1e-16)
+        # select simplices by inverting the cumulative distribution of the volume weights
+        idx = np.minimum(np.searchsorted(np.cumsum(self.simplex_weights), U[:, 0], side='right'),
+                         len(self.simplex_weights) - 1)
+        # uniform barycentric coordinates, i.e., a flat Dirichlet distribution
+        L = -np.log(U[:, 1:])
+        L /= np.sum(L, axis=1).reshape(-1, 1)
+        return np.einsum('ij,ijk->ki', L, self.simplices[idx])
+
+    def _hit_and_run(self, N: int) -> np.ndarray:
+        '''Hit-and-run sampling of N independent chains, each started at the Chebyshev center'''
+        x = np.tile(self.center, (1, N))
+        for _ in range(self.burn_in):
+            d = self.rng.standard_normal(size=x.shape)
+            d /= np.linalg.norm(d, axis=0)
+
+            # feasible interval of x + t * d
+            Ad = self.A @ d
+            slack = self.b - self.A @ x
+            with np.errstate(divide='ignore', invalid='ignore'):
+                t = slack / Ad
+            t_max = np.min(np.where(Ad > 0, t, np.inf), axis=0)
+            t_min = np.max(np.where(Ad < 0, t, -np.inf), axis=0)
+            x = x + self.rng.uniform(t_min, t_max) * d
+        return x
+
 
 class StateDependentNoiseBase(NoiseBase):
-    """Base class for state dependent random noise/disturbance generators"""
+    """
+    Base class for state dependent random noise/disturbance generators. The state x is either a single state of
+    shape (n,) or (n, 1), or a batch of B states of shape (n, B), for which B independent noise samples of shape
+    (n, B) are returned.
+    """
 
     state_dependent = True
 
@@ -148,15 +450,160 @@ class StateDependentNoiseBase(NoiseBase):
     
 
 class StateDependentNoise(StateDependentNoiseBase):
-    """Generates state dependent noise based on a linear transformation G and a random uniform scalar in [0,1]"""
+    """
+    Generates state dependent noise based on a linear transformation G and a random uniform scalar in [0,1],
+    for batches of states with one independent scalar per state
+    """
 
     def __init__(self, G: np.ndarray, seed: int | None = None) -> None:
         assert seed is None or seed >= 0
         self.G = G
-        self.rng = np.random.default_rng(seed)
+        self.seed(seed)
 
     def _generate(self, x: np.ndarray) -> np.ndarray:
-        return (self.rng.uniform() * self.G @ x).reshape(-1,1)
+        x = x.reshape(self.G.shape[1], -1)
+        return self.apply(x, self.draw(x.shape[1]))
+
+    def draw(self, N: int | None = None) -> np.ndarray:
+        '''Draws the random scalars of N noise samples, returns an array of shape (1, N)'''
+        return self.rng.uniform(size=(1, 1 if N is None else N))
+
+    def apply(self, x: np.ndarray, r: np.ndarray) -> np.ndarray:
+        '''Computes the noise for the (batch of) state(s) x given the random scalars r of shape (1, B) drawn with draw'''
+        return (self.G @ x.reshape(self.G.shape[1], -1)) * r.reshape(1, -1)
+
+
+class NoiseTape(NoiseBase):
+    """
+    Pre-generated disturbance realizations, which are replayed by trajectory index, such that different
+    controllers can be compared on exactly the same disturbances.
+
+    The tape stores a (num_traj, num_steps, n) tensor of disturbances drawn from any noise generator, or, for
+    state dependent noise, the (num_traj, num_steps, 1) tensor of random scalars drawn with
+    StateDependentNoise.draw, which are mapped to disturbances given the state during replay. Selecting a list
+    of B trajectories replays them as a batch, i.e., each call returns (n, B) disturbances. If a path is
+    provided, the tape is stored as memory-mapped .npy file, which can be reopened with NoiseTape.load, e.g.,
+    in another process, without loading it into memory.
+
+    Usage:
+        tape = NoiseTape(params.sys.noise_generator, num_traj=100, num_steps=30)
+        for i in range(100):
+            params.sys.noise_generator = tape.stream(i)  # replay trajectory i
+            ...
+    """
+
+    def __init__(self, noise: NoiseBase, num_traj: int, num_steps: int, path: str | None = None,
+                 chunk_size: int = 10**6) -> None:
+        '''
+        Args:
+            noise: noise generator from which the tape is drawn
+            num_traj: number of trajectories
+            num_steps: number of time steps per trajectory
+            path: if provided, the tape is stored as memory-mapped .npy file at this path
+            chunk_size: maximum number of samples drawn at once, limits the memory usage for large tapes
+        '''
+        assert num_traj > 0 and num_steps > 0
+        self.state_dependent = noise.state_dependent
+        if self.state_dependent:
+            if not hasattr(noise, 'draw'):
+                raise Exception('State dependent noise must implement draw and apply to be recorded on a tape')
+            self.noise = noise
+            self.G = noise.G
+            draw = noise.draw
+        else:
+            draw = noise.generate
+
+        # draw whole trajectories in chunks of at most chunk_size samples
+        traj_per_chunk = max(1, chunk_size // num_steps)
+        first = draw(min(num_traj, traj_per_chunk) * num_steps)
+        shape = (num_traj, num_steps, first.shape[0])
+        if path is None:
+            self.data = np.empty(shape)
+        else:
+            self.data = np.lib.format.open_memmap(path, mode='w+', dtype=float, shape=shape)
+        self.path = path
+
+        start = 0
+        while start < num_traj:
+            stop = min(num_traj, start + traj_per_chunk)
+            samples = first if start == 0 else draw((stop - start) * num_steps)
+            self.data[start:stop] = samples.T.reshape(stop - start, num_steps, -1)
+            start = stop
+        if path is not None:
+            self.data.flush()
+
+        self.traj = 0
+        self.step = 0
+
+    @classmethod
+    def load(cls, path: str, noise: NoiseBase | None = None) -> 'NoiseTape':
+        '''
+        Opens a tape stored with a path as read-only memory map.
+
+        Args:
+            path: path of the stored tape
+            noise: for state dependent tapes, the noise generator providing apply and G
+        Returns:
+            tape: the stored tape
+        '''
+        tape = cls.__new__(cls)
+        tape.data = np.load(path, mmap_mode='r')
+        tape.path = path
+        tape.state_dependent = noise is not None and noise.state_dependent
+        if tape.state_dependent:
+            tape.noise = noise
+            tape.G = noise.G
+        tape.traj = 0
+        tape.step = 0
+        return tape
+
+    @property
+    def num_traj(self) -> int:
+        return self.data.shape[0]
+
+    @property
+    def num_steps(self) -> int:
+        return self.data.shape[1]
+
+    def __getitem__(self, idx) -> np.ndarray:
+        return self.data[idx]
+
+    def select(self, traj: int | list[int] | np.ndarray) -> None:
+        '''Selects trajectory traj, or a batch of trajectories, for replay and rewinds it to the first time step'''
+        if not np.isscalar(traj):
+            traj = np.asarray(traj, dtype=int)
+        assert np.all(0 <= traj) and np.all(traj < self.num_traj)
+        self.traj = traj
+        self.step = 0
+
+    def stream(self, idx: int | list[int] | np.ndarray) -> 'NoiseTape':
+        '''Returns a shallow copy of the tape, which replays trajectory (or batch of trajectories) idx and shares the stored data'''
+        tape = copy.copy(self)
+        tape.select(idx)
+        return tape
+
+    def generate(self, *args) -> np.ndarray:
+        return self._generate(*args)
+
+    def _generate(self, x_or_N: np.ndarray | int | None = None) -> np.ndarray:
+        '''
+        Returns the next disturbance of the selected trajectory. For state dependent noise, the state x has to
+        be passed, otherwise the next N disturbances are returned as (n, N) array. For a batch of B trajectories,
+        the next disturbance of each trajectory is returned as (n, B) array.
+        '''
+        batch = not np.isscalar(self.traj)
+        num = 1 if self.state_dependent or batch or x_or_N is None else x_or_N
+        if self.step + num > self.num_steps:
+            raise Exception(f'NoiseTape exhausted, trajectory {self.traj} has only {self.num_steps} steps')
+        if batch:
+            samples = np.array(self.data[self.traj, self.step]).T
+        else:
+            samples = np.array(self.data[self.traj, self.step:self.step + num]).T
+        self.step += num
+
+        if self.state_dependent:
+            return self.noise.apply(x_or_N, samples)
+        return samples
 
 
 """
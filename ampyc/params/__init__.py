@@ -7,12 +7,30 @@
 %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
 '''
 
+from typing import TYPE_CHECKING
+
+from ampyc._lazy import lazy_attributes
+
 from .params_base import ParamsBase
 
-from .params_mpc import MPCParams
-from .params_nmpc import NonlinearMPCParams
-from .params_rmpc import RMPCParams
-from .params_rnmpc import NonlinearRMPCParams
-from .params_smpc import SMPCParams
-from .params_rmpc_smpc import RMPCSMPCParams
-from .params_sf import SFParams
\ No newline at end of file
+# NOTE: default parameters are imported on first use, since the nonlinear ones depend on casadi
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    'MPCParams': '.params_mpc',
+    'NonlinearMPCParams': '.params_nmpc',
+    'RMPCParams': '.params_rmpc',
+    'NonlinearRMPCParams': '.params_rnmpc',
+    'SMPCParams': '.params_smpc',
+    'RMPCSMPCParams': '.params_rmpc_smpc',
+    'RAMPCParams': '.params_rampc',
+    'SFParams': '.params_sf',
+})
+
+if TYPE_CHECKING:
+    from .params_mpc import MPCParams
+    from .params_nmpc import NonlinearMPCParams
+    from .params_rmpc import RMPCParams
+    from .params_rnmpc import NonlinearRMPCParams
+    from .params_smpc import SMPCParams
+    from .params_rmpc_smpc import RMPCSMPCParams
+    from .params_rampc import RAMPCParams
+    from .params_sf import SFParams
@@ -0,0 +1,95 @@
+'''
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+% Copyright (C) 2025, Intelligent Control Systems Group, ETH Zurich
+%
+% This code is made available under an MIT License (see LICENSE file).
+%
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+'''
+
+from collections.abc import Callable
+from dataclasses import dataclass, field
+import numpy as np
+
+from ampyc.typing import Noise
+from ampyc.params import ParamsBase
+from ampyc.noise import PolytopeNoise
+from ampyc.utils import Polytope
+
+class RAMPCParams(ParamsBase):
+    '''
+    Default parameters for experiments with a robust adaptive linear MPC controller, i.e., a linear system with
+    parametric uncertainty A(theta) = A_0 + sum_i theta_i A_i and B(theta) = B_0 + sum_i theta_i B_i.
+    '''
+
+    @dataclass
+    class ctrl:
+        name: str = 'robust adaptive linear MPC'
+        N: int = 10
+        Q: np.ndarray = field(default_factory=lambda: np.eye(2))
+        R: np.ndarray = field(default_factory=lambda: np.eye(1))
+
+    @dataclass
+    class sys:
+        # system dimensions
+        n: int = 2
+        m: int = 1
+
+        # uncertain dynamics, A_delta[0] and B_delta[0] are the nominal matrices
+        num_uncertain_params: int = 2
+        A_delta: list[np.ndarray] = field(default_factory=lambda: [
+            np.array([[0.42, -0.28], [0.02, 0.6]]),
+            np.array([[0.3, 0], [0, 0]]),
+            np.array([[0, 0], [0, 0.3]]),
+        ])
+        B_delta: list[np.ndarray] = field(default_factory=lambda: [
+            np.array([[0.3], [-0.4]]),
+            np.zeros((2, 1)),
+            np.array([[0], [-0.1]]),
+        ])
+        C: np.ndarray = field(default_factory=lambda: np.eye(2))
+        D: np.ndarray = field(default_factory=lambda: np.zeros((2, 1)))
+
+        # parameter set and initial parameter estimate
+        A_theta: np.ndarray = field(default_factory=lambda: np.vstack([np.eye(2), -np.eye(2)]))
+        b_theta: np.ndarray = field(default_factory=lambda: np.ones((4, 1)))
+        theta: np.ndarray = field(default_factory=lambda: np.zeros(2))
+
+        # state constraints
+        A_x: np.ndarray | None = field(default_factory=lambda: np.vstack([np.eye(2), -np.eye(2)]))
+        b_x: np.ndarray | None = field(default_factory=lambda: 5 * np.ones((4, 1)))
+
+        # input constraints
+        A_u: np.ndarray | None = field(
+            default_factory=lambda: np.array([1, -1]).reshape(-1, 1))
+        b_u: np.ndarray | None = field(
+            default_factory=lambda: np.array([3, 3]).reshape(-1, 1))
+
+        # noise description
+        A_w: np.ndarray | None = field(default_factory=lambda: np.vstack([np.eye(2), -np.eye(2)]))
+        b_w: np.ndarray | None = field(default_factory=lambda: 0.1 * np.ones((4, 1)))
+
+        # noise generator
+        noise_generator: Noise = field(init=False)
+
+        def __post_init__(self) -> None:
+            '''
+            Post-initialization: ensure that derived attributes, i.e., parameters that are computed from other static parameters,
+            are set correctly.
+            '''
+            # noise generator
+            self.noise_generator = PolytopeNoise(Polytope(self.A_w, self.b_w))
+
+    @dataclass
+    class sim:
+        num_steps: int = 30
+        num_traj: int = 1
+        x_0: np.ndarray = field(default_factory=lambda: np.array([3.0, 3.0]).reshape(-1, 1))
+        # true parameter of the simulated system
+        theta: np.ndarray = field(default_factory=lambda: np.array([0.8, 0.2]))
+
+    @dataclass
+    class plot:
+        color: str = 'green'
+        alpha: float | Callable = 0.3
+        linewidth: float = 1.0
@@ -35,20 +35,14 @@ class LinearAffineSystem(SystemBase):
         for A, B in zip(params.A_delta, params.B_delta):
             assert A.shape == (self.n, self.n), 'component of A_delta must have shape (n,n)'
             assert B.shape == (self.n, self.m), 'component of B_delta must have shape (n,m)'
-        self.A_delta = params.A_delta
-        self.B_delta = params.B_delta
+        # stacked tensors of shape (p+1, n, n) and (p+1, n, m), where index 0 holds the nominal matrices
+        self.A_delta = np.stack([np.asarray(A, dtype=float) for A in params.A_delta])
+        self.B_delta = np.stack([np.asarray(B, dtype=float) for B in params.B_delta])
 
         # NOTE: This class only stores A and B based on the initial estimate of theta from the params,
         # they're not updated
-        self.A = np.zeros((self.n, self.n))
-        self.A[:] = self.A_delta[0]
-        for i in range(1, len(self.A_delta)):
-            self.A += self.A_delta[i] * self.theta[i-1]
-        
-        self.B = np.zeros((self.n, self.m))
-        self.B[:] = self.B_delta[0]
-        for i in range(1, len(self.B_delta)):
-            self.B += self.B_delta[i] * self.theta[i-1]
+        self.A = self.A_of(self.theta)
+        self.B = self.B_of(self.theta)
         
         assert params.C.shape[1] == self.n, 'C must have shape (num_output, n)'
         assert params.D.shape[1] == self.m, 'D must have shape (num_output, m)'
@@ -64,6 +58,57 @@ class LinearAffineSystem(SystemBase):
         self.omega = omega
         self.omega.Vrep()
 
+    def A_of(self, theta: np.ndarray) -> np.ndarray:
+        '''
+        Evaluates A(theta) = A_0 + sum_i theta_i A_i for a single parameter or a batch of parameters.
+
+        Args:
+            theta: parameter of shape (p,), or a batch of parameters of shape (N, p)
+        Returns:
+            A: matrix of shape (n, n), or a batch of matrices of shape (N, n, n)
+        '''
+        return self.A_delta[0] + np.einsum('...j,jkl->...kl', np.asarray(theta, dtype=float), self.A_delta[1:])
+
+    def B_of(self, theta: np.ndarray) -> np.ndarray:
+        '''
+        Evaluates B(theta) = B_0 + sum_i theta_i B_i for a single parameter or a batch of parameters.
+
+        Args:
+            theta: parameter of shape (p,), or a batch of parameters of shape (N, p)
+        Returns:
+            B: matrix of shape (n, m), or a batch of matrices of shape (N, n, m)
+        '''
+        return self.B_delta[0] + np.einsum('...j,jkl->...kl', np.asarray(theta, dtype=float), self.B_delta[1:])
+
+    def step_batch(self, x: np.ndarray, u: np.ndarray, theta: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray]:
+        '''
+        Advances a batch of N trajectories by one time step, where each trajectory can have its own parameter, e.g.,
+        for Monte Carlo simulations over plants sampled from the parameter set omega.
+
+        Args:
+            x: states of shape (n, N)
+            u: inputs of shape (m, N)
+            theta: parameters of shape (N, p), a single parameter of shape (p,) for all trajectories, or None to use
+                the initial estimate theta
+        Returns:
+            x_next: next states of shape (n, N), including a disturbance sampled from the noise generator
+            output: outputs of shape (num_output, N)
+        '''
+        x = np.asarray(x, dtype=float).reshape(self.n, -1)
+        u = np.asarray(u, dtype=float).reshape(self.m, -1)
+        theta = self.theta if theta is None else np.asarray(theta, dtype=float)
+
+        if theta.ndim == 1:
+            x_next = self.A_of(theta) @ x + self.B_of(theta) @ u
+        else:
+            assert theta.shape == (x.shape[1], self.num_uncertain_params), 'theta must have shape (N, p)'
+            x_next = np.einsum('jkl,lj->kj', self.A_of(theta), x) + np.einsum('jkl,lj->kj', self.B_of(theta), u)
+
+        noise = self.noise_generator.generate(x) \
+            if self.noise_generator.state_dependent else self.noise_generator.generate(x.shape[1])
+
+        return x_next + noise.reshape(self.n, -1), self.C @ x + self.D @ u
+
     def f(self, x, u):
         self._check_x_shape(x)  # make sure x is n dimensional
         self._check_u_shape(u)  # make sure u is m dimensional
@@ -8,7 +8,6 @@
 '''
 
 import numpy as np
-import casadi
 
 from ampyc.systems import SystemBase
 
@@ -35,6 +34,8 @@ class NonlinearSystem(SystemBase):
             raise Exception("Nonlinear dynamics h(x, u) must be defined within the system parameters!")
         self._h = params.h
 
+        # NOTE: casadi is only imported when a nonlinear system is used
+        import casadi
         if type(self._f(np.zeros((self.n,1)), np.zeros((self.m,1)))) not in [casadi.DM, casadi.MX, casadi.SX]:
             print("WARNING: Nonlinear dynamics function f(x, u) does not return a casadi data type.\nThis may cause issues with MPC controllers using casadi!")
         if type(self._h(np.zeros((self.n,1)), np.zeros((self.m,1)))) not in [casadi.DM, casadi.MX, casadi.SX]:
@@ -7,7 +7,33 @@
 %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
 '''
 
+from typing import TYPE_CHECKING
+
+from ampyc._lazy import lazy_attributes
+
 from .helpers import suppress_stdout
-from .math import LQR, min_tightening_controller, _compute_tube_controller
+from .cache import cached, configure_cache, cache_info, clear_cache
+from .profiling import Profiler, profiled
+from .monte_carlo import estimate_probability, error_coverage
 from .polytope.polytope import Polytope, qhull, _reduce
-from .set_computation import compute_mrpi, compute_drs, compute_prs, compute_RoA, eps_min_RPI
\ No newline at end of file
+
+# NOTE: math and set computation utilities depend on cvxpy, scipy, and tqdm, thus they are imported on first use
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    'LQR': '.math',
+    'min_tightening_controller': '.math',
+    'min_tightening_sweep': '.math',
+    'compute_invariant_ellipsoid': '.math',
+    'invariant_ellipsoid_sweep': '.math',
+    '_compute_tube_controller': '.math',
+    'compute_mrpi': '.set_computation',
+    'compute_drs': '.set_computation',
+    'compute_drs_tightening': '.set_computation',
+    'within_drs_tightening': '.set_computation',
+    'compute_prs': '.set_computation',
+    'compute_RoA': '.set_computation',
+    'eps_min_RPI': '.set_computation',
+})
+
+if TYPE_CHECKING:
+    from .math import LQR, min_tightening_controller, min_tightening_sweep, compute_invariant_ellipsoid, invariant_ellipsoid_sweep, _compute_tube_controller
+    from .set_computation import compute_mrpi, compute_drs, compute_drs_tightening, within_drs_tightening, compute_prs, compute_RoA, eps_min_RPI
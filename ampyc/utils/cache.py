@@ -0,0 +1,320 @@
+'''
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+% Copyright (C) 2025, Intelligent Control Systems Group, ETH Zurich
+%
+% This code is made available under an MIT License (see LICENSE file).
+%
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+'''
+
+from collections.abc import Callable
+from functools import wraps
+import hashlib
+import inspect
+import json
+import os
+import tempfile
+import numpy as np
+
+from ampyc.utils.polytope.polytope import Polytope
+
+# Content-addressed on-disk cache for deterministic offline computations, e.g., set computations and SDPs.
+#
+# Results are stored as .npz files in the cache directory, named by a stable hash of the function, its code,
+# the sources of the ampyc package (such that changes of helper functions invalidate the results, e.g., after an
+# upgrade), and all numeric inputs. The cache is configured with the environment variables
+# - AMPYC_CACHE_DIR: cache directory (default: $XDG_CACHE_HOME/ampyc or ~/.cache/ampyc)
+# - AMPYC_CACHE_SIZE: maximum size of the cache directory in bytes (default: 512 MB)
+# - AMPYC_NO_CACHE: if set to a non-empty value other than "0", caching is disabled
+# or at runtime using configure_cache.
+
+# bump this version whenever the serialization format changes
+_CACHE_VERSION = 1
+
+_config = {
+    'enabled': os.environ.get('AMPYC_NO_CACHE', '0') in ['', '0'],
+    'directory': os.environ.get('AMPYC_CACHE_DIR',
+                                os.path.join(os.environ.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache')), 'ampyc')),
+    'max_size': int(os.environ.get('AMPYC_CACHE_SIZE', 512 * 1024**2)),
+}
+
+_stats = {'hits': 0, 'misses': 0, 'bypassed': 0}
+
+# hash of the sources of the ampyc package, computed on first use
+_source_digest = None
+
+
+def configure_cache(enabled: bool | None = None, directory: str | None = None, max_size: int | None = None) -> None:
+    '''
+    Configure the on-disk cache. Arguments which are None are left unchanged.
+
+    Args:
+        enabled (bool | None): Enable or disable the cache.
+        directory (str | None): Directory in which cached results are stored.
+        max_size (int | None): Maximum size of the cache directory in bytes. If exceeded, the least recently
+            used results are evicted.
+    '''
+    if enabled is not None:
+        _config['enabled'] = enabled
+    if directory is not None:
+        _config['directory'] = directory
+    if max_size is not None:
+        _config['max_size'] = max_size
+
+
+def cache_info() -> dict:
+    '''
+    Returns the cache configuration and statistics, i.e., the number of hits, misses, and bypassed calls
+    (calls with inputs that cannot be hashed), the number of cached results, and their total size in bytes.
+    '''
+    files = _cache_files()
+    return {**_config, **_stats, 'num_files': len(files), 'size': sum(size for _, _, size in files)}
+
+
+def clear_cache() -> None:
+    '''Removes all cached results from the cache directory.'''
+    for path, _, _ in _cache_files():
+        os.remove(path)
+
+
+def cached(func: Callable | None = None, *, key: Callable | None = None) -> Callable:
+    '''
+    Decorator which caches the result of a deterministic function on disk.
+
+    The cache key is a stable hash of the function name and byte code, and all arguments of the call. If the
+    function depends on only some attributes of its arguments, e.g., a method depending on self.sys, a key
+    function with the same signature as the decorated function can be provided, which returns the inputs
+    to be hashed instead.
+
+    Supported inputs are numpy arrays, Polytopes, scalars, strings, None, lists, tuples, dicts, and ampyc
+    objects (hashed through their attributes). Calls with any other input bypass the cache.
+    Supported outputs are numpy arrays, Polytopes, scalars, strings, None, lists, tuples, and dicts.
+
+    Usage:
+        @cached
+        def compute_something(A, W, N): ...
+
+        @cached(key=lambda self, rho: (self.sys, rho))
+        def compute_tightening(self, rho): ...
+    '''
+    def decorator(func: Callable) -> Callable:
+        name = f'{func.__module__}.{func.__qualname__}'
+        signature = inspect.signature(func)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _config['enabled']:
+                return func(*args, **kwargs)
+
+            # hash inputs
+            try:
+                if key is None:
+                    bound = signature.bind(*args, **kwargs)
+                    bound.apply_defaults()
+                    inputs = dict(bound.arguments)
+                else:
+                    inputs = key(*args, **kwargs)
+                digest = _hash((_CACHE_VERSION, _sources(), name, func.__code__.co_code, inputs))
+            except TypeError:
+                _stats['bypassed'] += 1
+                return func(*args, **kwargs)
+
+            # look up result
+            path = os.path.join(_config['directory'], f'{digest}.npz')
+            if os.path.exists(path):
+                try:
+                    result = _load(path)
+                    os.utime(path) # mark as recently used
+                    _stats['hits'] += 1
+                    return result
+                except Exception:
+                    # corrupt or incompatible file, recompute
+                    pass
+
+            # compute and store result
+            _stats['misses'] += 1
+            result = func(*args, **kwargs)
+            try:
+                _store(path, result)
+                _evict()
+            except (TypeError, OSError):
+                pass
+            return result
+
+        return wrapper
+
+    if func is not None:
+        return decorator(func)
+    return decorator
+
+
+def _sources() -> str:
+    '''Computes a hash of all Python sources of the ampyc package, which is computed once per process.'''
+    global _source_digest
+    if _source_digest is None:
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        h = hashlib.sha256()
+        for directory, subdirectories, files in os.walk(root):
+            subdirectories.sort()
+            for file in sorted(files):
+                if file.endswith('.py'):
+                    path = os.path.join(directory, file)
+                    h.update(os.path.relpath(path, root).encode())
+                    with open(path, 'rb') as f:
+                        h.update(f.read())
+        _source_digest = h.hexdigest()
+    return _source_digest
+
+
+def _hash(obj: any) -> str:
+    '''Computes a stable hash of obj.'''
+    h = hashlib.sha256()
+    _hash_update(h, obj, set())
+    return h.hexdigest()
+
+
+def _hash_update(h: 'hashlib._Hash', obj: any, visited: set) -> None:
+    '''Recursively feeds a canonical representation of obj into the hash h.'''
+    if obj is None or isinstance(obj, (bool, int, float, complex, str, bytes, np.generic)):
+        h.update(f'{type(obj).__name__}:{obj!r};'.encode())
+    elif isinstance(obj, np.ndarray):
+        if obj.dtype == object:
+            raise TypeError('Cannot hash object arrays')
+        h.update(f'ndarray:{obj.dtype.str}:{obj.shape};'.encode())
+        h.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, Polytope):
+        h.update(b'Polytope;')
+        if obj.A is not None and obj.A.size > 0:
+            _hash_update(h, np.asarray(obj.A, dtype=float), visited)
+            _hash_update(h, np.asarray(obj.b, dtype=float).reshape(-1), visited)
+        else:
+            _hash_update(h, None if obj.vertices is None else np.asarray(obj.vertices, dtype=float), visited)
+    elif isinstance(obj, (list, tuple)):
+        h.update(f'{type(obj).__name__}:{len(obj)};'.encode())
+        for item in obj:
+            _hash_update(h, item, visited)
+    elif isinstance(obj, dict):
+        h.update(f'dict:{len(obj)};'.encode())
+        for k in sorted(obj, key=str):
+            _hash_update(h, str(k), visited)
+            _hash_update(h, obj[k], visited)
+    elif type(obj).__module__.startswith('ampyc') and hasattr(obj, '__dict__'):
+        # ampyc objects, e.g., systems and noise generators, are hashed through their public attributes,
+        # skipping callables and random number generators, which do not hold numeric data, and the attributes
+        # listed in _hash_exclude, e.g., the sampling state of noise generators, which changes with every draw
+        if id(obj) in visited:
+            raise TypeError('Cannot hash recursive objects')
+        visited = visited | {id(obj)}
+        h.update(f'{type(obj).__module__}.{type(obj).__qualname__};'.encode())
+        exclude = getattr(obj, '_hash_exclude', ())
+        attributes = {k: v for k, v in vars(obj).items()
+                      if not k.startswith('_') and k not in exclude and not callable(v)
+                      and not isinstance(v, (np.random.Generator, np.random.SeedSequence))}
+        _hash_update(h, attributes, visited)
+    else:
+        raise TypeError(f'Cannot hash object of type {type(obj)}')
+
+
+def _encode(obj: any, arrays: dict) -> dict:
+    '''Encodes obj as a JSON-serializable spec, while storing all arrays in the dict arrays.'''
+    if obj is None or isinstance(obj, (bool, int, float, str)):
+        return {'type': 'scalar', 'value': obj}
+    elif isinstance(obj, np.generic):
+        return {'type': 'scalar', 'value': obj.item()}
+    elif isinstance(obj, np.ndarray):
+        if obj.dtype == object:
+            raise TypeError('Cannot store object arrays')
+        name = f'a{len(arrays)}'
+        arrays[name] = obj
+        return {'type': 'array', 'name': name}
+    elif isinstance(obj, Polytope):
+        return {
+            'type': 'polytope',
+            'A': _encode(None if obj.A is None else np.asarray(obj.A, dtype=float), arrays),
+            'b': _encode(None if obj.b is None else np.asarray(obj.b, dtype=float), arrays),
+            'V': _encode(None if obj.vertices is None else np.asarray(obj.vertices, dtype=float), arrays),
+            'lazy': obj.is_lazy,
+        }
+    elif isinstance(obj, (list, tuple)):
+        return {'type': type(obj).__name__, 'items': [_encode(item, arrays) for item in obj]}
+    elif isinstance(obj, dict):
+        if not all(isinstance(k, str) for k in obj):
+            raise TypeError('Cannot store dicts with non-string keys')
+        return {'type': 'dict', 'items': {k: _encode(v, arrays) for k, v in obj.items()}}
+    else:
+        raise TypeError(f'Cannot store object of type {type(obj)}')
+
+
+def _decode(spec: dict, arrays: dict) -> any:
+    '''Inverse of _encode.'''
+    if spec['type'] == 'scalar':
+        return spec['value']
+    elif spec['type'] == 'array':
+        return arrays[spec['name']]
+    elif spec['type'] == 'polytope':
+        A, b, V = (_decode(spec[k], arrays) for k in ['A', 'b', 'V'])
+        has_H = A is not None and A.size > 0
+        has_V = V is not None and V.size > 0
+        if not has_H and not has_V:
+            return Polytope()
+        elif not has_H:
+            return Polytope(vertices=V)
+        else:
+            return Polytope(A=A, b=b, vertices=V if has_V else None, lazy=spec['lazy'])
+    elif spec['type'] == 'list':
+        return [_decode(item, arrays) for item in spec['items']]
+    elif spec['type'] == 'tuple':
+        return tuple(_decode(item, arrays) for item in spec['items'])
+    elif spec['type'] == 'dict':
+        return {k: _decode(v, arrays) for k, v in spec['items'].items()}
+    else:
+        raise ValueError(f'Unknown type {spec["type"]} in cached result')
+
+
+def _store(path: str, result: any) -> None:
+    '''Stores result atomically as .npz file.'''
+    arrays = {}
+    spec = _encode(result, arrays)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(suffix='.npz', dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.savez_compressed(f, __spec__=np.array(json.dumps(spec)), **arrays)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def _load(path: str) -> any:
+    '''Loads a result stored with _store.'''
+    with np.load(path, allow_pickle=False) as data:
+        arrays = {k: data[k] for k in data.files}
+    spec = json.loads(str(arrays.pop('__spec__')))
+    return _decode(spec, arrays)
+
+
+def _cache_files() -> list[tuple[str, float, int]]:
+    '''Returns (path, last access time, size) of all cached results.'''
+    directory = _config['directory']
+    if not os.path.isdir(directory):
+        return []
+    files = []
+    for entry in os.scandir(directory):
+        if entry.is_file() and entry.name.endswith('.npz'):
+            stat = entry.stat()
+            files.append((entry.path, stat.st_mtime, stat.st_size))
+    return files
+
+
+def _evict() -> None:
+    '''Removes the least recently used results until the cache directory is below the maximum size.'''
+    files = sorted(_cache_files(), key=lambda f: f[1])
+    size = sum(f[2] for f in files)
+    while files and size > _config['max_size']:
+        path, _, file_size = files.pop(0)
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        size -= file_size
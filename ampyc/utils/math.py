@@ -7,11 +7,18 @@
 %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
 '''
 
+from functools import partial
+from itertools import product
+from typing import Callable
 import numpy as np
 from scipy.linalg import solve_discrete_are, sqrtm
+from scipy.spatial import ConvexHull
 import cvxpy as cp
 
 from ampyc.typing import System
+from ampyc.utils.cache import cached
+from ampyc.utils.polytope.polytope import Polytope
+from ampyc.utils.profiling import profiled
 
 
 def LQR(A: np.ndarray, B: np.ndarray, Q: np.ndarray, R:np.ndarray) -> tuple[np.ndarray, np.ndarray]:
@@ -34,6 +41,90 @@ def LQR(A: np.ndarray, B: np.ndarray, Q: np.ndarray, R:np.ndarray) -> tuple[np.n
     K = -np.linalg.inv(R + B.T @ P @ B) @ B.T @ P @ A
     return K, P
 
+# compiled parametrized (DPP) problems, keyed by the builder and the data which is not parametrized
+_compiled_problems: dict[tuple, tuple] = {}
+_MAX_COMPILED_PROBLEMS = 32
+
+def _compiled_problem(build: Callable[..., tuple], *data: np.ndarray) -> tuple:
+    '''
+    Returns build(*data), which is built only once per data and kept in a bounded in-memory cache. Since the
+    problems are parametrized, they are compiled only once and subsequent solves can be warm-started.
+    '''
+    key = (build.__module__, build.__qualname__) + tuple(
+        np.ascontiguousarray(M, dtype=float).tobytes() + str(np.shape(M)).encode() for M in data)
+    if key not in _compiled_problems:
+        if len(_compiled_problems) >= _MAX_COMPILED_PROBLEMS:
+            _compiled_problems.pop(next(iter(_compiled_problems)))
+        _compiled_problems[key] = build(*data)
+    return _compiled_problems[key]
+
+def _sweep(solve_chunk: Callable[..., list], data: tuple, values: list, workers: int | None = None) -> list:
+    '''
+    Evaluates solve_chunk(*data, values) either in this process or split into contiguous chunks, one per
+    worker process. Contiguous chunks keep warm starts effective for sorted values.
+    '''
+    if workers is None or workers <= 1 or len(values) <= 1:
+        return solve_chunk(*data, values)
+
+    from concurrent.futures import ProcessPoolExecutor
+    chunks = np.array_split(np.arange(len(values)), min(workers, len(values)))
+    with ProcessPoolExecutor(workers) as pool:
+        futures = [pool.submit(solve_chunk, *data, [values[i] for i in c]) for c in chunks]
+        return [result for f in futures for result in f.result()]
+
+def _min_tightening_problem(A: np.ndarray, B: np.ndarray, H_x: np.ndarray, H_u: np.ndarray, W_V: np.ndarray) -> tuple:
+    '''Builds the SDP of min_tightening_controller, where rho**2 and lambda are parameters'''
+    n, m = B.shape
+    E = cp.Variable((n, n),symmetric=True)
+    Y = cp.Variable((m, n))
+    gamma = cp.Variable((1,1))
+    lambda_ = cp.Parameter((1,1), nonneg=True)
+    rho_sq = cp.Parameter((1,1), nonneg=True)
+
+    constraints = []
+    for w in W_V:
+        constraints.append(cp.bmat([[lambda_*E, np.zeros((n,1)), E.T@A.T + Y.T@B.T],
+                                    [np.zeros((1,n)), 1 - lambda_, w[np.newaxis]],
+                                    [A@E + B@Y, w[np.newaxis].T, E]]) >> 0)
+
+    for hi in H_x:
+        constraints.append(cp.bmat([[gamma, hi[np.newaxis]@E.T],
+                                    [E@hi[np.newaxis].T, E]]) >> 0)
+
+    for hi in H_u:
+        constraints.append(cp.bmat([[rho_sq, hi[np.newaxis]@Y],
+                                    [Y.T@hi[np.newaxis].T, E]]) >> 0)
+
+    prob = cp.Problem(cp.Minimize(gamma), constraints)
+    return prob, E, Y, gamma, rho_sq, lambda_
+
+def _min_tightening_chunk(A: np.ndarray, B: np.ndarray, H_x: np.ndarray, H_u: np.ndarray, W_V: np.ndarray,
+                          values: list[tuple[float, float]], solver: str | None = None) -> list:
+    '''Solves the SDP of min_tightening_controller for a list of (rho, lambd), warm-starting each solve'''
+    prob, E, Y, gamma, rho_sq, lambda_ = _compiled_problem(_min_tightening_problem, A, B, H_x, H_u, W_V)
+    results = []
+    for rho, lambd in values:
+        rho_sq.value = np.ones((1,1))*rho**2
+        lambda_.value = np.ones((1,1))*lambd
+        try:
+            prob.solve(solver=solver, verbose=False, warm_start=True)
+        except cp.error.SolverError:
+            # NOTE: the status and values of the (shared) problem still hold the previous solution
+            results.append(None)
+            continue
+        if E.value is None or prob.status not in [cp.OPTIMAL, cp.OPTIMAL_INACCURATE]:
+            results.append(None)
+            continue
+        P = np.linalg.inv(E.value)
+        results.append((Y.value@P, P, float(gamma.value[0, 0])))
+    return results
+
+def _min_tightening_data(sys: System) -> tuple:
+    return (sys.A, sys.B, np.divide(sys.X.A, sys.X.b.reshape(-1,1)), np.divide(sys.U.A, sys.U.b.reshape(-1,1)),
+            sys.W.V)
+
+@profiled
+@cached
 def min_tightening_controller(sys: System, rho: float = 1.0, lambd: float = 0.88, solver: str | None = None) -> tuple[np.ndarray, np.ndarray]:
     '''
     Computes a controller K that minimizes the state and input tightening
@@ -42,6 +133,9 @@ def min_tightening_controller(sys: System, rho: float = 1.0, lambd: float = 0.88
     Limon et al., "Robust tube-based MPC for tracking of constrained linear
     systems with additive disturbances", Journal of Process Control, 2010.
 
+    The SDP is compiled once per system with rho and lambd as parameters, see min_tightening_sweep for
+    evaluating many values.
+
     Args:
         sys (System): The system for which the controller is computed.
         rho (float): The contraction factor for the tube.
@@ -52,38 +146,138 @@ def min_tightening_controller(sys: System, rho: float = 1.0, lambd: float = 0.88
         K (np.ndarray): The controller gain matrix.
         P (np.ndarray): The associated quadratic value function matrix.
     '''
+    result = _min_tightening_chunk(*_min_tightening_data(sys), [(rho, lambd)], solver)[0]
+    if result is None:
+        raise Exception('Minimal tightening SDP could not be solved for rho={0}, lambd={1}'.format(rho, lambd))
+    K, P, _ = result
+    return K, P
 
-    E = cp.Variable((sys.n, sys.n),symmetric=True)
-    Y = cp.Variable((sys.m, sys.n))
-    gamma = cp.Variable((1,1))
-    lambda_ = np.ones((1,1))*lambd
-    rho_ = np.ones((2,1))*rho
+def min_tightening_sweep(sys: System, rhos: list[float], lambdas: list[float], workers: int | None = None,
+                         solver: str | None = None) -> dict:
+    '''
+    Evaluates min_tightening_controller on the grid rhos x lambdas and picks the pair with the smallest state
+    tightening gamma. Sequentially, the compiled SDP is reused and warm-started, for workers > 1 the grid is
+    split over worker processes.
 
-    constraints = []
-    for w in sys.W.V:
-        constraints.append(cp.bmat([[lambda_*E, np.zeros((2,1)), E.T@sys.A.T + Y.T@sys.B.T],
-                                    [np.zeros((1,2)), 1 - lambda_, w[np.newaxis]],
-                                    [sys.A@E + sys.B@Y, w[np.newaxis].T, E]]) >> 0)
-        
-    for hi in np.divide(sys.X.A, sys.X.b.reshape(-1,1)):
-        constraints.append(cp.bmat([[gamma, hi[np.newaxis]@E.T],
-                                    [E@hi[np.newaxis].T, E]]) >> 0)
-        
-    for i,hi in enumerate(np.divide(sys.U.A, sys.U.b.reshape(-1,1))):
-        constraints.append(cp.bmat([[cp.power(cp.reshape(rho_[i], (1,1),'C'),2), hi[np.newaxis]@Y],
-                                    [Y.T@hi[np.newaxis].T, E]]) >> 0)
+    Args:
+        sys (System): The system for which the controller is computed.
+        rhos (list[float]): Values of the contraction factor rho.
+        lambdas (list[float]): Values of the tightening factor lambd.
+        workers (int | None): Number of worker processes, if None or 1 the SDPs are solved in this process.
+        solver (str | None): The solver to use for the optimization problems (default: None).
+
+    Returns:
+        sweep (dict): 'rho' and 'lambd' (the grid values), 'gamma' of shape (len(rhos), len(lambdas)), NaN if the
+            SDP is infeasible, the best values 'rho_best' and 'lambd_best', and the corresponding 'K' and 'P'.
+    '''
+    values = [(rho, lambd) for rho in rhos for lambd in lambdas]
+    results = _sweep(partial(_min_tightening_chunk, solver=solver), _min_tightening_data(sys), values, workers)
+
+    gamma = np.array([np.nan if r is None else r[2] for r in results]).reshape(len(rhos), len(lambdas))
+    if np.all(np.isnan(gamma)):
+        raise Exception('Minimal tightening SDP is infeasible for all values of the sweep')
+    best = int(np.nanargmin(gamma))
+    return {'rho': np.asarray(rhos), 'lambd': np.asarray(lambdas), 'gamma': gamma,
+            'rho_best': values[best][0], 'lambd_best': values[best][1], 'K': results[best][0], 'P': results[best][1]}
+
+def _invariant_ellipsoid_problem(A: np.ndarray, B: np.ndarray, A_x: np.ndarray, A_u: np.ndarray) -> tuple:
+    '''
+    Builds the log-det SDP of compute_invariant_ellipsoid, where the squared constraint offsets are parameters,
+    such that the problem is compiled only once and can be warm-started for changed offsets.
+    '''
+    n, m = B.shape
+    E = cp.Variable((n, n), symmetric=True)
+    Y = cp.Variable((m, n))
+    b_x_sq = cp.Parameter(A_x.shape[0], nonneg=True)
+    b_u_sq = cp.Parameter(A_u.shape[0], nonneg=True)
+
+    constraints = [ E >> 0,
+                    cp.bmat([[E, (A@E+B@Y).T],
+                             [A@E+B@Y, E]]) >> 0 ]
 
-    obj = cp.Minimize(gamma)
-    prob = cp.Problem(obj, constraints)
+    for i, A_i in enumerate(A_x):
+        constraints += [A_i.reshape(1,-1)@E@A_i.reshape(1,-1).T <= cp.reshape(b_x_sq[i], (1,1), 'C')]
+
+    for i, A_i in enumerate(A_u):
+        constraints += [cp.bmat([[cp.reshape(b_u_sq[i], (1,1), 'C'), A_i.reshape(1,-1)@Y],
+                                 [Y.T@A_i.reshape(1,-1).T, E]]) >> 0]
+
+    prob = cp.Problem(cp.Minimize(-cp.log_det(E)), constraints)
+    return prob, E, Y, b_x_sq, b_u_sq
+
+@profiled
+@cached
+def compute_invariant_ellipsoid(A: np.ndarray, B: np.ndarray, X: Polytope, U: Polytope,
+                                solver: str | None = None) -> tuple[np.ndarray, np.ndarray]:
+    '''
+    Computes the largest (in volume) invariant ellipsoid x^T P x <= 1 within the state and input constraints
+    and the corresponding feedback K by solving a log-det SDP.
+
+    The SDP is compiled once per (A, B, X.A, U.A) and the constraint offsets are parameters, i.e., solving
+    for slightly changed constraint sets reuses the compiled problem and warm-starts the solver (if supported
+    by the solver, e.g., SCS). The results are cached on disk.
+
+    Args:
+        A (np.ndarray): State transition matrix.
+        B (np.ndarray): Input matrix.
+        X (Polytope): State constraints.
+        U (Polytope): Input constraints.
+        solver (str | None): The solver to use for the optimization problem (default: None).
+
+    Returns:
+        P (np.ndarray): Shape matrix of the invariant ellipsoid.
+        K (np.ndarray): Feedback gain rendering the ellipsoid invariant.
+    '''
+    prob, E, Y, b_x_sq, b_u_sq = _compiled_problem(_invariant_ellipsoid_problem, A, B, X.A, U.A)
+    b_x_sq.value = np.asarray(X.b, dtype=float).reshape(-1)**2
+    b_u_sq.value = np.asarray(U.b, dtype=float).reshape(-1)**2
 
-    prob.solve(solver=solver, verbose=False)
+    # solve the SDP
+    prob.solve(verbose=False, solver=solver, warm_start=True)
+    if E.value is None:
+        raise Exception('Invariant ellipsoid SDP could not be solved. Status: {0}'.format(prob.status))
 
-    K = Y.value@np.linalg.inv(E.value)
+    # Recover the ellipsoid shape and feedback matrices
     P = np.linalg.inv(E.value)
+    K = Y.value @ P
 
-    return K, P
+    return P, K
+
+def invariant_ellipsoid_sweep(A: np.ndarray, B: np.ndarray, X: Polytope, U: Polytope, scalings: list,
+                              workers: int | None = None, solver: str | None = None) -> list[tuple[np.ndarray, np.ndarray]]:
+    '''
+    Computes the invariant ellipsoids (see compute_invariant_ellipsoid) for a sweep over scalings of the
+    constraint sets, i.e., for the constraints s_x X and s_u U.
+
+    Args:
+        A (np.ndarray): State transition matrix.
+        B (np.ndarray): Input matrix.
+        X (Polytope): State constraints.
+        U (Polytope): Input constraints.
+        scalings (list): Scalings, either scalars s (s_x = s_u = s) or tuples (s_x, s_u).
+        workers (int | None): Number of worker processes, if None or 1 the SDPs are solved in this process,
+            reusing the compiled problem and warm-starting from the previous scaling.
+        solver (str | None): The solver to use for the optimization problems (default: None).
 
-def _compute_tube_controller(sys: System, Q: np.ndarray, R: np.ndarray, rho: float, lam: float) -> tuple[np.ndarray, np.ndarray]:
+    Returns:
+        ellipsoids (list[tuple[np.ndarray, np.ndarray]]): (P, K) for each scaling.
+    '''
+    sets = []
+    for scaling in scalings:
+        s_x, s_u = (scaling, scaling) if np.isscalar(scaling) else scaling
+        sets.append((Polytope(X.A, s_x * np.asarray(X.b, dtype=float)), Polytope(U.A, s_u * np.asarray(U.b, dtype=float))))
+
+    if workers is None or workers <= 1:
+        return [compute_invariant_ellipsoid(A, B, X_s, U_s, solver) for X_s, U_s in sets]
+
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(workers) as pool:
+        futures = [pool.submit(compute_invariant_ellipsoid, A, B, X_s, U_s, solver) for X_s, U_s in sets]
+        return [f.result() for f in futures]
+
+def _compute_tube_controller(sys: System, Q: np.ndarray, R: np.ndarray, rho: float, lam: float,
+                             prune: bool = True, outer_box: bool = False, max_vertices: int | None = None,
+                             vectorized: bool = True) -> tuple[np.ndarray, np.ndarray]:
     '''
     Computes tube & terminal controller and terminal cost
     for robust adaptive MPC.
@@ -91,20 +285,50 @@ def _compute_tube_controller(sys: System, Q: np.ndarray, R: np.ndarray, rho: flo
     The method is from Appendix A in Köhler et al. (2019),
     "Linear robust adaptive model predictive control:
     Computational complexity and conservatism"
-    '''
 
-    vertices_omega = sys.omega.vertices
-    num_vertices = vertices_omega.shape[0]
+    The LMIs are imposed at the vertices A_i of the dynamics over the parameter set sys.omega and, for the RPI
+    condition, at all pairs of A_i and vertices of W. Since the LMIs are affine in A, vertices which map into the
+    convex hull of the other A_i are redundant and pruned. If omega has many vertices, it can be replaced by its
+    outer bounding box, which is conservative but has a fixed number of 2^p vertices.
 
+    Args:
+        sys (System): Linear affine system with parameter set omega.
+        Q (np.ndarray): State cost matrix.
+        R (np.ndarray): Input cost matrix.
+        rho (float): Contraction rate of the tube.
+        lam (float): Contraction rate of the RPI condition.
+        prune (bool): If True, redundant vertices of the dynamics are removed.
+        outer_box (bool): If True, the outer bounding box of omega is used instead of omega.
+        max_vertices (int | None): If given, the outer bounding box of omega is used if omega has more vertices.
+        vectorized (bool): If True, all LMIs are assembled with stacked NumPy operations into a single affine
+            expression, otherwise one block matrix is built per LMI.
+
+    Returns:
+        K (np.ndarray): Tube controller gain.
+        P (np.ndarray): Terminal cost matrix.
+    '''
     # look up necessary values
     n, m = (sys.n, sys.m)
-    A_delta = sys.A_delta
     B = sys.B
     X, U, W = (sys.X, sys.U, sys.W)
-    nx, nu, nw = (X.A.shape[0], U.A.shape[0], W.A.shape[0])
+    nx, nu = (X.A.shape[0], U.A.shape[0])
 
     sqrt_Q, sqrt_R = (sqrtm(Q), sqrtm(R))
 
+    # dynamics at the vertices (extreme points) of omega
+    if outer_box or (max_vertices is not None and sys.omega.vertices.shape[0] > max_vertices):
+        vertices_omega = _outer_box_vertices(sys.omega)
+    else:
+        vertices_omega = sys.omega.vertices
+    A_vert = sys.A_of(vertices_omega)
+    if prune:
+        A_vert = _prune_vertex_matrices(A_vert)
+    W_vert = np.unique(W.vertices, axis=0)
+
+    # constraint satisfaction
+    F = np.concatenate([X.A / X.b.reshape(-1,1), np.zeros((nu, n))], axis=0)
+    G = np.concatenate([np.zeros((nx, m)), U.A / U.b.reshape(-1,1)], axis=0)
+
     # Computation of a rho-contractive polytope
     # Find feedback K and terminal cost P
     E = cp.Variable((n, n), symmetric=True)
@@ -114,52 +338,47 @@ def _compute_tube_controller(sys: System, Q: np.ndarray, R: np.ndarray, rho: flo
     objective = cp.Minimize(-cp.log_det(E))
 
     # define the constraints
-    constraints = []
-    for i in range(num_vertices):
-        # compute A for this vertex (extreme point) of omega
-        A = np.zeros((n, n))
-        A[:] = A_delta[0]
-        for j in range(1, len(A_delta)):
-            A += A_delta[j] * vertices_omega[i, j-1]
-
-        # lyapunov equation
-        lyap_bmat = cp.bmat(
-            [
-                [E,                (A @ E + B @ Y).T, sqrt_Q @ E,       Y.T @ sqrt_R],
-                [(A @ E + B @ Y),  E,                 np.zeros((n, n)), np.zeros((n, m))],
-                [(sqrt_Q @ E).T,   np.zeros((n, n)),  np.eye(n),        np.zeros((n, m))],
-                [(Y.T @ sqrt_R).T, np.zeros((m, n)),  np.zeros((m, n)), np.eye(m)],
-
-            ]
-        )
-        constraints += [lyap_bmat >> 0]
-
-        # rho-contractivity
-        rho_bmat = cp.bmat(
-            [
-                [rho * E,         (A @ E + B @ Y).T],
-                [(A @ E + B @ Y), rho * E],
-            ]
-        )
-        constraints += [rho_bmat >> 0]
-
-        # RPI condition
-        for k in range(nw):
-            rpi_bmat = cp.bmat(
+    if vectorized:
+        constraints = _tube_controller_lmis(E, Y, A_vert, B, W_vert, F, G, sqrt_Q, sqrt_R, rho, lam)
+    else:
+        constraints = []
+        for A in A_vert:
+            # lyapunov equation
+            lyap_bmat = cp.bmat(
                 [
-                    [lam * E,          np.zeros((n, 1)),              (A @ E + B @ Y).T],
-                    [np.zeros((1, n)), np.diag([1 - lam]),            W.vertices[k,:].reshape(1,-1)],
-                    [(A @ E + B @ Y),  W.vertices[k,:].reshape(-1,1), E]
+                    [E,                (A @ E + B @ Y).T, sqrt_Q @ E,       Y.T @ sqrt_R],
+                    [(A @ E + B @ Y),  E,                 np.zeros((n, n)), np.zeros((n, m))],
+                    [(sqrt_Q @ E).T,   np.zeros((n, n)),  np.eye(n),        np.zeros((n, m))],
+                    [(Y.T @ sqrt_R).T, np.zeros((m, n)),  np.zeros((m, n)), np.eye(m)],
+
                 ]
             )
-            constraints += [rpi_bmat >> 0]
+            constraints += [lyap_bmat >> 0]
 
-    # constraint satisfaction
-    F = np.concatenate([X.A / X.b.reshape(-1,1), np.zeros((nu, n))], axis=0)
-    G = np.concatenate([np.zeros((nx, m)), U.A / U.b.reshape(-1,1)], axis=0)
-    for i in range(nx + nu):
-        constraints += [cp.bmat([[np.diag([1]), (F[i,:].reshape(1,-1) @ E + G[i,:].reshape(1,-1) @ Y)],
-                                 [(F[i,:].reshape(1,-1) @ E + G[i,:].reshape(1,-1) @ Y).T, E]]) >> 0]
+            # rho-contractivity
+            rho_bmat = cp.bmat(
+                [
+                    [rho * E,         (A @ E + B @ Y).T],
+                    [(A @ E + B @ Y), rho * E],
+                ]
+            )
+            constraints += [rho_bmat >> 0]
+
+            # RPI condition
+            for w in W_vert:
+                rpi_bmat = cp.bmat(
+                    [
+                        [lam * E,          np.zeros((n, 1)),              (A @ E + B @ Y).T],
+                        [np.zeros((1, n)), np.diag([1 - lam]),            w.reshape(1,-1)],
+                        [(A @ E + B @ Y),  w.reshape(-1,1),               E]
+                    ]
+                )
+                constraints += [rpi_bmat >> 0]
+
+        # constraint satisfaction
+        for i in range(nx + nu):
+            constraints += [cp.bmat([[np.diag([1]), (F[i,:].reshape(1,-1) @ E + G[i,:].reshape(1,-1) @ Y)],
+                                     [(F[i,:].reshape(1,-1) @ E + G[i,:].reshape(1,-1) @ Y).T, E]]) >> 0]
     
     prob = cp.Problem(objective, constraints)
     prob.solve()
@@ -169,3 +388,107 @@ def _compute_tube_controller(sys: System, Q: np.ndarray, R: np.ndarray, rho: flo
 
     return K, P
 
+def _tube_controller_lmis(E: cp.Variable, Y: cp.Variable, A_vert: np.ndarray, B: np.ndarray, W_vert: np.ndarray,
+                          F: np.ndarray, G: np.ndarray, sqrt_Q: np.ndarray, sqrt_R: np.ndarray, rho: float,
+                          lam: float) -> list:
+    '''Vectorized assembly of the LMIs of _compute_tube_controller, see _affine_lmis'''
+    n, m = B.shape
+    num_A, num_W, num_c = A_vert.shape[0], W_vert.shape[0], F.shape[0]
+    I_n, I_m = np.eye(n), np.eye(m)
+    T = lambda M: np.swapaxes(M, -1, -2)
+
+    # lyapunov equation
+    def lyap(E, Y):
+        AEBY = A_vert @ E + B @ Y
+        return _batch_bmat([[E,              T(AEBY), sqrt_Q @ E, Y.T @ sqrt_R],
+                            [AEBY,           E,       0,          0],
+                            [(sqrt_Q @ E).T, 0,       I_n,        0],
+                            [(Y.T @ sqrt_R).T, 0,     0,          I_m]], num_A)
+
+    # rho-contractivity
+    def contraction(E, Y):
+        AEBY = A_vert @ E + B @ Y
+        return _batch_bmat([[rho * E, T(AEBY)],
+                            [AEBY,    rho * E]], num_A)
+
+    # RPI condition, for all pairs of vertices of the dynamics and the disturbance set
+    A_pairs = np.repeat(A_vert, num_W, axis=0)
+    w = np.tile(W_vert, (num_A, 1))[:, :, np.newaxis]
+    def rpi(E, Y):
+        AEBY = A_pairs @ E + B @ Y
+        return _batch_bmat([[lam * E, 0,                            T(AEBY)],
+                            [0,       (1 - lam) * np.ones((1, 1)),  T(w)],
+                            [AEBY,    w,                            E]], num_A * num_W)
+
+    # constraint satisfaction
+    def tightening(E, Y):
+        FEGY = (F @ E + G @ Y)[:, np.newaxis, :]
+        return _batch_bmat([[np.ones((1, 1)), FEGY],
+                            [T(FEGY),         E]], num_c)
+
+    return (_affine_lmis(lyap, E, Y) + _affine_lmis(contraction, E, Y) + _affine_lmis(rpi, E, Y)
+            + _affine_lmis(tightening, E, Y))
+
+def _batch_bmat(blocks: list[list[np.ndarray | int]], N: int) -> np.ndarray:
+    '''
+    Numerical block matrix of shape (N, s, s), where each block is either a single matrix, a batch of N matrices,
+    or 0 for a zero block of the size implied by its row and column.
+    '''
+    rows = [next(np.shape(b)[-2] for b in row if not np.isscalar(b)) for row in blocks]
+    cols = [next(np.shape(row[j])[-1] for row in blocks if not np.isscalar(row[j])) for j in range(len(blocks[0]))]
+    return np.block([[np.broadcast_to(b, (N, r, c)) for b, c in zip(row, cols)] for row, r in zip(blocks, rows)])
+
+def _affine_lmis(build: Callable[[np.ndarray, np.ndarray], np.ndarray], E: cp.Variable, Y: cp.Variable) -> list:
+    '''
+    Vectorized assembly of the LMIs build(E, Y) >> 0, where build is affine in (E, Y) and returns a batch of N
+    symmetric matrices of shape (N, s, s) for numerical E and Y. The coefficients of all LMIs are obtained by
+    evaluating build on a basis of (E, Y), such that the LMIs are sliced from a single affine expression instead
+    of being assembled from CVXPY block matrices one by one.
+    '''
+    n, m = Y.shape[1], Y.shape[0]
+    d = n*n + m*n
+    M_0 = build(np.zeros((n, n)), np.zeros((m, n)))
+    N, s, _ = M_0.shape
+
+    C = np.empty((N, s, s, d))
+    for k in range(d):
+        z = np.zeros(d)
+        z[k] = 1.0
+        C[..., k] = build(z[:n*n].reshape(n, n, order='F'), z[n*n:].reshape(m, n, order='F')) - M_0
+    # symmetrize the coefficients, which does not change the LMIs for symmetric E
+    C = (C + np.swapaxes(C, 1, 2)) / 2
+
+    z = cp.hstack([cp.vec(E, order='F'), cp.vec(Y, order='F')])
+    lmis = C.reshape(N*s*s, d) @ z + M_0.reshape(-1)
+    return [cp.reshape(lmis[i*s*s:(i+1)*s*s], (s, s), order='C') >> 0 for i in range(N)]
+
+def _prune_vertex_matrices(A: np.ndarray, tol: float = 1e-9) -> np.ndarray:
+    '''
+    Returns the matrices of the batch A of shape (N, n, n) which are extreme points of the convex hull of all
+    matrices, i.e., removes duplicates and matrices that are convex combinations of the others.
+    '''
+    a = A.reshape(A.shape[0], -1)
+    _, idx = np.unique(np.round(a / tol) * tol, axis=0, return_index=True)
+    idx = np.sort(idx)
+    if idx.size <= 2:
+        return A[idx]
+
+    # coordinates in the affine hull of the matrices, in which their convex hull is full dimensional
+    c = a[idx] - a[idx].mean(axis=0)
+    _, S, Vt = np.linalg.svd(c, full_matrices=False)
+    r = int(np.sum(S > tol * max(S[0], 1.0)))
+    coords = c @ Vt[:r].T
+    if r == 0:
+        return A[idx[:1]]
+    elif r == 1:
+        return A[idx[[np.argmin(coords), np.argmax(coords)]]]
+    elif idx.size <= r + 1:
+        return A[idx]
+    return A[idx[np.sort(ConvexHull(coords).vertices)]]
+
+def _outer_box_vertices(omega: Polytope) -> np.ndarray:
+    '''Returns the 2^p vertices of the outer bounding box of the polytope omega in R^p'''
+    p = omega.A.shape[1]
+    ub = omega.support_batch(np.eye(p))
+    lb = -omega.support_batch(-np.eye(p))
+    return np.array(list(product(*zip(lb, ub))))
@@ -0,0 +1,181 @@
+'''
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+% Copyright (C) 2025, Intelligent Control Systems Group, ETH Zurich
+%
+% This code is made available under an MIT License (see LICENSE file).
+%
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+'''
+
+from statistics import NormalDist
+from typing import TYPE_CHECKING
+import numpy as np
+
+from ampyc.utils.polytope.polytope import Polytope
+
+if TYPE_CHECKING:
+    from ampyc.noise import NoiseBase
+
+
+def estimate_probability(
+        events: np.ndarray,
+        weights: np.ndarray | None = None,
+        confidence: float = 0.95,
+        antithetic: bool = False,
+    ) -> tuple[float, tuple[float, float]]:
+    '''
+    Monte Carlo estimate of the probability of an event, e.g., a constraint violation, together with a
+    confidence interval based on the central limit theorem.
+
+    The samples can be generated with the variance reduction modes of the noise generators (see ampyc.noise):
+    - 'importance': pass the likelihood ratio weights of the samples. If a sample is a trajectory, its weight is
+      the product of the weights of the disturbances along the trajectory.
+    - 'antithetic': set antithetic=True, such that the samples 2i and 2i+1 are averaged before estimating the
+      variance.
+    - 'qmc': the interval is computed as for independent samples, which is typically conservative for
+      randomized QMC samples. For a rigorous interval, estimate over independent randomizations, e.g., the
+      streams of a noise generator, and combine the estimates.
+
+    Args:
+        events (np.ndarray): Boolean array of shape (num_samples,) indicating whether the event occurred.
+        weights (np.ndarray | None): Likelihood ratio weights of shape (num_samples,), or None for unweighted samples.
+        confidence (float): Confidence level of the interval, in the range (0, 1).
+        antithetic (bool): If True, consecutive samples are treated as antithetic pairs.
+
+    Returns:
+        p (float): Estimated probability of the event.
+        interval (tuple[float, float]): Confidence interval of the estimate, clipped to [0, 1].
+    '''
+    assert 0 < confidence < 1, 'confidence must be in the range (0, 1)'
+    values = np.asarray(events, dtype=float).reshape(-1)
+    if weights is not None:
+        weights = np.asarray(weights, dtype=float).reshape(-1)
+        assert weights.shape == values.shape, 'events and weights must have the same number of samples'
+        values = values * weights
+    if antithetic:
+        assert values.size % 2 == 0, 'antithetic samples must come in pairs'
+        values = values.reshape(-1, 2).mean(axis=1)
+    assert values.size > 1, 'at least two (pairs of) samples are required'
+
+    return _estimate(np.sum(values), np.sum(values**2), values.size, confidence)
+
+
+def error_coverage(
+        A_K: np.ndarray,
+        noise: 'NoiseBase',
+        sets: list[Polytope | tuple[np.ndarray, float] | None] | Polytope | tuple[np.ndarray, float],
+        num_traj: int,
+        num_steps: int | None = None,
+        e0: 'np.ndarray | NoiseBase | None' = None,
+        batch_size: int = 10**5,
+        confidence: float = 0.95,
+        tol: float = 1e-9,
+    ) -> tuple[np.ndarray, np.ndarray]:
+    '''
+    Monte Carlo validation of reachable and invariant sets of the error dynamics e_{k+1} = A_K e_k + w_k, e.g.,
+    the PRS of compute_prs, the DRS of compute_drs, or the invariant sets of eps_min_RPI and compute_mrpi.
+
+    The trajectories are simulated in batches, i.e., one matrix multiplication per batch and time step, and the
+    containment in the sets is checked on the fly, such that no trajectories are stored. If the noise generator
+    uses importance sampling or antithetic pairs, the coverage is estimated accordingly (see estimate_probability).
+
+    Usage:
+        # PRS, the set F[i] of compute_prs contains the error at time step i+1 with probability p
+        x_tight, u_tight, F, p_tilde, P, K = compute_prs(sys, p, N)
+        coverage, intervals = error_coverage(sys.A + sys.B @ K, sys.noise_generator,
+                                             [None] + [(F_i, p_tilde) for F_i in F[:-1]], num_traj=10**6)
+        # invariance of a robust positively invariant set Omega, starting uniformly in Omega
+        coverage, _ = error_coverage(A_K, sys.noise_generator, Omega, num_traj=10**6, num_steps=20,
+                                     e0=PolytopeNoise(Omega))
+
+    Args:
+        A_K (np.ndarray): Closed-loop error dynamics matrix A + B K.
+        noise (NoiseBase): Noise generator of the disturbances w_k, must not be state dependent.
+        sets (list | Polytope | tuple): List of sets, where sets[k] is checked against e_k. Each set is either
+            a Polytope, an ellipsoid {e | e^T M e <= r} given as tuple (M, r), or None to skip the time step.
+            A single set is checked at all time steps 0, ..., num_steps.
+        num_traj (int): Number of simulated trajectories.
+        num_steps (int | None): Number of time steps, required if a single set is given, otherwise len(sets) - 1.
+        e0 (np.ndarray | NoiseBase | None): Initial error, either fixed, sampled from a noise generator, or zero.
+        batch_size (int): Number of trajectories simulated at once.
+        confidence (float): Confidence level of the intervals, in the range (0, 1).
+        tol (float): Numerical tolerance of the containment checks.
+
+    Returns:
+        coverage (np.ndarray): Empirical probability that e_k is contained in sets[k], of shape (num_steps+1,),
+            NaN for skipped time steps.
+        intervals (np.ndarray): Confidence intervals of the coverage, of shape (num_steps+1, 2).
+    '''
+    if noise.state_dependent:
+        raise Exception('State dependent noise is not supported for the error dynamics')
+    if not isinstance(sets, list):
+        if num_steps is None:
+            raise Exception('num_steps is required if a single set is given')
+        sets = (num_steps + 1) * [sets]
+    num_steps = len(sets) - 1
+    n = A_K.shape[0]
+
+    antithetic = noise.variance_reduction == 'antithetic'
+    importance = noise.variance_reduction == 'importance'
+    if antithetic and batch_size % 2 != 0:
+        batch_size += 1
+
+    # running sums of the (weighted) containment indicators and their squares, and the number of samples
+    s1 = np.zeros(num_steps + 1)
+    s2 = np.zeros(num_steps + 1)
+    count = 0
+
+    num_done = 0
+    while num_done < num_traj:
+        B = min(batch_size, num_traj - num_done)
+        if antithetic and B % 2 != 0:
+            B += 1
+
+        if e0 is None:
+            e = np.zeros((n, B))
+        elif isinstance(e0, np.ndarray):
+            e = np.tile(e0.reshape(n, 1), (1, B))
+        else:
+            e = e0.generate(B)
+        weights = np.ones(B)
+
+        for k in range(num_steps + 1):
+            if k > 0:
+                e = A_K @ e + noise.generate(B)
+                if importance:
+                    weights = weights * noise.weights
+
+            if sets[k] is None:
+                continue
+            values = _contains(sets[k], e, tol) * weights
+            if antithetic:
+                values = values.reshape(-1, 2).mean(axis=1)
+            s1[k] += np.sum(values)
+            s2[k] += np.sum(values**2)
+
+        count += B // 2 if antithetic else B
+        num_done += B
+
+    coverage = np.full(num_steps + 1, np.nan)
+    intervals = np.full((num_steps + 1, 2), np.nan)
+    for k in range(num_steps + 1):
+        if sets[k] is not None:
+            coverage[k], intervals[k] = _estimate(s1[k], s2[k], count, confidence)
+    return coverage, intervals
+
+
+def _contains(S: Polytope | tuple[np.ndarray, float], e: np.ndarray, tol: float) -> np.ndarray:
+    '''Returns a boolean array indicating which columns of e are contained in the polytope or ellipsoid S'''
+    if isinstance(S, tuple):
+        M, r = S
+        return np.einsum('ij,ij->j', e, M @ e) <= r + tol
+    return np.all(S.A @ e <= S.b.reshape(-1, 1) + tol, axis=0)
+
+
+def _estimate(s1: float, s2: float, num: int, confidence: float) -> tuple[float, tuple[float, float]]:
+    '''Computes the mean and its confidence interval from the sum s1 and the sum of squares s2 of num samples'''
+    p = float(s1 / num)
+    var = max(0.0, float((s2 - num * p**2) / (num - 1)))
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    half_width = z * np.sqrt(var / num)
+    return p, (max(0.0, float(p - half_width)), min(1.0, float(p + half_width)))
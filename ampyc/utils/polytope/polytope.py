@@ -12,17 +12,26 @@
 %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
 '''
 
-from typing import TypeVar
+from typing import TypeVar, TYPE_CHECKING
 import numpy as np
-import cvxpy as cp
-import matplotlib.pyplot as plt
 import polytope as pc
-from polytope.polytope import projection, reduce, extreme, is_fulldim, _get_patch
+from polytope.polytope import projection, is_fulldim, _get_patch
+from polytope.polytope import reduce as pc_reduce, extreme as pc_extreme
 from polytope.quickhull import quickhull
 
+from ampyc.utils.profiling import counted, profiled
+
+# NOTE: matplotlib and cvxpy are only imported when plotting or computing support functions
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
+
 # Type variable for Polytope
 polytope = TypeVar('Polytope', bound='Polytope')
 
+# vertex enumeration and redundancy removal of the polytope package, counted when profiling set computations
+extreme = counted('extreme', sizes=lambda V, P: (None if V is None else V.shape[0], P.A.shape[0]))(pc_extreme)
+reduce = counted('reduce', sizes=lambda out, P, *args, **kwargs: (None, P.A.shape[0]))(pc_reduce)
+
 class Polytope(pc.Polytope):
     '''
     Improved Polytope class with additional functionality compared to polytope.Polytope.
@@ -205,7 +214,7 @@ class Polytope(pc.Polytope):
             # return a full Polytope with vertices and bounding box computed
             return Polytope(A=P.A, b=P.b, vertices=P.vertices)
     
-    def plot(self, ax: plt.Axes | None = None, alpha: float = 0.25, color: str | None = None, **kwargs) -> plt.Axes:
+    def plot(self, ax: 'plt.Axes | None' = None, alpha: float = 0.25, color: str | None = None, **kwargs) -> 'plt.Axes':
         """
         Plot the Polytope in a given plt.Axes object. If no axes object is provided, it uses the current plt.axes.
         Args:
@@ -215,6 +224,8 @@ class Polytope(pc.Polytope):
         Returns:
             plt.Axes: The plt.Axes object with the Polytope patch added.
         """
+        import matplotlib.pyplot as plt
+
         if ax is None:
             ax = plt.gca()
 
@@ -240,6 +251,13 @@ class Polytope(pc.Polytope):
         For usage details see function: L{_support}.
         """
         return _support(self, eta)
+
+    def support_batch(self, etas):
+        """Compute support function of Polytope for multiple directions at once.
+
+        For usage details see function: L{_support_batch}.
+        """
+        return _support_batch(self, etas)
     
     def Vrep(self):
         if self.vertices is None:
@@ -249,6 +267,16 @@ class Polytope(pc.Polytope):
         else:
             return self.vertices
     
+def _qhull_sizes(out: polytope | tuple | np.ndarray, vertices: np.array, *args, **kwargs) -> tuple[int, int | None]:
+    """Returns the number of input vertices and output facets of qhull for profiling."""
+    if isinstance(out, tuple):
+        return vertices.shape[0], out[0].shape[0]
+    elif isinstance(out, Polytope) and out.A is not None:
+        return vertices.shape[0], out.A.shape[0]
+    return vertices.shape[0], None
+
+@profiled
+@counted('qhull', sizes=_qhull_sizes)
 def qhull(vertices: np.array, abs_tol: float = 1e-7, verbose: bool = False, output: str = "polytope") -> polytope | np.ndarray:
     """
     Use quickhull to compute a convex hull.
@@ -265,7 +293,7 @@ def qhull(vertices: np.array, abs_tol: float = 1e-7, verbose: bool = False, outp
     """
     dim = vertices.shape[1]
     rays = vertices - vertices[0, :]
-    _,S,_ = np.linalg.svd(rays)
+    S = np.linalg.svd(rays, compute_uv=False)
 
     if np.any(S < abs_tol):
         if verbose:
@@ -309,6 +337,7 @@ def _reduce(P: polytope) -> polytope:
     pc_P = reduce(P)
     return Polytope(A=pc_P.A, b=pc_P.b, vertices=pc_P.vertices)
     
+@counted('support_lp', sizes=lambda out, P, eta: (None, P.A.shape[0]))
 def _support(P: polytope, eta: np.array) -> polytope:
     '''
     The support function of the polytope P, evaluated at (or in the direction)
@@ -323,6 +352,8 @@ def _support(P: polytope, eta: np.array) -> polytope:
     Returns:
         float: The value of the support function in the direction eta.
     '''
+    import cvxpy as cp
+
     n = P.A.shape[1]
     x = cp.Variable((n,1))
     constraints = [P.A @ x <= P.b.reshape(-1,1)]
@@ -333,6 +364,28 @@ def _support(P: polytope, eta: np.array) -> polytope:
         raise Exception('Unable to compute support for the given polytope and direction eta!')
     return objective.value
 
+def _support_batch(P: polytope, etas: np.array) -> np.ndarray:
+    '''
+    The support function of the polytope P, evaluated at all rows of etas.
+
+    If a vertex representation of P is available, the support function is evaluated
+    in a single matrix product as the maximum over all vertices. Otherwise, it falls
+    back to solving one LP per direction.
+
+    Args:
+        P (Polytope): The polytope for which to compute the support function.
+        etas (np.array): Array of shape (k, n), where each row is a direction.
+
+    Returns:
+        np.ndarray: Array of shape (k,) with the value of the support function in each direction.
+    '''
+    etas = np.atleast_2d(etas)
+    if P.vertices is not None and P.vertices.size > 0:
+        return np.max(etas @ P.vertices.T, axis=1)
+    else:
+        return np.array([_support(P, eta) for eta in etas]).reshape(-1)
+
+@profiled
 def _minkowski_sum(P: polytope, Q: polytope) -> polytope:
     '''
     Minkowski sum of two convex polytopes P and Q :math: `P + Q = {p + q in R^n : p \in P, q \in Q}`.
@@ -370,6 +423,7 @@ def _minkowski_sum(P: polytope, Q: polytope) -> polytope:
 
     return out
 
+@profiled
 def _pontryagin_difference(P: polytope, Q: polytope) -> polytope:
     '''
     Pontryagin difference for two convex polytopes P and Q :math: `P - Q = {x in R^n : x + q \in P, \forall q \in Q}`.
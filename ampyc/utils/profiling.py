@@ -0,0 +1,226 @@
+'''
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+% Copyright (C) 2025, Intelligent Control Systems Group, ETH Zurich
+%
+% This code is made available under an MIT License (see LICENSE file).
+%
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+'''
+
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from functools import wraps
+import time
+
+# Opt-in profiling of set computations.
+#
+# Primitive operations, i.e., support function LPs, convex hulls (qhull), vertex enumerations (extreme), and
+# redundancy removals (reduce), are counted and timed with the counted decorator. Composite operations, e.g.,
+# compute_mrpi or the offline computations of a controller, are decorated with profiled and show up as (nested)
+# calls in the summary. Both decorators only add a single check if no Profiler is active.
+
+EVENTS = ['support_lp', 'qhull', 'extreme', 'reduce']
+
+# stack of active profilers
+_active: list['Profiler'] = []
+
+
+@dataclass
+class CallRecord:
+    '''
+    Statistics of a single profiled call, including all nested calls.
+
+    Parameters:
+        name (str): Name of the profiled function.
+        time (float): Wall time of the call in seconds.
+        counts (dict[str, int]): Number of primitive operations per event, see EVENTS.
+        times (dict[str, float]): Time spent in primitive operations per event in seconds.
+        peak_vertices (int): Largest number of vertices of any polytope seen by a primitive operation.
+        peak_facets (int): Largest number of facets (half-spaces) of any polytope seen by a primitive operation.
+        children (list[CallRecord]): Nested profiled calls.
+    '''
+    name: str
+    time: float = 0.0
+    counts: dict[str, int] = field(default_factory=lambda: {e: 0 for e in EVENTS})
+    times: dict[str, float] = field(default_factory=lambda: {e: 0.0 for e in EVENTS})
+    peak_vertices: int = 0
+    peak_facets: int = 0
+    children: list['CallRecord'] = field(default_factory=list)
+
+    def add(self, other: 'CallRecord') -> None:
+        '''Accumulates the statistics of another record with the same name.'''
+        self.time += other.time
+        for e in EVENTS:
+            self.counts[e] += other.counts[e]
+            self.times[e] += other.times[e]
+        self.peak_vertices = max(self.peak_vertices, other.peak_vertices)
+        self.peak_facets = max(self.peak_facets, other.peak_facets)
+        self.children += other.children
+
+
+class Profiler:
+    '''
+    Context manager which counts and times all support function LPs, convex hulls, vertex enumerations, and
+    redundancy removals, and tracks the peak vertex and facet counts, for each top-level set computation called
+    within the context.
+
+    Usage:
+        with Profiler() as prof:
+            ctrl = ConstraintTighteningRMPC(sys, params.ctrl)
+        print(prof.table())
+
+    Attributes:
+        calls (list[CallRecord]): Records of all top-level profiled calls in the order of the calls. Primitive
+            operations outside of a profiled call are collected in a record named '<other>'.
+    '''
+
+    def __init__(self) -> None:
+        self.calls: list[CallRecord] = []
+        self._stack: list[CallRecord] = []
+        self._other: CallRecord | None = None
+
+    def __enter__(self) -> 'Profiler':
+        _active.append(self)
+        return self
+
+    def __exit__(self, *args) -> None:
+        _active.remove(self)
+
+    def _open(self, name: str) -> None:
+        record = CallRecord(name)
+        if self._stack:
+            self._stack[-1].children.append(record)
+        else:
+            self.calls.append(record)
+        self._stack.append(record)
+
+    def _close(self, elapsed: float) -> None:
+        self._stack.pop().time = elapsed
+
+    def _record(self, event: str, elapsed: float, vertices: int | None, facets: int | None) -> None:
+        if self._stack:
+            records = self._stack
+        else:
+            if self._other is None:
+                self._other = CallRecord('<other>')
+                self.calls.append(self._other)
+            self._other.time += elapsed
+            records = [self._other]
+
+        # primitive operations count towards all enclosing calls
+        for record in records:
+            record.counts[event] += 1
+            record.times[event] += elapsed
+            record.peak_vertices = max(record.peak_vertices, vertices or 0)
+            record.peak_facets = max(record.peak_facets, facets or 0)
+
+    def summary(self) -> dict[str, CallRecord]:
+        '''
+        Aggregates the top-level calls by name.
+
+        Returns:
+            summary (dict[str, CallRecord]): Accumulated record for each top-level function.
+        '''
+        summary = {}
+        for record in self.calls:
+            if record.name not in summary:
+                summary[record.name] = CallRecord(record.name)
+            summary[record.name].add(record)
+        return summary
+
+    def table(self, max_depth: int = 1) -> str:
+        '''
+        Formats the profile as a table with one row per top-level call, and indented rows for the nested calls
+        up to max_depth. Nested calls of the same function are merged into a single row.
+
+        Args:
+            max_depth (int): Maximum nesting depth shown, 0 shows only the top-level calls.
+
+        Returns:
+            table (str): The formatted table.
+        '''
+        header = f'{"call":<40} {"#":>5} {"time [s]":>9}' + \
+            ''.join(f' {e:>17}' for e in EVENTS) + f' {"peak V":>7} {"peak H":>7}'
+        lines = [header, '-' * len(header)]
+
+        def rows(records: list[CallRecord], depth: int) -> None:
+            if depth == 0:
+                merged = [(record, 1) for record in records]
+            else:
+                # merge nested calls of the same function
+                records_by_name, num_by_name = {}, {}
+                for record in records:
+                    if record.name not in records_by_name:
+                        records_by_name[record.name] = CallRecord(record.name)
+                        num_by_name[record.name] = 0
+                    records_by_name[record.name].add(record)
+                    num_by_name[record.name] += 1
+                merged = [(records_by_name[name], num_by_name[name]) for name in records_by_name]
+
+            for record, num in merged:
+                name = '  ' * depth + record.name
+                events = ''.join(f' {record.counts[e]:>7} ({record.times[e]:>7.3f})' for e in EVENTS)
+                lines.append(f'{name:<40} {num:>5} {record.time:>9.3f}{events} '
+                             f'{record.peak_vertices:>7} {record.peak_facets:>7}')
+                if depth < max_depth:
+                    rows(record.children, depth + 1)
+
+        rows(self.calls, 0)
+        lines.append('(counts of primitive operations, time spent in them in seconds in parentheses)')
+        return '\n'.join(lines)
+
+
+def profiled(func: Callable) -> Callable:
+    '''
+    Decorator which makes func show up as a (nested) call in the active profilers.
+    '''
+    name = func.__qualname__
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _active:
+            return func(*args, **kwargs)
+
+        profilers = list(_active)
+        for profiler in profilers:
+            profiler._open(name)
+        t = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - t
+            for profiler in profilers:
+                profiler._close(elapsed)
+
+    return wrapper
+
+
+def counted(event: str, sizes: Callable | None = None) -> Callable:
+    '''
+    Decorator which counts and times calls of a primitive operation in the active profilers.
+
+    Args:
+        event (str): Name of the primitive operation, see EVENTS.
+        sizes (Callable | None): Function with the signature (output, *args, **kwargs) -> (vertices, facets),
+            returning the number of vertices and facets (or None if unknown) of the polytopes involved in the call.
+    '''
+    assert event in EVENTS, f'Unknown event {event}'
+
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _active:
+                return func(*args, **kwargs)
+
+            t = time.perf_counter()
+            out = func(*args, **kwargs)
+            elapsed = time.perf_counter() - t
+
+            vertices, facets = sizes(out, *args, **kwargs) if sizes is not None else (None, None)
+            for profiler in _active:
+                profiler._record(event, elapsed, vertices, facets)
+            return out
+
+        return wrapper
+
+    return decorator
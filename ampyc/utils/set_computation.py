@@ -12,10 +12,10 @@ import cvxpy as cp
 from tqdm import tqdm
 from numpy.linalg import matrix_power, eigvals
 from scipy.stats.distributions import chi2
-from scipy.linalg import sqrtm
+from scipy.linalg import cho_solve
 
 from ampyc.typing import System, Controller
-from ampyc.utils import Polytope, qhull
+from ampyc.utils import Polytope, qhull, cached, profiled
 
 
 def _pre_set(Omega: Polytope, A: np.ndarray) -> Polytope:
@@ -52,6 +52,7 @@ def _robust_pre_set(Omega: Polytope, A: np.ndarray, W: Polytope) -> Polytope:
 
     return Polytope(A=Omega.A @ A, b=b_pre, lazy=True)
 
+@profiled
 def compute_mpi(Omega: Polytope, A: np.ndarray, max_iter: int = 50) -> Polytope:
     '''
     Compute the maximal positive invariant (MPI) set of the polytopic set Omega
@@ -89,6 +90,8 @@ def compute_mpi(Omega: Polytope, A: np.ndarray, max_iter: int = 50) -> Polytope:
 
     return mpi
 
+@profiled
+@cached
 def compute_mrpi(Omega: Polytope, A: np.ndarray, W: Polytope, max_iter: int = 50) -> Polytope:
     '''
     Compute the maximal robust positive invariant (MRPI) set of the polytopic set Omega
@@ -127,6 +130,8 @@ def compute_mrpi(Omega: Polytope, A: np.ndarray, W: Polytope, max_iter: int = 50
 
     return mrpi
 
+@profiled
+@cached
 def eps_min_RPI(sys: System, K: np.ndarray, epsilon: float = 1e-6, s_max: int = 50, method: str = 'RPI') -> tuple[Polytope, dict]:
     """ 
     Computes the minimal robust positively invariant (RPI) set for a linear system.
@@ -301,6 +306,8 @@ def eps_min_RPI(sys: System, K: np.ndarray, epsilon: float = 1e-6, s_max: int =
     else:
         raise ValueError(f"Unknown method '{method}' for computing the minimal RPI set.")
 
+@profiled
+@cached
 def compute_drs(A_BK:np.array, W:Polytope, N:int) -> list[Polytope]:
     '''
     Compute the disturbance reachable set (DRS) of the disturbance set W
@@ -321,20 +328,110 @@ def compute_drs(A_BK:np.array, W:Polytope, N:int) -> list[Polytope]:
         F[i+1] = F[i] + matrix_power(A_BK, i) @ W
     return F
 
-def compute_prs(sys: System, p: float, N: int) -> tuple[np.ndarray, np.ndarray, list[np.ndarray], float, np.ndarray, np.ndarray]:
+@profiled
+def compute_drs_tightening(A_BK: np.ndarray, W: Polytope, H: np.ndarray, N: int, tightening: np.ndarray | None = None) -> np.ndarray:
+    '''
+    Compute the support function of the disturbance reachable sets (DRS) F_i of the disturbance set W
+    propagated by the closed-loop dynamics A_BK, evaluated at the rows of H. This is the constraint
+    tightening :math: `h_{F_i}(a_j)` used in constraint tightening MPC, e.g., for :math: `X - F_i`.
+
+    The DRS are never materialized, instead the recursion
+    .. math::
+        h_{F_{i+1}}(a) = h_{F_i}(a) + h_W((A_BK^i)^T a)
+    is evaluated using batched support function evaluations of W only.
+
+    Args:
+        A_BK (np.ndarray): The closed-loop dynamics matrix (A + B*K).
+        W (Polytope): The disturbance set.
+        H (np.ndarray): The directions a_j, stacked as rows, e.g., the constraint matrix X.A.
+        N (int): The number of time steps to compute the tightening for.
+        tightening (np.ndarray | None): Previously computed tightening for the same A_BK, W, and H, but a
+            possibly shorter horizon. Its columns are reused and only the missing time steps are computed.
+
+    Returns:
+        np.ndarray: Array of shape (H.shape[0], N+1), where column i is the support function of F_i
+            evaluated at the rows of H (with F_0 the empty set, i.e., the first column is zero).
+    '''
+    H = np.atleast_2d(H)
+    n_h, n = H.shape
+
+    # reuse previously computed time steps
+    if tightening is None:
+        N_0 = 0
+        tightening = np.zeros((n_h, 1))
+    else:
+        N_0 = tightening.shape[1] - 1
+        if N_0 >= N:
+            return tightening[:, :N+1]
+
+    # directions (A_BK^i)^T a_j for i = N_0, ..., N-1, stacked as rows of H @ A_BK^i
+    H_pwr = np.empty((N - N_0, n_h, n))
+    H_pwr_i = H @ matrix_power(A_BK, N_0)
+    for i in range(N - N_0):
+        H_pwr[i] = H_pwr_i
+        H_pwr_i = H_pwr_i @ A_BK
+
+    # evaluate all support functions at once and accumulate over time steps
+    h_W = W.support_batch(H_pwr.reshape(-1, n)).reshape(N - N_0, n_h)
+
+    return np.hstack([tightening, tightening[:, -1:] + np.cumsum(h_W, axis=0).T])
+
+def within_drs_tightening(A_BK: np.ndarray, H: np.ndarray, tightening: np.ndarray, e: np.ndarray, k: int,
+                          steps: range, tol: float = 1e-9) -> bool:
+    '''
+    Check whether the error e, which accumulated over k time steps since a plan was computed with the tightening
+    of compute_drs_tightening, is covered by the tightening of the remaining time steps of the plan, i.e.,
+    .. math::
+        H A_BK^{i-k} e <= h_{F_i}(H) - h_{F_{i-k}}(H)
+    for all time steps i in steps. Since F_i = A_BK^{i-k} F_k + F_{i-k}, this holds if e is contained in F_k,
+    while only the directions H are checked, such that the tightened constraints of the plan still guarantee
+    the constraints H for all future disturbances.
+
+    Args:
+        A_BK (np.ndarray): The closed-loop dynamics matrix (A + B*K).
+        H (np.ndarray): The directions used to compute the tightening, stacked as rows.
+        tightening (np.ndarray): The tightening of compute_drs_tightening for A_BK and H.
+        e (np.ndarray): The error after k time steps.
+        k (int): The number of time steps since the plan was computed.
+        steps (range): The time steps i >= k of the plan to be checked.
+        tol (float): Numerical tolerance of the check.
+
+    Returns:
+        bool: True if the error is covered at all time steps in steps.
+    '''
+    if len(steps) == 0:
+        return True
+    if steps.start < k or steps[-1] >= tightening.shape[1]:
+        return False
+
+    H = np.atleast_2d(H)
+    e_i = matrix_power(A_BK, steps.start - k) @ np.asarray(e, dtype=float).reshape(-1)
+    for i in steps:
+        if np.any(H @ e_i > tightening[:, i] - tightening[:, i - k] + tol):
+            return False
+        e_i = A_BK @ e_i
+    return True
+
+@profiled
+@cached
+def compute_prs(sys: System, p: float, N: int, return_F: bool = True) -> tuple[np.ndarray, np.ndarray, list[np.ndarray] | None, float, np.ndarray, np.ndarray]:
     '''
     Compute the probabilistic reachable sets (PRS) and the corresponding state and input constraint tightenings.
     The tube controller for the PRS is computed such that the tubes are minimal using semidefinite programming (SDP).
 
+    The tightenings are computed from the Cholesky factors L_i of the error covariances Sigma_i = L_i L_i^T,
+    i.e., ||L_i^T a||_2 = sqrt(a^T Sigma_i a), for all time steps and constraints at once.
+
     Args:
         sys (System): The system object containing the dynamics and constraints.
         p (float): The probability level for the PRS computation.
         N (int): The number of time steps to compute the PRS for.
+        return_F (bool): If False, the PRS shape matrices F are not materialized and None is returned instead.
     
     Returns:
         x_tight (np.ndarray): The tightening to be applied to the state constraints for each time step.
         u_tight (np.ndarray): The tightening to be applied to the input constraints for each time step.
-        F (list[np.ndarray]): The PRS for each time step.
+        F (list[np.ndarray] | None): The PRS for each time step, or None if return_F is False.
         p_tilde (float): The chi-squared threshold value for the given probability p.
         P (np.ndarray): The terminal cost matrix (value function of the tube controller).
         K (np.ndarray): The tube controller gain matrix.
@@ -371,17 +468,24 @@ def compute_prs(sys: System, p: float, N: int) -> tuple[np.ndarray, np.ndarray,
     K = np.array(Y.value) @ P
     A_K = A + B @ K
 
-    # error variance
-    var_e = (N+1) * [None]
-    var_e[0] = np.zeros((n,n))
+    # error variance var_e[i] for i = 1, ..., N (var_e[0] = 0 is not needed)
+    var_e = np.empty((N, n, n))
+    var_e_i = np.zeros((n, n))
     for i in range(N):
-        var_e[i+1] = A_K @ var_e[i] @ A_K.T + noise_cov
-
-    # set F
-    F = (N+1) * [None]
-    for i in range(N):
-        F[i] = np.linalg.inv(var_e[i+1])
-    F[-1] = P
+        var_e_i = A_K @ var_e_i @ A_K.T + noise_cov
+        var_e[i] = var_e_i
+
+    # lower Cholesky factors of all error variances, shape (N, n, n)
+    L = np.linalg.cholesky(var_e)
+
+    # set F as the inverse error variances, computed from the Cholesky factors
+    if return_F:
+        F = (N+1) * [None]
+        for i in range(N):
+            F[i] = cho_solve((L[i], True), np.eye(n))
+        F[-1] = P
+    else:
+        F = None
 
     # compute tightening
     X = sys.X
@@ -392,14 +496,9 @@ def compute_prs(sys: System, p: float, N: int) -> tuple[np.ndarray, np.ndarray,
     x_tight = np.zeros((nx,N+1))
     u_tight = np.zeros((nu,N+1))
 
-    # for every time step
-    for i in range(N):
-        inv_sqrt_F_i = np.linalg.inv(sqrtm(F[i]))
-        # for every constraint
-        for j in range(nx):
-            x_tight[j, i+1] = np.linalg.norm(inv_sqrt_F_i @ X.A[j,:].reshape(-1,1), ord=2) * sqrt_p_tilde
-        for j in range(nu):
-            u_tight[j, i+1] = np.linalg.norm(inv_sqrt_F_i @ K.T @ U.A[j,:].reshape(-1,1), ord=2) * sqrt_p_tilde
+    # for every time step and every constraint: ||L_i^T a_j||_2 * sqrt(p_tilde)
+    x_tight[:, 1:] = np.linalg.norm(np.einsum('kji,cj->cki', L, X.A), axis=2) * sqrt_p_tilde
+    u_tight[:, 1:] = np.linalg.norm(np.einsum('kji,cj->cki', L, U.A @ K), axis=2) * sqrt_p_tilde
 
     # check that the tightened constraints are valid
     for i in range(N):
@@ -408,6 +507,7 @@ def compute_prs(sys: System, p: float, N: int) -> tuple[np.ndarray, np.ndarray,
 
     return x_tight, u_tight, F, p_tilde, P, K
 
+@profiled
 def compute_RoA(ctrl: Controller, sys: System, grid_size: int = 25, return_type: str = "polytope", solver: str | None = None, additional_params: dict = {}) -> Polytope | np.ndarray:
     """
     Compute the region of attraction (RoA) for a given controller and system.
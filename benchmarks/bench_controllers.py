@@ -0,0 +1,167 @@
+'''
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+% Copyright (C) 2025, Intelligent Control Systems Group, ETH Zurich
+%
+% This code is made available under an MIT License (see LICENSE file).
+%
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+'''
+
+from dataclasses import replace
+import time
+import numpy as np
+
+from ampyc.params import MPCParams, NonlinearMPCParams, RMPCParams, NonlinearRMPCParams, SMPCParams, \
+    RMPCSMPCParams, SFParams
+from ampyc.systems import LinearSystem, NonlinearSystem
+from ampyc.controllers import MPC, NonlinearMPC, RMPC, NonlinearRMPC, RecoveryInitializationSMPC, \
+    IndirectFeedbackSMPC, ConstraintTighteningRMPC, ConstraintTighteningSMPC, IBSF, MinIBSF, DampIBSF, PSF
+from ampyc.utils import compute_prs
+
+from common import stats, make_params
+
+'''
+Benchmark cases, each defined by
+- params: parameter class of the default experiment
+- system: system class
+- build: function (sys, ctrl_params) -> controller
+- solve: function (ctrl, sys, x) -> solution, a single closed-loop step of the controller
+- dims: state dimensions of the sweep, nonlinear systems are only benchmarked in their default dimension
+'''
+
+def _prs_build(controller):
+    def build(sys, params):
+        _, _, _, _, P, K = compute_prs(sys, 0.9, params.N, return_F=False)
+        return controller(sys, params, K) if controller is RecoveryInitializationSMPC else controller(sys, params, P, K)
+    return build
+
+def _prs_tightening(ctrl, sys):
+    if not hasattr(ctrl, '_bench_tightening'):
+        x_tight, u_tight, _, _, _, _ = compute_prs(sys, 0.9, ctrl.params.N, return_F=False)
+        ctrl._bench_tightening = {'x_tight': x_tight[:, :ctrl.params.N], 'u_tight': u_tight[:, :ctrl.params.N]}
+    return ctrl._bench_tightening
+
+def _sf_build(controller, *args):
+    def build(sys, params):
+        P = IBSF(sys, params).P
+        return controller(sys, params, P) if controller is PSF else controller(sys, P, params, *args)
+    return build
+
+_u_L = lambda sys: 0.1 * np.ones(sys.m)
+
+CASES = {
+    'MPC': dict(
+        params=MPCParams, system=LinearSystem, dims=[2, 4, 8],
+        build=lambda sys, params: MPC(sys, params),
+        solve=lambda ctrl, sys, x: ctrl.solve(x)),
+    'NonlinearMPC': dict(
+        params=NonlinearMPCParams, system=NonlinearSystem, dims=[2],
+        build=lambda sys, params: NonlinearMPC(sys, params),
+        solve=lambda ctrl, sys, x: ctrl.solve(x)),
+    'RMPC': dict(
+        params=RMPCParams, system=LinearSystem, dims=[2, 4],
+        build=lambda sys, params: RMPC(sys, params, 0.9),
+        solve=lambda ctrl, sys, x: ctrl.solve(x)),
+    'NonlinearRMPC': dict(
+        params=NonlinearRMPCParams, system=NonlinearSystem, dims=[2],
+        build=lambda sys, params: NonlinearRMPC(sys, params, 0.75),
+        solve=lambda ctrl, sys, x: ctrl.solve(x)),
+    'RecoveryInitializationSMPC': dict(
+        params=SMPCParams, system=LinearSystem, dims=[2, 4, 8],
+        build=_prs_build(RecoveryInitializationSMPC),
+        solve=lambda ctrl, sys, x: ctrl.solve(x, additional_parameters=_prs_tightening(ctrl, sys))),
+    'IndirectFeedbackSMPC': dict(
+        params=SMPCParams, system=LinearSystem, dims=[2, 4, 8],
+        build=_prs_build(IndirectFeedbackSMPC),
+        solve=lambda ctrl, sys, x: ctrl.solve(x, additional_parameters={**_prs_tightening(ctrl, sys), 'z_0': x})),
+    'ConstraintTighteningRMPC': dict(
+        params=RMPCSMPCParams, system=LinearSystem, dims=[2, 4],
+        build=lambda sys, params: ConstraintTighteningRMPC(sys, params),
+        solve=lambda ctrl, sys, x: ctrl.solve(x)),
+    'ConstraintTighteningSMPC': dict(
+        params=RMPCSMPCParams, system=LinearSystem, dims=[2, 4],
+        build=lambda sys, params: ConstraintTighteningSMPC(sys, params, 0.9),
+        solve=lambda ctrl, sys, x: ctrl.solve(x)),
+    'IBSF': dict(
+        params=SFParams, system=LinearSystem, dims=[2, 4, 8],
+        build=lambda sys, params: IBSF(sys, params),
+        solve=lambda ctrl, sys, x: ctrl.solve(sys, x, _u_L(sys))),
+    'MinIBSF': dict(
+        params=SFParams, system=LinearSystem, dims=[2, 4, 8],
+        build=_sf_build(MinIBSF),
+        solve=lambda ctrl, sys, x: ctrl.solve(x, additional_parameters={'u_L': _u_L(sys)})),
+    'DampIBSF': dict(
+        params=SFParams, system=LinearSystem, dims=[2, 4, 8],
+        build=_sf_build(DampIBSF, 0.5),
+        solve=lambda ctrl, sys, x: ctrl.solve(
+            x, additional_parameters={'u_L': _u_L(sys), 'V_x_0': float(x @ ctrl.P @ x)})),
+    'PSF': dict(
+        params=SFParams, system=LinearSystem, dims=[2, 4, 8],
+        build=_sf_build(PSF),
+        solve=lambda ctrl, sys, x: ctrl.solve(x, additional_parameters={'u_L': _u_L(sys)})),
+}
+
+HORIZONS = [5, 10, 20]
+
+
+def bench_controller(name: str, n: int | None, N: int | None, repeats: int = 3, solves: int = 20) -> dict:
+    '''
+    Benchmarks construction, first solve (including problem compilation), and steady-state solve latency of
+    a controller.
+
+    Args:
+        name (str): Name of the benchmark case, see CASES.
+        n (int | None): State dimension, if None the default dimension is used.
+        N (int | None): Prediction horizon, if None the default horizon is used.
+        repeats (int): Number of fresh constructions.
+        solves (int): Number of repeated solves for the steady-state solve latency.
+
+    Returns:
+        results (dict): Timing statistics for 'construct', 'first_solve', and 'solve'.
+    '''
+    case = CASES[name]
+    params = make_params(case['params'], n)
+    ctrl_params = params.ctrl if N is None else replace(params.ctrl, N=N)
+    sys = case['system'](params.sys)
+    x = params.sim.x_0.reshape(-1)
+
+    construct, first_solve, solve = ([], [], [])
+    for _ in range(repeats):
+        t = time.perf_counter()
+        ctrl = case['build'](sys, ctrl_params)
+        construct.append(time.perf_counter() - t)
+
+        t = time.perf_counter()
+        case['solve'](ctrl, sys, x)
+        first_solve.append(time.perf_counter() - t)
+
+    for _ in range(solves):
+        t = time.perf_counter()
+        case['solve'](ctrl, sys, x)
+        solve.append(time.perf_counter() - t)
+
+    return {'construct': stats(construct), 'first_solve': stats(first_solve), 'solve': stats(solve)}
+
+
+def run(quick: bool = False) -> dict[str, dict]:
+    '''
+    Runs the controller benchmarks, i.e., a sweep over the prediction horizon in the default state dimension,
+    and a sweep over the state dimension at the default prediction horizon.
+
+    Args:
+        quick (bool): If True, only the default horizon and dimension are benchmarked with fewer repeats.
+
+    Returns:
+        results (dict[str, dict]): Timing statistics for each benchmark.
+    '''
+    repeats, solves = (1, 5) if quick else (3, 20)
+    results = {}
+    for name, case in CASES.items():
+        sweep = [(None, None)]
+        if not quick:
+            sweep += [(None, N) for N in HORIZONS] + [(n, None) for n in case['dims'][1:]]
+        for n, N in sweep:
+            label = f'controllers/{name}' + ('' if N is None else f'/N={N}') + ('' if n is None else f'/n={n}')
+            for phase, result in bench_controller(name, n, N, repeats, solves).items():
+                results[f'{label}/{phase}'] = result
+    return results
@@ -0,0 +1,88 @@
+'''
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+% Copyright (C) 2025, Intelligent Control Systems Group, ETH Zurich
+%
+% This code is made available under an MIT License (see LICENSE file).
+%
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+'''
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from common import stats
+
+# subpackages of ampyc and the heavy dependencies they must not load on import
+MODULES = {
+    'ampyc': ['matplotlib', 'casadi', 'cvxpy', 'scipy', 'polytope'],
+    'ampyc.systems': ['matplotlib', 'casadi', 'cvxpy'],
+    'ampyc.noise': ['matplotlib', 'casadi', 'cvxpy'],
+    'ampyc.params': ['matplotlib', 'casadi', 'cvxpy'],
+    'ampyc.utils': ['matplotlib', 'casadi', 'cvxpy'],
+    'ampyc.controllers': ['matplotlib', 'casadi', 'cvxpy', 'scipy', 'polytope'],
+}
+
+# root of the repository, such that the fresh interpreters import the ampyc package of this checkout
+ROOT = str(Path(__file__).resolve().parents[1])
+
+HEAVY_MODULES = ['matplotlib', 'casadi', 'cvxpy', 'scipy', 'tqdm', 'polytope']
+
+_SNIPPET = '''
+import json, sys, time
+t = time.perf_counter()
+import {module}
+t = time.perf_counter() - t
+print(json.dumps({{"time": t, "loaded": [m for m in {heavy} if m in sys.modules]}}))
+'''
+
+
+def import_time(module: str, repeats: int = 5) -> tuple[dict, list[str]]:
+    '''
+    Measures the import time of a module in a fresh interpreter.
+
+    Args:
+        module (str): Name of the module to import.
+        repeats (int): Number of fresh interpreters.
+
+    Returns:
+        time (dict): Import time statistics over all repeats, see common.stats.
+        loaded (list[str]): Heavy dependencies loaded by importing the module.
+    '''
+    env = {**os.environ, 'PYTHONPATH': os.pathsep.join(filter(None, [ROOT, os.environ.get('PYTHONPATH')]))}
+    times = []
+    for _ in range(repeats):
+        out = subprocess.run([sys.executable, '-c', _SNIPPET.format(module=module, heavy=HEAVY_MODULES)],
+                             capture_output=True, text=True, check=True, cwd=ROOT, env=env)
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        times.append(result['time'])
+    return stats(times), result['loaded']
+
+
+def run(quick: bool = False) -> dict[str, dict]:
+    '''
+    Runs the import-time benchmark for all subpackages of ampyc.
+
+    Args:
+        quick (bool): If True, fewer fresh interpreters are used per subpackage.
+
+    Returns:
+        results (dict[str, dict]): Import time statistics for each subpackage.
+
+    Raises:
+        Exception: If importing a subpackage loads a heavy dependency it must not load.
+    '''
+    repeats = 2 if quick else 5
+    results = {}
+    for module, forbidden in MODULES.items():
+        results[f'import/{module}'], loaded = import_time(module, repeats)
+        if set(loaded) & set(forbidden):
+            raise Exception(f'Importing {module} loads {sorted(set(loaded) & set(forbidden))}!')
+    return results
+
+
+if __name__ == '__main__':
+    for name, result in run().items():
+        print(f'{name:<30} {1e3 * result["median"]:8.1f} ms')
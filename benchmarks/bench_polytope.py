@@ -0,0 +1,66 @@
+'''
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+% Copyright (C) 2025, Intelligent Control Systems Group, ETH Zurich
+%
+% This code is made available under an MIT License (see LICENSE file).
+%
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+'''
+
+import numpy as np
+
+from ampyc.utils import Polytope, qhull, _reduce
+
+from common import measure
+
+
+def _random_polytope(n: int, num_vertices: int, rng: np.random.Generator) -> Polytope:
+    '''Returns the convex hull of num_vertices random points on the unit sphere in n dimensions.'''
+    V = rng.standard_normal((num_vertices, n))
+    return Polytope(vertices=V / np.linalg.norm(V, axis=1, keepdims=True))
+
+
+def _box(n: int, scale: float = 1.0) -> Polytope:
+    '''Returns the box [-scale, scale]^n.'''
+    return Polytope(np.vstack([np.eye(n), -np.eye(n)]), scale * np.ones(2 * n))
+
+
+def run(quick: bool = False) -> dict[str, dict]:
+    '''
+    Runs the polytope benchmarks, i.e., construction, set operations, and support function evaluations on
+    random polytopes of increasing dimension.
+
+    Args:
+        quick (bool): If True, only two-dimensional polytopes are benchmarked with fewer repeats.
+
+    Returns:
+        results (dict[str, dict]): Timing statistics for each benchmark.
+    '''
+    repeats = 3 if quick else 10
+    dims = [2] if quick else [2, 3, 4]
+    results = {}
+
+    for n in dims:
+        rng = np.random.default_rng(n)
+        V = rng.standard_normal((10 * n, n))
+        P = _random_polytope(n, 4 * n, rng)
+        Q = 0.1 * _random_polytope(n, 4 * n, rng)
+        B = _box(n, 0.5)
+        A = np.linalg.qr(rng.standard_normal((n, n)))[0]
+        etas = rng.standard_normal((100, n))
+
+        label = f'polytope/n={n}'
+        results[f'{label}/qhull'] = measure(lambda: qhull(V), repeats)
+        results[f'{label}/from_H'] = measure(lambda: Polytope(P.A, P.b), repeats)
+        results[f'{label}/from_V'] = measure(lambda: Polytope(vertices=P.V), repeats)
+        results[f'{label}/minkowski_sum'] = measure(lambda: P + Q, repeats)
+        results[f'{label}/pontryagin_difference'] = measure(lambda: P - Q, repeats)
+        results[f'{label}/intersect'] = measure(lambda: P.intersect(B, lazy=False), repeats)
+        results[f'{label}/linear_map'] = measure(lambda: A @ P, repeats)
+        results[f'{label}/scale'] = measure(lambda: 2.0 * P, repeats)
+        results[f'{label}/reduce'] = measure(lambda: _reduce(P), repeats)
+        results[f'{label}/is_empty'] = measure(lambda: P.is_empty, repeats)
+        results[f'{label}/support'] = measure(lambda: P.support(etas[0]), repeats)
+        results[f'{label}/support_batch'] = measure(lambda: P.support_batch(etas), repeats)
+
+    return results
@@ -0,0 +1,70 @@
+'''
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+% Copyright (C) 2025, Intelligent Control Systems Group, ETH Zurich
+%
+% This code is made available under an MIT License (see LICENSE file).
+%
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+'''
+
+import numpy as np
+
+from ampyc.params import MPCParams, RMPCParams, SMPCParams
+from ampyc.systems import LinearSystem
+from ampyc.controllers import MPC
+from ampyc.utils import LQR, Polytope, compute_mrpi, compute_drs, eps_min_RPI, compute_prs, compute_RoA, \
+    suppress_stdout
+
+from common import measure, make_params
+
+
+def _tube(n: int | None) -> tuple:
+    '''Returns the system, LQR gain, closed-loop dynamics, and constraint set of the lifted RMPC example.'''
+    params = make_params(RMPCParams, n)
+    sys = LinearSystem(params.sys)
+    K, _ = LQR(sys.A, sys.B, params.ctrl.Q, params.ctrl.R)
+    Omega = Polytope(A=np.vstack([sys.X.A, sys.U.A @ K]), b=np.hstack([sys.X.b, sys.U.b]).reshape(-1, 1))
+    return sys, K, sys.A + sys.B @ K, Omega
+
+
+def run(quick: bool = False) -> dict[str, dict]:
+    '''
+    Runs the set computation benchmarks, i.e., sweeps over the state dimension for compute_mrpi and compute_prs,
+    eps_min_RPI in the default dimension, a sweep over the horizon for compute_drs and compute_prs, and compute_RoA for a nominal MPC.
+
+    Args:
+        quick (bool): If True, only the default dimension and horizon are benchmarked with fewer repeats.
+
+    Returns:
+        results (dict[str, dict]): Timing statistics for each benchmark.
+    '''
+    repeats = 1 if quick else 3
+    dims = [2] if quick else [2, 4]
+    horizons = [10] if quick else [10, 20, 40]
+    results = {}
+
+    for n in dims:
+        sys, K, A_BK, Omega = _tube(n)
+        results[f'sets/compute_mrpi/n={n}'] = measure(lambda: compute_mrpi(Omega, A_BK, sys.W), repeats)
+        if n == 2:
+            # NOTE: the Minkowski sums of eps_min_RPI are intractable in higher dimensions
+            results[f'sets/eps_min_RPI/n={n}'] = measure(lambda: eps_min_RPI(sys, K), repeats)
+
+        sys_s = LinearSystem(make_params(SMPCParams, n).sys)
+        results[f'sets/compute_prs/n={n}'] = measure(lambda: compute_prs(sys_s, 0.9, 10), repeats)
+
+    sys, K, A_BK, _ = _tube(None)
+    sys_s = LinearSystem(make_params(SMPCParams).sys)
+    for N in horizons:
+        results[f'sets/compute_drs/N={N}'] = measure(lambda: compute_drs(A_BK, sys.W, N), repeats)
+        results[f'sets/compute_prs/N={N}'] = measure(lambda: compute_prs(sys_s, 0.9, N), repeats)
+
+    params = make_params(MPCParams)
+    sys = LinearSystem(params.sys)
+    ctrl = MPC(sys, params.ctrl)
+    grid_size = 5 if quick else 10
+    with suppress_stdout():
+        results[f'sets/compute_RoA/grid={grid_size}'] = measure(
+            lambda: compute_RoA(ctrl, sys, grid_size=grid_size), repeats)
+
+    return results
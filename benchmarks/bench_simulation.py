@@ -0,0 +1,77 @@
+'''
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+% Copyright (C) 2025, Intelligent Control Systems Group, ETH Zurich
+%
+% This code is made available under an MIT License (see LICENSE file).
+%
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+'''
+
+import numpy as np
+
+from ampyc.params import MPCParams, RMPCParams, NonlinearMPCParams
+from ampyc.systems import LinearSystem, NonlinearSystem
+from ampyc.controllers import MPC, RMPC
+
+from common import measure, make_params
+
+
+def _simulate(sys, num_steps: int, num_traj: int, x_0: np.ndarray, policy) -> np.ndarray:
+    '''Simulates the closed loop as in the example notebooks, i.e., one trajectory and time step at a time.'''
+    x = np.zeros((num_steps+1, sys.n, num_traj))
+    x[0, :, :] = x_0
+    for i in range(num_traj):
+        for j in range(num_steps):
+            u = policy(x[j, :, i])
+            x[j+1, :, i] = sys.get_state(x[j, :, i], u).reshape(-1)
+    return x
+
+
+def run(quick: bool = False) -> dict[str, dict]:
+    '''
+    Runs the closed-loop simulation benchmarks. The reported times are per simulated time step, i.e., the
+    inverse of the simulation throughput.
+
+    Args:
+        quick (bool): If True, fewer and shorter trajectories are simulated.
+
+    Returns:
+        results (dict[str, dict]): Timing statistics for each benchmark.
+    '''
+    repeats = 1 if quick else 3
+    num_steps, num_traj = (10, 2) if quick else (30, 10)
+    steps = num_steps * num_traj
+    results = {}
+
+    def per_step(result: dict) -> dict:
+        return {k: v / steps if k != 'repeats' else v for k, v in result.items()}
+
+    # open loop, i.e., only the system and noise generator
+    for name, params_class, system_class in [('LinearSystem', RMPCParams, LinearSystem),
+                                             ('NonlinearSystem', NonlinearMPCParams, NonlinearSystem)]:
+        params = make_params(params_class)
+        sys = system_class(params.sys)
+        u = np.zeros(sys.m)
+        results[f'simulation/{name}/open_loop'] = per_step(measure(
+            lambda: _simulate(sys, num_steps, num_traj, params.sim.x_0, lambda x: u), repeats))
+
+    # closed loop with a nominal MPC
+    params = make_params(MPCParams)
+    sys = LinearSystem(params.sys)
+    ctrl = MPC(sys, params.ctrl)
+    policy = lambda x: ctrl.solve(x)[0][:, 0]
+    results['simulation/MPC/closed_loop'] = per_step(measure(
+        lambda: _simulate(sys, num_steps, num_traj, params.sim.x_0, policy), repeats))
+
+    # closed loop with a tube MPC
+    params = make_params(RMPCParams)
+    sys = LinearSystem(params.sys)
+    sys.noise_generator.seed(42)
+    ctrl = RMPC(sys, params.ctrl, 0.9)
+    def policy(x):
+        v, z, _ = ctrl.solve(x)
+        return v[:, 0] + ctrl.K @ (x - z[:, 0])
+    results['simulation/RMPC/closed_loop'] = per_step(measure(
+        lambda: _simulate(sys, num_steps, num_traj, params.sim.x_0, policy), repeats))
+
+    return results
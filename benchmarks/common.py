@@ -0,0 +1,111 @@
+'''
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+% Copyright (C) 2025, Intelligent Control Systems Group, ETH Zurich
+%
+% This code is made available under an MIT License (see LICENSE file).
+%
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+'''
+
+from collections.abc import Callable
+from copy import copy
+import time
+import numpy as np
+from scipy.linalg import block_diag
+
+from ampyc.typing import Params
+from ampyc.noise import GaussianNoise, ZeroNoise
+from ampyc.utils import Polytope, suppress_stdout
+
+
+def stats(times: list[float]) -> dict:
+    '''
+    Summarizes a list of timings.
+
+    Args:
+        times (list[float]): Measured times in seconds.
+
+    Returns:
+        stats (dict): Median, minimum, and maximum time in seconds, and the number of repeats.
+    '''
+    return {
+        'median': float(np.median(times)),
+        'min': float(np.min(times)),
+        'max': float(np.max(times)),
+        'repeats': len(times),
+    }
+
+
+def measure(func: Callable, repeats: int = 5, number: int = 1, setup: Callable | None = None) -> dict:
+    '''
+    Measures the run time of func.
+
+    Args:
+        func (Callable): Function to be timed, called with the output of setup if provided.
+        repeats (int): Number of timed repeats.
+        number (int): Number of calls per repeat, the reported time is per call.
+        setup (Callable | None): Function called (untimed) before every repeat, e.g., to construct a fresh object.
+
+    Returns:
+        stats (dict): Timing statistics per call, see stats.
+    '''
+    times = []
+    for _ in range(repeats):
+        args = () if setup is None else (setup(),)
+        t = time.perf_counter()
+        for _ in range(number):
+            func(*args)
+        times.append((time.perf_counter() - t) / number)
+    return stats(times)
+
+
+def make_params(params_class: type, n: int | None = None) -> Params:
+    '''
+    Builds the default parameters of an experiment, optionally lifted to a state dimension n by stacking n/2 copies
+    of the default (two-dimensional) system, i.e., all dynamics, cost, and constraint matrices are block diagonal.
+
+    Args:
+        params_class (type): Parameter class derived from ParamsBase, e.g., RMPCParams.
+        n (int | None): State dimension, must be a multiple of the default state dimension. If None, the default
+            parameters are returned.
+
+    Returns:
+        params (Params): The experiment parameters.
+    '''
+    with suppress_stdout():
+        params = params_class()
+    if n is None or n == params.sys.n:
+        return params
+
+    k = n // params.sys.n
+    assert k * params.sys.n == n, f'n must be a multiple of {params.sys.n}'
+    stack = lambda M: None if M is None else block_diag(*[M] * k)
+    tile = lambda b: None if b is None else np.tile(b, (k, 1))
+
+    sys = copy(params.sys)
+    sys.n, sys.m = (params.sys.n * k, params.sys.m * k)
+    sys.A, sys.B, sys.C, sys.D = (stack(params.sys.A), stack(params.sys.B), stack(params.sys.C), stack(params.sys.D))
+    sys.A_x, sys.b_x = (stack(params.sys.A_x), tile(params.sys.b_x))
+    sys.A_u, sys.b_u = (stack(params.sys.A_u), tile(params.sys.b_u))
+    sys.A_w, sys.b_w = (stack(params.sys.A_w), tile(params.sys.b_w))
+
+    # rebuild the noise generator for the lifted dimension
+    noise = params.sys.noise_generator
+    if isinstance(noise, GaussianNoise):
+        sys.noise_generator = GaussianNoise(tile(noise.mean.reshape(-1, 1)), stack(noise.cov))
+    elif isinstance(noise, ZeroNoise):
+        sys.noise_generator = ZeroNoise(dim=n)
+    else:
+        sys.noise_generator = type(noise)(Polytope(sys.A_w, sys.b_w))
+    params.sys = sys
+
+    ctrl = copy(params.ctrl)
+    for name in ['Q', 'R']:
+        if hasattr(ctrl, name):
+            setattr(ctrl, name, stack(getattr(ctrl, name)))
+    params.ctrl = ctrl
+
+    sim = copy(params.sim)
+    sim.x_0 = tile(params.sim.x_0)
+    params.sim = sim
+    return params
@@ -0,0 +1,151 @@
+'''
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+% Copyright (C) 2025, Intelligent Control Systems Group, ETH Zurich
+%
+% This code is made available under an MIT License (see LICENSE file).
+%
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+'''
+
+# Benchmark suite of ampyc. Run from the top-level folder of the repository:
+#
+#     python benchmarks/run.py                           # run all suites, compare against benchmarks/baseline.json
+#     python benchmarks/run.py --suite sets polytope     # run only some suites
+#     python benchmarks/run.py --quick                   # reduced sweeps, e.g., as a smoke test
+#     python benchmarks/run.py --save-baseline           # store the results as new baseline
+#
+# The results are written as JSON (default: benchmark_results.json). The script exits with status 1 if any benchmark
+# is slower than the baseline by more than the given tolerance.
+
+import argparse
+from datetime import datetime, timezone
+import importlib
+import json
+import os
+from pathlib import Path
+import platform
+import sys
+
+# benchmark the working tree, not an installed version of ampyc
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import numpy as np
+
+SUITES = ['import', 'controllers', 'sets', 'polytope', 'simulation']
+BASELINE = Path(__file__).resolve().parent / 'baseline.json'
+
+
+def run_suites(suites: list[str], quick: bool = False) -> dict:
+    '''
+    Runs the benchmark suites. The on-disk cache of offline computations is disabled, such that the
+    offline computations are benchmarked and not the cache lookup.
+
+    Args:
+        suites (list[str]): Names of the suites to run, see SUITES.
+        quick (bool): If True, reduced sweeps with fewer repeats are run.
+
+    Returns:
+        results (dict): Meta data of the run and timing statistics for each benchmark.
+    '''
+    from ampyc.utils import configure_cache
+    configure_cache(enabled=False)
+
+    results = {}
+    for suite in suites:
+        print(f'Running {suite} benchmarks...', flush=True)
+        results.update(importlib.import_module(f'bench_{suite}').run(quick=quick))
+
+    return {
+        'meta': {
+            'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'processor': platform.processor(),
+            'quick': quick,
+        },
+        'results': results,
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float = 0.25, min_diff: float = 1e-3) -> list[str]:
+    '''
+    Compares the run times of all benchmarks with the baseline and prints a table. The minimum over all repeats
+    is compared, since it is the least affected by other load on the machine.
+
+    Args:
+        results (dict): Benchmark results, see run_suites.
+        baseline (dict): Baseline results, see run_suites.
+        tolerance (float): Relative slowdown above which a benchmark is considered a regression.
+        min_diff (float): Absolute slowdown in seconds below which a benchmark is never considered a regression,
+            this avoids flagging timing noise of very fast benchmarks.
+
+    Returns:
+        regressions (list[str]): Names of all benchmarks which regressed.
+    '''
+    regressions = []
+    print(f'\n{"benchmark":<60} {"baseline":>10} {"current":>10} {"ratio":>7}')
+    for name, result in results['results'].items():
+        if name not in baseline['results']:
+            print(f'{name:<60} {"-":>10} {_format(result["min"]):>10} {"-":>7}  (new)')
+            continue
+        old, new = (baseline['results'][name]['min'], result['min'])
+        ratio = new / old if old > 0 else np.inf
+        flag = ''
+        if ratio > 1 + tolerance and new - old > min_diff:
+            flag = '  REGRESSION'
+            regressions.append(name)
+        elif ratio < 1 / (1 + tolerance) and old - new > min_diff:
+            flag = '  (faster)'
+        print(f'{name:<60} {_format(old):>10} {_format(new):>10} {ratio:>7.2f}{flag}')
+
+    if regressions:
+        print(f'\n{len(regressions)} benchmark(s) regressed by more than {100 * tolerance:.0f}%.')
+    else:
+        print('\nNo regressions.')
+    return regressions
+
+
+def _format(t: float) -> str:
+    '''Formats a time in seconds with a suitable unit.'''
+    if t >= 1:
+        return f'{t:.2f} s'
+    elif t >= 1e-3:
+        return f'{1e3 * t:.1f} ms'
+    else:
+        return f'{1e6 * t:.1f} us'
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Run the ampyc benchmark suite.')
+    parser.add_argument('--suite', nargs='+', choices=SUITES, default=SUITES, help='suites to run (default: all)')
+    parser.add_argument('--quick', action='store_true', help='run reduced sweeps with fewer repeats')
+    parser.add_argument('--output', default='benchmark_results.json', help='path of the JSON results')
+    parser.add_argument('--baseline', default=str(BASELINE), help='path of the JSON baseline to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='relative slowdown flagged as regression')
+    parser.add_argument('--save-baseline', action='store_true', help='store the results as new baseline')
+    args = parser.parse_args()
+
+    results = run_suites(args.suite, args.quick)
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f'Results written to {args.output}.')
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f'Baseline written to {args.baseline}.')
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f'No baseline found at {args.baseline}, run with --save-baseline to create one.')
+        return 0
+
+    with open(args.baseline, 'r') as f:
+        baseline = json.load(f)
+    return 1 if compare(results, baseline, args.tolerance) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
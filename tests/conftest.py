@@ -0,0 +1,7 @@
+import pytest
+from ampyc.utils import configure_cache
+
+@pytest.fixture(autouse=True, scope="session")
+def disable_cache():
+    # do not read from or write to the user's on-disk cache during tests
+    configure_cache(enabled=False)
@@ -0,0 +1,66 @@
+import pytest
+import numpy as np
+from ampyc.params import RMPCSMPCParams, MPCParams
+from ampyc.systems import LinearSystem
+from ampyc.controllers import ConstraintTighteningRMPC, ConstraintTighteningSMPC, EventTriggered, SolveStatsRecorder, MPC
+
+def _closed_loop(ctrl, sys, x, num_steps):
+    X = [x]
+    for _ in range(num_steps):
+        v, z, error_msg = ctrl.solve(x)
+        assert error_msg is None
+        u = v[:, 0] + ctrl.K @ (x - z[:, 0])
+        x = sys.step(x, u.reshape(-1, 1))[0].reshape(-1)
+        X.append(x)
+    return np.array(X).T
+
+def test_event_triggered_reuses_tube_plan():
+    params = RMPCSMPCParams()
+    sys = LinearSystem(params.sys)
+    sys.noise_generator.seed(0)
+    recorder = SolveStatsRecorder()
+    ctrl = EventTriggered(ConstraintTighteningRMPC(sys, params.ctrl, stats_callback=recorder))
+
+    X = _closed_loop(ctrl, sys, params.sim.x_0.reshape(-1), 20)
+
+    # the plan is reused at most N time steps, until the tightening of the terminal set is used up
+    assert ctrl.num_calls == 20
+    assert 0 < ctrl.skip_fraction <= params.ctrl.N / (params.ctrl.N + 1)
+    assert sum(s.status == 'skipped' for s in recorder.stats) == ctrl.num_skips
+    assert np.all(sys.X.A @ X <= sys.X.b.reshape(-1, 1) + 1e-6)
+
+@pytest.mark.parametrize("controller,args", [
+    (ConstraintTighteningRMPC, ()),
+    (ConstraintTighteningSMPC, (0.9,)),
+])
+def test_event_triggered_resolves_outside_tube(controller, args):
+    params = RMPCSMPCParams()
+    sys = LinearSystem(params.sys)
+    ctrl = EventTriggered(controller(sys, params.ctrl, *args))
+    v, z, _ = ctrl.solve(params.sim.x_0.reshape(-1))
+
+    # a disturbance inside W is covered by the tightening
+    w = sys.W.vertices[0]
+    ctrl.solve(z[:, 1] + w)
+    assert ctrl.stats.status == 'skipped'
+
+    # a disturbance outside of the design forces a solve
+    ctrl.solve(z[:, 2] + 10 * w)
+    assert ctrl.stats.status != 'skipped'
+    assert ctrl.num_skips == 1
+
+def test_event_triggered_threshold():
+    params = MPCParams()
+    sys = LinearSystem(params.sys)
+    ctrl = EventTriggered(MPC(sys, params.ctrl), threshold=1e-6)
+    x = params.sim.x_0.reshape(-1)
+    u, z, _ = ctrl.solve(x)
+
+    # nominal prediction: the plan is reused
+    u_next, z_next, _ = ctrl.solve(z[:, 1])
+    assert ctrl.num_skips == 1
+    assert np.allclose(u_next, u[:, 1:]) and np.allclose(z_next, z[:, 1:])
+
+    # perturbed state: the problem is solved again
+    ctrl.solve(z_next[:, 1] + 1e-2)
+    assert ctrl.num_skips == 1 and ctrl.num_calls == 3
@@ -0,0 +1,25 @@
+import pytest
+import numpy as np
+from dataclasses import replace
+from ampyc.params import RMPCSMPCParams
+from ampyc.systems import LinearSystem
+from ampyc.controllers import ConstraintTighteningRMPC, ConstraintTighteningSMPC, HorizonFactory
+
+@pytest.mark.parametrize("controller,args", [
+    (ConstraintTighteningRMPC, ()),
+    (ConstraintTighteningSMPC, (0.9,)),
+])
+def test_horizon_factory_matches_direct_construction(controller, args):
+    params = RMPCSMPCParams()
+    sys = LinearSystem(params.sys)
+
+    factory = HorizonFactory(controller, sys, params.ctrl, *args)
+    ctrls = factory.sweep([3, 5])
+    ctrls[8] = factory(8) # extends the cached tightening tables
+
+    for N, ctrl in ctrls.items():
+        assert ctrl.params.N == N
+        ref = controller(sys, replace(params.ctrl, N=N), *args)
+        assert np.allclose(ctrl.x_tight, ref.x_tight)
+        assert np.allclose(ctrl.u_tight, ref.u_tight)
+        assert np.allclose(ctrl.x_f_tight, ref.x_f_tight)
@@ -0,0 +1,87 @@
+import pytest
+import numpy as np
+import cvxpy as cp
+from ampyc.params import SFParams
+from ampyc.systems import LinearSystem
+from ampyc.controllers import IBSF, MinIBSF, DampIBSF
+from ampyc.controllers.ibsf import _project_input
+
+@pytest.fixture(scope="module")
+def setup():
+    params = SFParams()
+    sys = LinearSystem(params.sys)
+    return sys, params, IBSF(sys, params.ctrl).P
+
+@pytest.mark.parametrize("controller,kwargs", [(MinIBSF, {}), (DampIBSF, {'gamma': 0.5})])
+def test_closed_form_matches_cvxpy(setup, controller, kwargs):
+    sys, params, P = setup
+    fast = controller(sys, P, params.ctrl, **kwargs)
+    ref = controller(sys, P, params.ctrl, closed_form=False, **kwargs)
+
+    rng = np.random.default_rng(0)
+    for _ in range(50):
+        x = rng.uniform(-0.5, 0.5, 2) * np.deg2rad([45, 30])
+        additional_parameters = {'u_L': rng.uniform(-4, 4, 1), 'V_x_0': x @ P @ x}
+        u, state, error_msg = fast.solve(x, additional_parameters=additional_parameters)
+        u_ref, state_ref, error_msg_ref = ref.solve(x, additional_parameters=additional_parameters)
+
+        assert fast.stats.solver == 'kkt'
+        assert error_msg is None and error_msg_ref is None
+        assert u.shape == u_ref.shape and state.shape == state_ref.shape
+        assert np.allclose(u, u_ref, atol=1e-4)
+        assert fast.stats.residual <= 1e-9
+
+def test_project_input_multiple_inputs():
+    # random problems with two inputs, where the box QP is not separable
+    rng = np.random.default_rng(1)
+    for _ in range(20):
+        B = rng.normal(size=(2, 2))
+        P = np.eye(2) + 0.5 * rng.normal(size=(2, 2))
+        P = P @ P.T
+        Ax = rng.normal(size=2)
+        u_L = rng.normal(scale=3, size=2)
+        lb, ub = -np.ones(2), np.ones(2)
+
+        u, _ = _project_input(Ax, B, P, u_L, 1.0, lb, ub)
+
+        u_ref = cp.Variable(2)
+        prob = cp.Problem(cp.Minimize(cp.sum_squares(u_L - u_ref)),
+                          [u_ref >= lb, u_ref <= ub, cp.quad_form(Ax + B @ u_ref, P) <= 1.0])
+        prob.solve()
+        if prob.status == cp.OPTIMAL:
+            assert np.allclose(u, u_ref.value, atol=1e-4)
+        else:
+            assert u is None
+
+def test_solve_batch(setup):
+    sys, params, P = setup
+    rng = np.random.default_rng(2)
+    X = rng.uniform(-0.6, 0.6, (2, 100)) * np.deg2rad([[45], [30]])
+    U_L = rng.uniform(-4, 4, (1, 100))
+
+    ibsf = IBSF(sys, params.ctrl)
+    U, modified = ibsf.solve_batch(sys, X, U_L)
+    assert U.shape == (1, 100) and modified.shape == (100,)
+    for i in range(100):
+        assert np.allclose(U[:, i], ibsf.solve(sys, X[:, i], U_L[:, i]))
+        assert modified[i] == (not np.allclose(U[:, i], U_L[:, i]))
+
+    for ctrl in [MinIBSF(sys, P, params.ctrl), DampIBSF(sys, P, params.ctrl, gamma=0.5)]:
+        U, modified = ctrl.solve_batch(X, U_L)
+        assert U.shape == (1, 100) and np.any(modified) and not np.all(modified)
+        for i in range(0, 100, 10):
+            u, _, error_msg = ctrl.solve(X[:, i], additional_parameters={'u_L': U_L[:, i], 'V_x_0': X[:, i] @ P @ X[:, i]})
+            assert error_msg is None and np.allclose(U[:, i], u, atol=1e-9)
+
+def test_invariant_ellipsoid_sweep(setup):
+    from ampyc.utils import compute_invariant_ellipsoid, invariant_ellipsoid_sweep
+    sys, params, P = setup
+    ellipsoids = invariant_ellipsoid_sweep(sys.A, sys.B, sys.X, sys.U, [1.0, 0.5])
+    assert np.allclose(ellipsoids[0][0], P, rtol=1e-3)
+
+    # halving the constraints shrinks the ellipsoid by a factor of 2, i.e., P scales by 4
+    assert np.allclose(ellipsoids[1][0], 4 * P, rtol=1e-3)
+
+    # the compiled problem is reused for changed constraint offsets
+    P_half, _ = compute_invariant_ellipsoid(sys.A, sys.B, sys.X, 0.5 * sys.U, None)
+    assert np.all(np.linalg.eigvalsh(P_half - P) >= -1e-4)
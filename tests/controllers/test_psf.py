@@ -0,0 +1,52 @@
+import numpy as np
+from ampyc.params import SFParams
+from ampyc.systems import LinearSystem
+from ampyc.controllers import IBSF, PSF
+
+def test_solve_batch():
+    params = SFParams()
+    sys = LinearSystem(params.sys)
+    psf = PSF(sys, params.ctrl, IBSF(sys, params.ctrl).P)
+
+    rng = np.random.default_rng(0)
+    X = rng.uniform(-0.6, 0.6, (2, 8)) * np.deg2rad([[45], [30]])
+    U_L = rng.uniform(-4, 4, (1, 8))
+
+    psf.solve(X[:, 0], additional_parameters={'u_L': U_L[:, 0]})
+    backup = psf.backup
+
+    U, modified = psf.solve_batch(X, U_L)
+    assert U.shape == (1, 8)
+    assert np.all(modified[np.abs(U_L[0]) > 2])
+    assert psf.backup is backup and psf.certify
+    U_parallel, modified_parallel = psf.solve_batch(X, U_L, workers=2)
+    assert np.allclose(U, U_parallel, equal_nan=True)
+    assert np.all(modified == modified_parallel)
+
+def test_certified_fast_path():
+    params = SFParams()
+    sys = LinearSystem(params.sys)
+    P = IBSF(sys, params.ctrl).P
+    psf = PSF(sys, params.ctrl, P)
+    ref = PSF(sys, params.ctrl, P, certify=False)
+
+    x = params.sim.x_0.reshape(-1)
+    num_certified = 0
+    backup = None
+    for k in range(40):
+        u_L = np.array([1.5 * np.sin(0.2 * k) + 0.3])
+        u, state, error_msg = psf.solve(x, additional_parameters={'u_L': u_L})
+        u_ref, state_ref, error_msg_ref = ref.solve(x, additional_parameters={'u_L': u_L})
+        assert error_msg is None and error_msg_ref is None
+        assert u.shape == u_ref.shape and state.shape == state_ref.shape
+        assert np.allclose(u[:, 0], u_ref[:, 0], atol=1e-4)
+
+        if psf.stats.solver == 'certified':
+            num_certified += 1
+            assert np.all(u[:, 0] == u_L)
+            assert state[:, -1] @ P @ state[:, -1] <= 1.0
+            # the candidate is the backup plan shifted by one time step, padded with a zero input
+            assert np.all(u[:, 1:-1] == backup[:, 2:]) and np.all(u[:, -1] == 0.0)
+        backup = u
+        x = sys.A @ x + sys.B @ u_ref[:, 0]
+    assert num_certified > 0
@@ -0,0 +1,35 @@
+import copy
+import numpy as np
+from ampyc.params import RAMPCParams
+from ampyc.systems import LinearAffineSystem
+from ampyc.controllers import RAMPC
+
+def test_rampc_closed_loop():
+    params = RAMPCParams()
+    sys = LinearAffineSystem(params.sys)
+    true_params = copy.deepcopy(params.sys)
+    true_params.theta = params.sim.theta
+    plant = LinearAffineSystem(true_params)
+    plant.noise_generator.seed(0)
+
+    ctrl = RAMPC(sys, params.ctrl)
+    num_constraints = len(ctrl.prob.constraints)
+    x = params.sim.x_0.reshape(-1)
+    h_theta = ctrl.h_theta.copy()
+    for _ in range(15):
+        v, z, out, error_msg = ctrl.solve(x)
+        assert error_msg is None
+        u = v[:, 0] + ctrl.K @ (x - z[:, 0])
+        x_next = plant.step(x, u)[0].reshape(-1)
+        assert ctrl.update(x, u, x_next)
+        x = x_next
+
+        assert np.all(sys.X.A @ x <= sys.X.b.reshape(-1)) and np.all(sys.U.A @ u <= sys.U.b.reshape(-1))
+        # the parameter set only shrinks, keeps its facet directions, and contains the true parameter
+        assert np.all(ctrl.h_theta <= h_theta + 1e-9)
+        h_theta = ctrl.h_theta.copy()
+        assert np.all(ctrl.omega.A @ params.sim.theta <= ctrl.h_theta + 1e-6)
+        assert np.all(ctrl.theta_lb - 1e-6 <= params.sim.theta) and np.all(params.sim.theta <= ctrl.theta_ub + 1e-6)
+
+    assert len(ctrl.prob.constraints) == num_constraints
+    assert np.linalg.norm(x) < 0.5
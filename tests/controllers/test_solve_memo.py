@@ -0,0 +1,42 @@
+import numpy as np
+from ampyc.params import MPCParams, NonlinearMPCParams
+from ampyc.systems import LinearSystem, NonlinearSystem
+from ampyc.controllers import MPC, NonlinearMPC
+
+def test_solve_memo_hits_and_eviction():
+    params = MPCParams()
+    sys = LinearSystem(params.sys)
+    ctrl = MPC(sys, params.ctrl, memoize={'capacity': 2, 'resolution': 1e-6})
+    x_0 = params.sim.x_0.reshape(-1)
+
+    u, x, error_msg = ctrl.solve(x_0)
+    u_memo, x_memo, error_msg_memo = ctrl.solve(x_0 + 1e-8) # same grid point
+    assert error_msg is None and error_msg_memo is None
+    assert np.array_equal(u, u_memo) and np.array_equal(x, x_memo)
+    assert ctrl.stats.status == 'memoized' and ctrl.stats.success
+
+    # infeasible solves are memoized as well, the least recently used solution is evicted
+    assert ctrl.solve(10 * np.ones(sys.n))[-1] is not None
+    assert ctrl.solve(10 * np.ones(sys.n))[-1] is not None
+    ctrl.solve(0.5 * x_0)
+    ctrl.solve(x_0)
+    info = ctrl.memo.info()
+    assert (info['size'], info['hits'], info['misses']) == (2, 2, 4)
+    assert info['warm_starts'] == 3 # every miss after the first solve
+
+    # different additional parameters or solver settings are memoized separately
+    ctrl.solve(x_0, solver='CLARABEL')
+    assert ctrl.stats.status != 'memoized'
+
+def test_solve_memo_warm_start_casadi():
+    params = NonlinearMPCParams()
+    sys = NonlinearSystem(params.sys)
+    ctrl = NonlinearMPC(sys, params.ctrl, memoize=8)
+    x_0 = params.sim.x_0.reshape(-1)
+
+    u, x, error_msg = ctrl.solve(x_0)
+    iterations = ctrl.stats.iterations
+    u_near, x_near, error_msg_near = ctrl.solve(x_0 + 1e-3)
+    assert error_msg is None and error_msg_near is None
+    assert ctrl.memo.info()['warm_starts'] == 1
+    assert ctrl.stats.iterations <= iterations
@@ -0,0 +1,32 @@
+import pytest
+import numpy as np
+from ampyc.params import MPCParams
+from ampyc.systems import LinearSystem
+from ampyc.controllers import MPC, SolveStatsRecorder
+
+def test_solve_stats_recorded_for_every_solve():
+    params = MPCParams()
+    sys = LinearSystem(params.sys)
+    recorder = SolveStatsRecorder()
+    ctrl = MPC(sys, params.ctrl, stats_callback=recorder, timing=True)
+
+    _, _, out_map, error_msg = ctrl.solve(params.sim.x_0)
+    assert error_msg is None
+    stats = out_map['stats']
+    assert stats is ctrl.stats
+    assert stats.success and stats.status == 'optimal'
+    assert out_map['timing'] == stats.solve_time
+    assert stats.total_time >= stats.setup_time
+    assert stats.objective is not None and stats.residual < 1e-6
+
+    # infeasible initial condition, statistics are recorded as well
+    _, _, out_map, error_msg = ctrl.solve(10 * np.ones(sys.n))
+    assert error_msg is not None
+    assert not out_map['stats'].success
+    assert out_map['stats'].error_msg == error_msg
+
+    summary = recorder.summary()
+    assert summary['MPC']['count'] == 2
+    assert summary['MPC']['success_rate'] == 0.5
+    p = summary['MPC']['total_time']
+    assert 0 < p['p50'] <= p['p99']
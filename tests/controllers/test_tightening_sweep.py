@@ -0,0 +1,46 @@
+import numpy as np
+from ampyc.params import RMPCParams
+from ampyc.systems import LinearSystem
+from ampyc.controllers import RMPC
+from ampyc.utils.math import min_tightening_controller, min_tightening_sweep
+
+def test_rmpc_sweep_matches_single_solves():
+    params = RMPCParams()
+    sys = LinearSystem(params.sys)
+    ctrl = RMPC(sys, params.ctrl, solver='CLARABEL')
+
+    rhos = [0.7, 0.8, 0.9]
+    sweep = ctrl.sweep_tightening(rhos)
+    for i, rho in enumerate(rhos):
+        x_tight, u_tight, P, K, delta = ctrl.compute_tightening(rho)
+        assert np.allclose(sweep['x_tight'][i], x_tight.flatten(), rtol=1e-3)
+        assert np.allclose(sweep['delta'][i], delta, rtol=1e-3)
+    assert sweep['rho_best'] == rhos[int(np.argmin(sweep['cost']))]
+    assert sweep['offline']['rho'] == sweep['rho_best']
+
+    parallel = ctrl.sweep_tightening(rhos, workers=2)
+    assert np.allclose(parallel['cost'], sweep['cost'], rtol=1e-3)
+
+def test_min_tightening_sweep():
+    sys = LinearSystem(RMPCParams().sys)
+    sweep = min_tightening_sweep(sys, [0.5, 1.0], [0.8, 0.9], solver='CLARABEL')
+    assert sweep['gamma'].shape == (2, 2)
+
+    K, P = min_tightening_controller(sys, sweep['rho_best'], sweep['lambd_best'], solver='CLARABEL')
+    assert np.allclose(K, sweep['K'], rtol=1e-3)
+
+def test_failed_solve_does_not_reuse_previous_solution(monkeypatch):
+    import cvxpy as cp
+    import pytest
+    params = RMPCParams()
+    sys = LinearSystem(params.sys)
+    ctrl = RMPC(sys, params.ctrl, solver='CLARABEL')
+
+    # the compiled problem holds the solution of rho=0.9 (solved in the constructor) when the next solve fails
+    def fail(self, *args, **kwargs):
+        raise cp.error.SolverError('failed')
+    monkeypatch.setattr(cp.Problem, 'solve', fail)
+    with pytest.raises(Exception, match='could not be solved'):
+        ctrl.compute_tightening(0.8)
+    with pytest.raises(Exception, match='infeasible for all values of rho'):
+        ctrl.sweep_tightening([0.8])
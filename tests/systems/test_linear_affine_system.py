@@ -0,0 +1,34 @@
+import numpy as np
+from ampyc.params import RAMPCParams
+from ampyc.systems import LinearAffineSystem
+
+def test_batched_parameters():
+    params = RAMPCParams()
+    sys = LinearAffineSystem(params.sys)
+    assert sys.A_delta.shape == (3, 2, 2) and sys.B_delta.shape == (3, 2, 1)
+
+    thetas = np.random.default_rng(0).uniform(-1, 1, (5, 2))
+    A, B = sys.A_of(thetas), sys.B_of(thetas)
+    assert A.shape == (5, 2, 2) and B.shape == (5, 2, 1)
+    for theta, A_i, B_i in zip(thetas, A, B):
+        A_ref = params.sys.A_delta[0] + sum(t * A_j for t, A_j in zip(theta, params.sys.A_delta[1:]))
+        B_ref = params.sys.B_delta[0] + sum(t * B_j for t, B_j in zip(theta, params.sys.B_delta[1:]))
+        assert np.allclose(A_i, A_ref) and np.allclose(B_i, B_ref)
+        assert np.allclose(sys.A_of(theta), A_ref)
+
+def test_step_batch():
+    params = RAMPCParams()
+    sys = LinearAffineSystem(params.sys)
+
+    rng = np.random.default_rng(1)
+    thetas = rng.uniform(-1, 1, (5, 2))
+    x, u = rng.normal(size=(2, 5)), rng.normal(size=(1, 5))
+    x_next, y = sys.step_batch(x, u, thetas)
+    for j in range(5):
+        w = x_next[:, j] - sys.A_of(thetas[j]) @ x[:, j] - sys.B_of(thetas[j]) @ u[:, j]
+        assert np.all(sys.W.A @ w <= sys.W.b.reshape(-1) + 1e-9)
+    assert np.allclose(y, x)
+
+    # a single parameter for all trajectories defaults to the initial estimate
+    x_next, _ = sys.step_batch(x, u)
+    assert np.all(sys.W.A @ (x_next - sys.A @ x - sys.B @ u) <= sys.W.b.reshape(-1, 1) + 1e-9)
@@ -0,0 +1,25 @@
+import json
+import subprocess
+import sys
+import pytest
+
+# subpackages of ampyc and the heavy dependencies they must not load on import
+MODULES = {
+    'ampyc': ['matplotlib', 'casadi', 'cvxpy', 'scipy', 'polytope'],
+    'ampyc.systems': ['matplotlib', 'casadi', 'cvxpy'],
+    'ampyc.noise': ['matplotlib', 'casadi', 'cvxpy'],
+    'ampyc.params': ['matplotlib', 'casadi', 'cvxpy'],
+    'ampyc.utils': ['matplotlib', 'casadi', 'cvxpy'],
+    'ampyc.controllers': ['matplotlib', 'casadi', 'cvxpy', 'scipy', 'polytope'],
+}
+
+def loaded_modules(module: str, candidates: list[str]) -> list[str]:
+    '''Returns the candidates which are loaded by importing module in a fresh interpreter'''
+    snippet = f'import json, sys; import {module}; print(json.dumps([m for m in {candidates} if m in sys.modules]))'
+    out = subprocess.run([sys.executable, '-c', snippet], capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+@pytest.mark.parametrize("module,forbidden", MODULES.items())
+def test_import_does_not_load_heavy_dependencies(module: str, forbidden: list[str]):
+    loaded = loaded_modules(module, forbidden)
+    assert not loaded, f"Importing {module} loads {loaded}"
@@ -0,0 +1,142 @@
+import pickle
+import pytest
+import numpy as np
+from ampyc.noise import GaussianNoise, TruncGaussianNoise, PolytopeNoise, StateDependentNoise, NoiseTape
+from ampyc.utils import Polytope, estimate_probability
+
+@pytest.fixture
+def W():
+    return Polytope(np.array([[1.0, 0.0], [0.0, 1.0], [-1.0, 0.0], [0.0, -1.0]]), np.array([2.0, 0.5, 0.0, 0.5]))
+
+@pytest.mark.parametrize("method", ['rejection', 'gibbs'])
+def test_trunc_gaussian_batch(W, method: str):
+    noise = TruncGaussianNoise(np.array([0.5, 1.0]), np.diag([2.0, 0.5]), W, seed=0, method=method)
+    w = noise.generate(20000)
+    assert w.shape == (2, 20000)
+    assert np.all(W.A @ w <= W.b.reshape(-1, 1) + 1e-9)
+    assert noise.generate().shape == (2, 1)
+
+    # compare against the moments of the rejection sampler
+    reference = TruncGaussianNoise(np.array([0.5, 1.0]), np.diag([2.0, 0.5]), W, seed=1, method='rejection').generate(20000)
+    assert np.allclose(w.mean(axis=1), reference.mean(axis=1), atol=0.02)
+    assert np.allclose(np.cov(w), np.cov(reference), atol=0.02)
+
+def test_trunc_gaussian_low_acceptance():
+    W = Polytope(np.array([[1.0, 0.0], [0.0, 1.0], [-1.0, 0.0], [0.0, -1.0]]), np.array([6.0, 6.0, -5.0, -5.0]))
+    noise = TruncGaussianNoise(np.zeros(2), np.eye(2), W, seed=0, method='auto')
+    with pytest.warns(RuntimeWarning, match='Gibbs'):
+        w = noise.generate(1000)
+    assert w.shape == (2, 1000)
+    assert np.all(W.A @ w <= W.b.reshape(-1, 1) + 1e-9)
+
+    with pytest.raises(Exception):
+        TruncGaussianNoise(np.zeros(2), np.eye(2), W, seed=0).generate(10)
+
+@pytest.mark.parametrize("dim,max_triangulation_dim", [(2, 4), (3, 4), (3, 2)])
+def test_polytope_noise_uniform(dim: int, max_triangulation_dim: int):
+    # uniform samples in the unit box have variance 1/3 and reach the boundary at the right rate
+    W = Polytope(np.vstack([np.eye(dim), -np.eye(dim)]), np.ones(2 * dim))
+    noise = PolytopeNoise(W, seed=0, max_triangulation_dim=max_triangulation_dim)
+    w = noise.generate(50000)
+    assert w.shape == (dim, 50000)
+    assert np.all(np.abs(w) <= 1 + 1e-9)
+    assert np.allclose(np.var(w, axis=1), 1 / 3, atol=0.02)
+    assert np.isclose(np.mean(np.abs(w[0]) > 0.9), 0.1, atol=0.01)
+    assert noise.generate().shape == (dim, 1)
+
+def test_noise_streams():
+    noise = GaussianNoise(np.zeros(2), np.eye(2), seed=42)
+    assert np.allclose(noise.generate(10), GaussianNoise(np.zeros(2), np.eye(2), seed=42).generate(10))
+
+    # streams are selected by index, independent of the number of streams and the order of creation
+    serial = [stream.generate(5) for stream in noise.spawn(4)]
+    assert np.allclose(noise.stream(2).generate(5), serial[2])
+    assert np.allclose(noise.spawn(8)[3].generate(5), serial[3])
+    assert not np.allclose(serial[0], serial[1])
+
+    # streams survive being sent to another process
+    stream = pickle.loads(pickle.dumps(noise.stream(1)))
+    assert np.allclose(stream.generate(5), serial[1])
+
+@pytest.mark.parametrize("variance_reduction", ['qmc', 'antithetic'])
+def test_noise_streams_after_parent_draws(W, variance_reduction: str):
+    noise = PolytopeNoise(W, seed=0, variance_reduction=variance_reduction)
+    fresh = [stream.generate(3) for stream in noise.spawn(2)]
+
+    # the QMC engine and pending antithetic samples of the parent are not inherited by the streams
+    noise.generate(3)
+    streams = noise.spawn(2)
+    assert not np.allclose(streams[0].generate(3), streams[1].generate(3))
+    assert np.allclose(noise.stream(0).generate(3), fresh[0])
+
+def test_trunc_gaussian_streams_after_parent_draws():
+    W = Polytope(np.vstack([np.eye(2), -np.eye(2)]), 0.2 * np.ones(4))
+    noise = TruncGaussianNoise(np.zeros(2), np.eye(2), W, seed=0)
+    drawn = TruncGaussianNoise(np.zeros(2), np.eye(2), W, seed=0)
+
+    # the adaptive block size of the rejection sampler does not carry over from the parent to its streams
+    drawn.generate(1000)
+    streams = (drawn.stream(0), noise.stream(0))
+    for _ in range(3):
+        assert np.allclose(streams[0].generate(5), streams[1].generate(5))
+    drawn.seed(1)
+    noise.seed(1)
+    for _ in range(3):
+        assert np.allclose(drawn.generate(5), noise.generate(5))
+
+def test_noise_tape(tmp_path):
+    path = str(tmp_path / 'tape.npy')
+    tape = NoiseTape(GaussianNoise(np.zeros(2), np.eye(2), seed=0), num_traj=5, num_steps=10, path=path, chunk_size=20)
+    assert tape[:].shape == (5, 10, 2)
+
+    # replaying a trajectory returns the stored disturbances, independent of the replaying object
+    replay = NoiseTape.load(path).stream(3)
+    w = np.hstack([replay.generate() for _ in range(10)])
+    assert np.allclose(w, tape[3].T)
+    assert np.allclose(tape.stream(3).generate(10), w)
+    with pytest.raises(Exception):
+        replay.generate()
+
+    # state dependent noise stores the random scalars
+    G = np.diag([0.0, 0.1])
+    tape = NoiseTape(StateDependentNoise(G, seed=0), num_traj=2, num_steps=4)
+    x = np.array([1.0, 2.0]).reshape(-1, 1)
+    stream = tape.stream(1)
+    assert stream.state_dependent
+    assert np.allclose(stream.generate(x), tape[1, 0, 0] * G @ x)
+
+def test_state_dependent_noise_batch():
+    G = np.diag([0.0, 0.1])
+    x = np.array([1.0, 2.0]).reshape(-1, 1)
+    assert StateDependentNoise(G, seed=0).generate(x).shape == (2, 1)
+    assert StateDependentNoise(G, seed=0).generate(x.reshape(-1)).shape == (2, 1)
+
+    # batches use one independent scalar per state
+    X = np.tile(x, (1, 1000))
+    w = StateDependentNoise(G, seed=0).generate(X)
+    assert w.shape == (2, 1000)
+    assert np.allclose(w[0], 0.0) and np.all((0.0 <= w[1]) & (w[1] <= 0.2))
+    assert np.unique(w[1]).size == 1000
+
+    # deterministic per-trajectory batches via a tape
+    tape = NoiseTape(StateDependentNoise(G, seed=0), num_traj=4, num_steps=3)
+    batch = tape.stream([2, 0])
+    w = batch.generate(X[:, :2])
+    assert np.allclose(w[:, 0:1], tape.stream(2).generate(x))
+    assert np.allclose(w[:, 1:2], tape.stream(0).generate(x))
+
+@pytest.mark.parametrize("variance_reduction", [None, 'antithetic', 'qmc', 'importance'])
+def test_variance_reduction(variance_reduction: str):
+    # P(w_1 > 2.5) for a standard Gaussian
+    p_true = 0.006209665
+    kwargs = {'proposal_mean': np.array([2.5, 0.0])} if variance_reduction == 'importance' else {}
+    noise = GaussianNoise(np.zeros(2), np.eye(2), seed=0, variance_reduction=variance_reduction, **kwargs)
+    w = noise.generate(20000)
+    p, (lower, upper) = estimate_probability(w[0] > 2.5, noise.weights, antithetic=variance_reduction == 'antithetic')
+    assert lower <= p_true <= upper
+    if variance_reduction == 'importance':
+        assert upper - lower < 0.001
+
+    # antithetic pairs continue across calls
+    if variance_reduction == 'antithetic':
+        assert np.allclose(noise.generate() + noise.generate(), 0.0)
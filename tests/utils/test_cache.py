@@ -0,0 +1,85 @@
+import pytest
+import numpy as np
+from ampyc.params import RMPCSMPCParams
+from ampyc.systems import LinearSystem
+from ampyc.utils import Polytope, LQR, compute_drs, compute_mrpi, cached, configure_cache, cache_info, clear_cache
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    configure_cache(enabled=True, directory=str(tmp_path))
+    yield tmp_path
+    configure_cache(enabled=False)
+
+@pytest.fixture
+def sys():
+    params = RMPCSMPCParams()
+    return LinearSystem(params.sys), params
+
+def test_cached_set_computations(cache_dir, sys):
+    sys, params = sys
+    K, _ = LQR(sys.A, sys.B, params.ctrl.Q, params.ctrl.R)
+    Omega = Polytope(A=np.vstack([sys.X.A, sys.U.A @ K]), b=np.hstack([sys.X.b, sys.U.b]))
+
+    F = compute_drs(sys.A + sys.B @ K, sys.W, params.ctrl.N)
+    X_f = compute_mrpi(Omega, sys.A + sys.B @ K, sys.W)
+    hits = cache_info()['hits']
+
+    F_cached = compute_drs(sys.A + sys.B @ K, sys.W, params.ctrl.N)
+    X_f_cached = compute_mrpi(Omega, sys.A + sys.B @ K, sys.W)
+    assert cache_info()['hits'] == hits + 2
+
+    assert len(F_cached) == len(F)
+    for F_i, F_i_cached in zip(F[1:], F_cached[1:]):
+        assert F_i == F_i_cached
+    assert F_cached[0].is_empty
+    assert X_f == X_f_cached
+
+def test_cache_key_and_eviction(cache_dir):
+    calls = []
+
+    @cached
+    def f(A, n, name=None):
+        calls.append(n)
+        return {'A': n * A, 'list': [n, (name, 1.0)]}
+
+    A = np.eye(2)
+    out = f(A, 2)
+    assert f(A, 2)['list'] == [2, (None, 1.0)]
+    assert np.all(f(A, 2)['A'] == out['A'])
+    f(A, 3)
+    f(A + 1e-12, 2)
+    assert calls == [2, 3, 2]
+
+    # evict everything but the most recently stored result
+    configure_cache(max_size=cache_info()['size'] // 3 + 1)
+    f(A, 4)
+    assert cache_info()['num_files'] == 1
+    clear_cache()
+    assert cache_info()['num_files'] == 0
+
+def test_cache_invalidated_by_source_changes(cache_dir, monkeypatch):
+    import ampyc.utils.cache
+    calls = []
+
+    @cached
+    def f(n):
+        calls.append(n)
+        return n
+
+    f(1)
+    f(1)
+    # a change of any ampyc source, e.g., a helper called by f, invalidates the cached results
+    monkeypatch.setattr(ampyc.utils.cache, '_source_digest', 'changed')
+    f(1)
+    assert calls == [1, 1]
+
+def test_cache_key_ignores_sampling_state():
+    from ampyc.noise import GaussianNoise, TruncGaussianNoise
+    from ampyc.utils.cache import _hash
+    W = Polytope(np.vstack([np.eye(2), -np.eye(2)]), np.ones(4))
+    for noise in [TruncGaussianNoise(np.zeros(2), np.eye(2), W, seed=0),
+                  GaussianNoise(np.zeros(2), np.eye(2), seed=0, variance_reduction='qmc'),
+                  GaussianNoise(np.zeros(2), np.eye(2), seed=0, variance_reduction='importance')]:
+        digest = _hash(noise)
+        noise.generate(10)
+        assert _hash(noise) == digest
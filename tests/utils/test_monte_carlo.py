@@ -0,0 +1,30 @@
+import numpy as np
+from ampyc.params import SMPCParams, RMPCSMPCParams
+from ampyc.systems import LinearSystem
+from ampyc.utils import LQR, compute_prs, compute_drs, configure_cache, error_coverage
+
+def test_prs_coverage():
+    configure_cache(enabled=False)
+    sys = LinearSystem(SMPCParams().sys)
+    p, N = 0.9, 5
+    x_tight, u_tight, F, p_tilde, P, K = compute_prs(sys, p, N)
+
+    coverage, intervals = error_coverage(sys.A + sys.B @ K, sys.noise_generator,
+                                         [None] + [(F_i, p_tilde) for F_i in F[:-1]], num_traj=10**5, batch_size=30000)
+    assert np.isnan(coverage[0])
+    assert np.all(np.abs(coverage[1:] - p) < 0.005)
+    assert np.all(intervals[1:, 0] <= coverage[1:]) and np.all(coverage[1:] <= intervals[1:, 1])
+
+def test_drs_coverage():
+    configure_cache(enabled=False)
+    params = RMPCSMPCParams()
+    sys = LinearSystem(params.sys)
+    K, _ = LQR(sys.A, sys.B, params.ctrl.Q, params.ctrl.R)
+    F = compute_drs(sys.A + sys.B @ K, sys.W, 5)
+
+    coverage, _ = error_coverage(sys.A + sys.B @ K, sys.noise_generator, [None] + F[1:], num_traj=10**4)
+    assert np.allclose(coverage[1:], 1.0)
+
+    # the one step reachable set does not contain the two step errors
+    coverage, _ = error_coverage(sys.A + sys.B @ K, sys.noise_generator, F[1], num_traj=10**4, num_steps=2)
+    assert coverage[2] < 1.0
@@ -0,0 +1,26 @@
+import numpy as np
+from ampyc.params import RMPCSMPCParams
+from ampyc.systems import LinearSystem
+from ampyc.utils import Polytope, LQR, compute_mrpi, configure_cache, Profiler
+
+def test_profiler_counts():
+    configure_cache(enabled=False)
+    params = RMPCSMPCParams()
+    sys = LinearSystem(params.sys)
+    K, _ = LQR(sys.A, sys.B, params.ctrl.Q, params.ctrl.R)
+    Omega = Polytope(A=np.vstack([sys.X.A, sys.U.A @ K]), b=np.hstack([sys.X.b, sys.U.b]))
+
+    with Profiler() as prof:
+        compute_mrpi(Omega, sys.A + sys.B @ K, sys.W)
+        sys.X - sys.W
+
+    summary = prof.summary()
+    assert list(summary.keys()) == ['compute_mrpi', '_pontryagin_difference']
+    assert summary['compute_mrpi'].counts['support_lp'] > 0
+    assert summary['_pontryagin_difference'].counts['support_lp'] == sys.X.A.shape[0]
+    assert summary['_pontryagin_difference'].peak_facets > 0
+    assert 'compute_mrpi' in prof.table()
+
+    # no recording outside of the context
+    sys.X - sys.W
+    assert len(prof.calls) == 2
@@ -0,0 +1,55 @@
+import pytest
+import numpy as np
+from scipy.linalg import sqrtm
+from ampyc.params import SMPCParams, RMPCSMPCParams
+from ampyc.systems import LinearSystem
+from ampyc.utils import compute_prs, compute_drs, compute_drs_tightening, LQR
+
+@pytest.fixture
+def sys():
+    params = SMPCParams()
+    return LinearSystem(params.sys)
+
+@pytest.mark.parametrize("p,N", [
+    (0.9, 10),
+    (0.8, 25),
+])
+def test_compute_prs_tightening(sys, p: float, N: int):
+    x_tight, u_tight, F, p_tilde, P, K = compute_prs(sys, p, N)
+
+    assert x_tight.shape == (sys.X.A.shape[0], N+1)
+    assert u_tight.shape == (sys.U.A.shape[0], N+1)
+    assert len(F) == N+1
+    assert np.allclose(F[-1], P)
+
+    # compare against the explicit tightening based on the inverse square root of F
+    for i in range(N):
+        inv_sqrt_F_i = np.linalg.inv(sqrtm(F[i]))
+        for j, a in enumerate(sys.X.A):
+            assert np.isclose(x_tight[j, i+1], np.linalg.norm(inv_sqrt_F_i @ a) * np.sqrt(p_tilde))
+        for j, a in enumerate(sys.U.A):
+            assert np.isclose(u_tight[j, i+1], np.linalg.norm(inv_sqrt_F_i @ K.T @ a) * np.sqrt(p_tilde))
+
+def test_compute_prs_without_F(sys):
+    x_tight, u_tight, F, _, _, _ = compute_prs(sys, 0.9, 10)
+    x_tight_noF, u_tight_noF, F_noF, _, _, _ = compute_prs(sys, 0.9, 10, return_F=False)
+
+    assert F_noF is None
+    assert np.allclose(x_tight, x_tight_noF)
+    assert np.allclose(u_tight, u_tight_noF)
+
+def test_compute_drs_tightening():
+    params = RMPCSMPCParams()
+    sys = LinearSystem(params.sys)
+    N = params.ctrl.N
+    K, _ = LQR(sys.A, sys.B, params.ctrl.Q, params.ctrl.R)
+    A_BK = sys.A + sys.B @ K
+
+    F = compute_drs(A_BK, sys.W, N)
+    x_tight = compute_drs_tightening(A_BK, sys.W, sys.X.A, N)
+
+    assert x_tight.shape == (sys.X.A.shape[0], N+1)
+    assert np.all(x_tight[:, 0] == 0)
+    for i in range(1, N+1):
+        for j, a in enumerate(sys.X.A):
+            assert np.isclose(x_tight[j, i], F[i].support(a), atol=1e-6)
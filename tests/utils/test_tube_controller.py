@@ -0,0 +1,51 @@
+import numpy as np
+import cvxpy as cp
+from ampyc.utils import Polytope
+from ampyc.utils.math import _tube_controller_lmis, _prune_vertex_matrices, _outer_box_vertices
+
+def test_vectorized_lmis_match_block_matrices():
+    rng = np.random.default_rng(0)
+    n, m = 2, 1
+    A_vert = rng.normal(size=(3, n, n))
+    B = rng.normal(size=(n, m))
+    W_vert = rng.normal(size=(4, n))
+    F, G = rng.normal(size=(5, n)), rng.normal(size=(5, m))
+    rho, lam = 0.9, 0.8
+
+    E = cp.Variable((n, n), symmetric=True)
+    Y = cp.Variable((m, n))
+    constraints = _tube_controller_lmis(E, Y, A_vert, B, W_vert, F, G, np.eye(n), np.eye(m), rho, lam)
+    assert len(constraints) == 3 + 3 + 3 * 4 + 5
+
+    E.value = np.array([[2.0, 0.3], [0.3, 1.0]])
+    Y.value = rng.normal(size=(m, n))
+    AEBY = A_vert[1] @ E.value + B @ Y.value
+    assert np.allclose(constraints[4].args[0].value, np.block([[rho * E.value, AEBY.T], [AEBY, rho * E.value]]))
+
+    w = W_vert[2].reshape(-1, 1)
+    rpi = np.block([[lam * E.value, np.zeros((n, 1)), AEBY.T],
+                    [np.zeros((1, n)), np.diag([1 - lam]), w.T],
+                    [AEBY, w, E.value]])
+    assert np.allclose(constraints[6 + 4 + 2].args[0].value, rpi)
+
+def test_prune_vertex_matrices():
+    A_delta = np.array([np.eye(2), [[1, 0], [0, 0]], [[0, 0], [0, 0]]])
+    # the second parameter has no effect and the box vertices collapse onto an interval
+    omega = np.array([[-1, -1], [-1, 1], [1, -1], [1, 1], [0, 0]])
+    A_vert = A_delta[0] + np.einsum('ij,jkl->ikl', omega, A_delta[1:])
+    pruned = _prune_vertex_matrices(A_vert)
+    assert pruned.shape[0] == 2
+    assert np.allclose(np.sort(pruned[:, 0, 0]), [0, 2])
+
+    # vertices of a polygon are all kept, interior points are removed
+    angles = np.linspace(0, 2 * np.pi, 7, endpoint=False)
+    points = np.vstack([np.stack([np.cos(angles), np.sin(angles)], axis=1), [[0.1, 0.2]]])
+    A_vert = np.array([[[1 + p[0], p[1]], [0, 1]] for p in points])
+    assert _prune_vertex_matrices(A_vert).shape[0] == 7
+
+def test_outer_box_vertices():
+    angles = np.linspace(0, 2 * np.pi, 12, endpoint=False)
+    omega = Polytope(np.stack([np.cos(angles), np.sin(angles)], axis=1), np.ones(12))
+    box = _outer_box_vertices(omega)
+    assert box.shape == (4, 2)
+    assert np.allclose(np.abs(box), 1.0)